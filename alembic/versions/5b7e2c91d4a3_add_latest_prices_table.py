@@ -0,0 +1,59 @@
+"""add_latest_prices_table
+
+Revision ID: 5b7e2c91d4a3
+Revises: 4009a35da2f7
+Create Date: 2026-10-17 09:12:41.518204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b7e2c91d4a3'
+down_revision: Union[str, Sequence[str], None] = '4009a35da2f7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PRICE_COLUMNS = (
+    "time, ticker, open_price, high_price, low_price, close_price, volume, price_change, "
+    "percent_change, buy_order_value, sell_order_value, foreign_net_buy_value, "
+    "buy_order_quantity, sell_order_quantity, foreign_net_buy_quantity"
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'latest_prices',
+        sa.Column('ticker', sa.String(10), nullable=False),
+        sa.Column('time', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('open_price', sa.Numeric(18, 2), nullable=True),
+        sa.Column('high_price', sa.Numeric(18, 2), nullable=True),
+        sa.Column('low_price', sa.Numeric(18, 2), nullable=True),
+        sa.Column('close_price', sa.Numeric(18, 2), nullable=True),
+        sa.Column('volume', sa.BigInteger(), nullable=True),
+        sa.Column('price_change', sa.Numeric(18, 2), nullable=True),
+        sa.Column('percent_change', sa.Float(), nullable=True),
+        sa.Column('buy_order_value', sa.Numeric(20, 2), nullable=True),
+        sa.Column('sell_order_value', sa.Numeric(20, 2), nullable=True),
+        sa.Column('foreign_net_buy_value', sa.Numeric(20, 2), nullable=True),
+        sa.Column('buy_order_quantity', sa.BigInteger(), nullable=True),
+        sa.Column('sell_order_quantity', sa.BigInteger(), nullable=True),
+        sa.Column('foreign_net_buy_quantity', sa.BigInteger(), nullable=True),
+        sa.ForeignKeyConstraint(['ticker'], ['securities.ticker'], ),
+        sa.PrimaryKeyConstraint('ticker')
+    )
+    # Backfill with the latest row of every ticker
+    op.execute(
+        f"INSERT INTO latest_prices ({PRICE_COLUMNS}) "
+        f"SELECT DISTINCT ON (ticker) {PRICE_COLUMNS} FROM daily_prices "
+        "ORDER BY ticker, time DESC"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('latest_prices')
@@ -0,0 +1,36 @@
+"""add_daily_price_day_versions_table
+
+Revision ID: a2b4c6d8e0f1
+Revises: f1a9c3e5b7d2
+Create Date: 2026-10-17 17:08:44.531260
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a2b4c6d8e0f1'
+down_revision: Union[str, Sequence[str], None] = 'f1a9c3e5b7d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Days without a row read as version 0 and get one on their first write;
+    # the caches keyed by it are in-process and start empty, so no backfill
+    op.create_table(
+        'daily_price_day_versions',
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('version', sa.BigInteger(), server_default='0', nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('day')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('daily_price_day_versions')
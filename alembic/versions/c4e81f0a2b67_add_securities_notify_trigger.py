@@ -0,0 +1,45 @@
+"""add_securities_notify_trigger
+
+Revision ID: c4e81f0a2b67
+Revises: 5b7e2c91d4a3
+Create Date: 2026-10-17 10:03:27.114562
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e81f0a2b67'
+down_revision: Union[str, Sequence[str], None] = '5b7e2c91d4a3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Wake the in-memory securities catalog of every API process on any
+    # change to securities; notifications are only delivered on commit
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION notify_securities_changed() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify('securities_changed', TG_OP);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        "CREATE TRIGGER securities_changed "
+        "AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON securities "
+        "FOR EACH STATEMENT EXECUTE FUNCTION notify_securities_changed()"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS securities_changed ON securities")
+    op.execute("DROP FUNCTION IF EXISTS notify_securities_changed()")
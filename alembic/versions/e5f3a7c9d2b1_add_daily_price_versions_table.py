@@ -0,0 +1,39 @@
+"""add_daily_price_versions_table
+
+Revision ID: e5f3a7c9d2b1
+Revises: c4e81f0a2b67
+Create Date: 2026-10-17 14:21:08.340917
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5f3a7c9d2b1'
+down_revision: Union[str, Sequence[str], None] = 'c4e81f0a2b67'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'daily_price_versions',
+        sa.Column('ticker', sa.String(10), nullable=False),
+        sa.Column('version', sa.BigInteger(), server_default='0', nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('ticker')
+    )
+    # Start every ticker with prices at version 1
+    op.execute(
+        "INSERT INTO daily_price_versions (ticker, version) "
+        "SELECT ticker, 1 FROM latest_prices"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('daily_price_versions')
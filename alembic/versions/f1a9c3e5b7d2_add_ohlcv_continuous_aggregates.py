@@ -0,0 +1,84 @@
+"""add_ohlcv_continuous_aggregates
+
+Revision ID: f1a9c3e5b7d2
+Revises: e5f3a7c9d2b1
+Create Date: 2026-10-17 16:42:51.209374
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1a9c3e5b7d2'
+down_revision: Union[str, Sequence[str], None] = 'e5f3a7c9d2b1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (view, time_bucket width, refresh policy start offset) of every OHLCV
+# interval served by GET /daily-prices/{ticker}/ohlcv
+OHLCV_VIEWS = [
+    ('daily_prices_ohlcv_weekly', '1 week', '1 month'),
+    ('daily_prices_ohlcv_monthly', '1 month', '3 months'),
+    ('daily_prices_ohlcv_quarterly', '3 months', '9 months'),
+    ('daily_prices_ohlcv_yearly', '1 year', '3 years'),
+]
+
+SUM_COLUMNS = [
+    'volume',
+    'buy_order_value',
+    'sell_order_value',
+    'foreign_net_buy_value',
+    'buy_order_quantity',
+    'sell_order_quantity',
+    'foreign_net_buy_quantity',
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    sums = ", ".join(f"sum({name}) AS {name}" for name in SUM_COLUMNS)
+    for view, bucket, refresh_start in OHLCV_VIEWS:
+        op.execute(
+            f"""
+            CREATE MATERIALIZED VIEW {view}
+            WITH (timescaledb.continuous, timescaledb.materialized_only = false) AS
+            SELECT
+                time_bucket('{bucket}', time) AS bucket,
+                ticker,
+                first(open_price, time) AS open,
+                max(high_price) AS high,
+                min(low_price) AS low,
+                last(close_price, time) AS close,
+                {sums}
+            FROM daily_prices
+            GROUP BY time_bucket('{bucket}', time), ticker
+            WITH NO DATA
+            """
+        )
+        # The policy only keeps the recent window fresh
+        op.execute(
+            f"""
+            SELECT add_continuous_aggregate_policy('{view}',
+                start_offset => INTERVAL '{refresh_start}',
+                end_offset => INTERVAL '1 minute',
+                schedule_interval => INTERVAL '1 hour'
+            )
+            """
+        )
+
+    # Materialize the whole history once: buckets older than the policy
+    # window are never refreshed by it, and real-time aggregation only
+    # covers buckets after the materialization watermark.
+    # refresh_continuous_aggregate cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        for view, _, _ in OHLCV_VIEWS:
+            op.execute(f"CALL refresh_continuous_aggregate('{view}', NULL, NULL)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for view, _, _ in reversed(OHLCV_VIEWS):
+        op.execute(f"DROP MATERIALIZED VIEW IF EXISTS {view}")
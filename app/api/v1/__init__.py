@@ -1,9 +1,17 @@
 from fastapi import APIRouter
 
+from app.api.v1.routes.analytics import router as analytics_router
+from app.api.v1.routes.cache import router as cache_router
 from app.api.v1.routes.daily_prices import router as daily_prices_router
+from app.api.v1.routes.ingest import router as ingest_router
+from app.api.v1.routes.market import router as market_router
 from app.api.v1.routes.securities import router as securities_router
 
 api_router = APIRouter()
 
 api_router.include_router(securities_router)
-api_router.include_router(daily_prices_router) 
\ No newline at end of file
+api_router.include_router(daily_prices_router)
+api_router.include_router(market_router)
+api_router.include_router(analytics_router)
+api_router.include_router(cache_router)
+api_router.include_router(ingest_router) 
\ No newline at end of file
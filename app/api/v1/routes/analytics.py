@@ -0,0 +1,90 @@
+from typing import Any
+
+import numpy as np
+from fastapi import APIRouter, Depends, Response
+from fastapi.responses import JSONResponse
+from sqlalchemy.orm import Session
+
+from app.core.dependencies import get_db
+from app.crud import daily_prices as daily_prices_crud
+from app.crud import securities as securities_crud
+from app.crud.price_versions import get_price_versions
+from app.schemas.analytics import CorrelationRequest, CorrelationResponse
+from app.utils.analytics import dates_to_strings, log_returns, matrix_to_lists, pairwise_matrix, pivot_prices
+from app.utils.http_cache import respond_cached
+
+router = APIRouter(tags=["analytics"])
+
+# Columns loaded for the price matrix
+CLOSE_COLUMNS = {
+    "ticker": daily_prices_crud.TICKER_CHART_COLUMNS["ticker"],
+    "time": daily_prices_crud.CHART_COLUMNS["time"],
+    "close": daily_prices_crud.CHART_COLUMNS["close"],
+}
+
+# Upper bound of daily rows loaded per ticker
+MAX_ROWS_PER_TICKER = 50000
+
+
+@router.post("/analytics/correlation", response_model=CorrelationResponse)
+def get_correlation(
+    correlation_request: CorrelationRequest,
+    db: Session = Depends(get_db),
+) -> Any:
+    """
+    Get the pairwise correlation or covariance matrix of daily log returns
+    for up to 500 tickers.
+
+    Close prices of all tickers are fetched in one query and pivoted into a
+    date x ticker matrix. Days where a ticker has no price leave its returns
+    on both sides missing; every pair is computed over the days where both
+    returns exist (pairwise complete), all pairs at once with matrix
+    products. Results are cached per ticker set, window and options, keyed
+    by the price versions of the tickers, so a write to any of them from
+    any process (including the bulk loader) misses the cache.
+    """
+    # Keep the first occurrence of every ticker, in request order
+    tickers = list(dict.fromkeys(correlation_request.tickers))
+    existing = securities_crud.get_existing_tickers(db, tickers)
+    found = [ticker for ticker in tickers if ticker in existing]
+    not_found = [ticker for ticker in tickers if ticker not in existing]
+
+    def build() -> Response:
+        rows = daily_prices_crud.get_daily_price_columns_by_time_range_multi(
+            db=db,
+            tickers=found,
+            time_range=correlation_request.time_range,
+            limit=MAX_ROWS_PER_TICKER,
+            columns=CLOSE_COLUMNS,
+        )
+        dates, prices = pivot_prices(rows, found)
+        returns = log_returns(prices) if len(dates) else np.empty((0, len(found)))
+        matrix, observations = pairwise_matrix(
+            returns, kind=correlation_request.kind.value, min_periods=correlation_request.min_periods
+        )
+
+        content = {
+            "tickers": found,
+            "kind": correlation_request.kind.value,
+            "time_range": correlation_request.time_range.value,
+            "matrix": matrix_to_lists(matrix),
+            "observations": observations.tolist(),
+            "dates": None,
+            "returns": None,
+            "not_found": not_found,
+        }
+        if correlation_request.include_returns:
+            content["dates"] = dates_to_strings(dates[1:])
+            content["returns"] = matrix_to_lists(returns)
+        return JSONResponse(content)
+
+    cache_key = (
+        "correlation",
+        tuple(tickers),
+        correlation_request.time_range.value,
+        correlation_request.kind.value,
+        correlation_request.min_periods,
+        correlation_request.include_returns,
+    )
+    watermark = get_price_versions(db, found)
+    return respond_cached((cache_key, watermark), found, build)
@@ -0,0 +1,26 @@
+from typing import Any
+
+from fastapi import APIRouter, status
+
+from app.core.cache import count_cache, response_cache
+from app.schemas.cache import CacheStatsResponse
+
+router = APIRouter(tags=["cache"])
+
+
+@router.get("/cache/stats", response_model=CacheStatsResponse)
+def get_cache_stats() -> Any:
+    """
+    Get hit/miss/eviction counters of the in-process caches of this worker.
+    """
+    return {"responses": response_cache.stats(), "counts": count_cache.stats()}
+
+
+@router.delete("/cache", status_code=status.HTTP_204_NO_CONTENT)
+def clear_cache() -> None:
+    """
+    Drop every entry of the in-process caches of this worker.
+    """
+    response_cache.clear()
+    count_cache.clear()
+    return None
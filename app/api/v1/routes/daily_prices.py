@@ -1,20 +1,59 @@
+import asyncio
 from datetime import datetime
+from itertools import groupby
 from typing import Any, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status, Path
+import numpy as np
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status, Path
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, StreamingResponse
+from sqlalchemy.exc import DataError, IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.core.dependencies import get_db
+from app.core.cache import ALL_TICKERS
+from app.core.config import settings
+from app.core.dependencies import get_async_db, get_db
 from app.crud import daily_prices as daily_prices_crud
+from app.crud import daily_prices_async
 from app.crud import securities as securities_crud
+from app.crud import securities_async
+from app.utils.arrow import DAILY_PRICE_SCHEMA, encode_table, negotiate_binary_format, rows_to_table
+from app.utils.columnar import rows_to_columns
+from app.utils.downsampling import downsample_rows
+from app.utils.fast_json import DAILY_PRICE_LIST_JSON
+from app.utils.ingest_buffer import IngestBuffer, IngestBufferFull, UnknownTicker, get_ingest_buffer, is_transient
+from app.utils.indicators import compute_indicators, parse_indicator_set, series_to_list, warmup_rows
+from app.utils.pagination import decode_time_ticker_cursor, next_cursor
+from app.utils.export import MEDIA_TYPES, stream_daily_prices_by_time_range
+from app.utils.http_cache import (
+    etag_matches,
+    make_etag,
+    model_response,
+    not_modified,
+    respond_cached,
+    respond_cached_async,
+    with_etag,
+)
 from app.schemas.daily_prices import (
+    DailyPriceBatchCreate,
+    DailyPriceBatchResult,
     DailyPriceCreate,
     DailyPriceList,
     DailyPriceResponse,
     DailyPriceUpdate,
+    DownsampleMethod,
+    ExportFormat,
+    OHLCVInterval,
+    OHLCVList,
+    ResponseLayout,
+    TotalMode,
     TimeRange,
     ExtendedDailyPriceResponse,
     ExtendedDailyPriceList,
+    IndicatorResponse,
+    MultiTickerRangeRequest,
+    MultiTickerRangeResponse,
 )
 
 router = APIRouter(tags=["daily-prices"])
@@ -24,24 +63,51 @@ router = APIRouter(tags=["daily-prices"])
     "/daily-prices",
     response_model=ExtendedDailyPriceResponse,
     status_code=status.HTTP_201_CREATED,
+    responses={
+        status.HTTP_202_ACCEPTED: {"description": "Queued by the write-behind buffer, not yet committed"},
+        status.HTTP_409_CONFLICT: {"description": "Durable buffered write refused by a constraint"},
+        status.HTTP_422_UNPROCESSABLE_ENTITY: {"description": "Durable buffered write refused: values out of range"},
+        status.HTTP_503_SERVICE_UNAVAILABLE: {
+            "description": "Write-behind buffer full, or the database unavailable for a durable write; retry later"
+        },
+    },
 )
-def create_daily_price(
+async def create_daily_price(
     daily_price: DailyPriceCreate,
-    db: Session = Depends(get_db),
+    durable: Optional[bool] = Query(
+        None, description="With write-behind ingestion, answer only once the row is committed"
+    ),
+    db: AsyncSession = Depends(get_async_db),
 ) -> Any:
     """
     Create a new daily price record.
+
+    When write-behind ingestion is enabled (`INGEST_BUFFER_ENABLED`), the
+    row is queued and written with other rows in a batched upsert: an
+    existing row for the same ticker and time is overwritten instead of
+    rejected, and the response is `202 Accepted` echoing the row. With
+    `durable=true` (default `INGEST_DURABLE_ACK`) the response waits for the
+    batch to commit and is `201 Created`. A full buffer answers `503` with
+    `Retry-After`. A durable write that fails answers `409` or `422` if the
+    database refused the row, or `503` if the database stayed unavailable
+    through the buffer's retries.
     """
     # Check if the associated security exists
-    db_security = securities_crud.get_security_by_ticker(db, ticker=daily_price.ticker)
+    db_security = await securities_async.get_security_by_ticker(db, ticker=daily_price.ticker)
     if not db_security:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Security with ticker {daily_price.ticker} not found",
         )
 
+    buffer = get_ingest_buffer()
+    if buffer is not None:
+        return await _create_daily_price_buffered(
+            buffer, daily_price, settings.INGEST_DURABLE_ACK if durable is None else durable
+        )
+
     # Check if a daily price for this ticker and time already exists
-    db_daily_price = daily_prices_crud.get_daily_price_by_ticker_and_time(
+    db_daily_price = await daily_prices_async.get_daily_price_by_ticker_and_time(
         db, ticker=daily_price.ticker, time=daily_price.time
     )
     if db_daily_price:
@@ -50,37 +116,227 @@ def create_daily_price(
             detail=f"Daily price for ticker {daily_price.ticker} at {daily_price.time} already exists",
         )
 
-    return daily_prices_crud.create_daily_price(db=db, daily_price=daily_price)
+    return await daily_prices_async.create_daily_price(db=db, daily_price=daily_price)
+
+
+async def _create_daily_price_buffered(
+    buffer: IngestBuffer, daily_price: DailyPriceCreate, durable: bool
+) -> Response:
+    """Queue a row in the write-behind buffer and build the acknowledgement."""
+    try:
+        future = buffer.submit(daily_price, durable=durable, wait=False)
+    except IngestBufferFull:
+        # Full: wait for room off the event loop, up to the enqueue timeout
+        try:
+            future = await run_in_threadpool(buffer.submit, daily_price, durable)
+        except IngestBufferFull:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Ingest buffer is full",
+                headers={"Retry-After": "1"},
+            )
+
+    response = model_response(ExtendedDailyPriceResponse, daily_price)
+    if future is None:
+        response.status_code = status.HTTP_202_ACCEPTED
+        return response
+
+    try:
+        await asyncio.wrap_future(future)
+    except Exception as exc:
+        raise _buffered_write_error(daily_price, exc) from exc
+    response.status_code = status.HTTP_201_CREATED
+    return response
+
+
+def _buffered_write_error(daily_price: DailyPriceCreate, exc: Exception) -> HTTPException:
+    """
+    HTTP error for a durable buffered write that failed after the buffer's
+    retries and batch splitting: the row itself was refused (404/409/422),
+    or the database stayed unavailable (503).
+    """
+    row = f"ticker {daily_price.ticker} at {daily_price.time}"
+    if isinstance(exc, UnknownTicker):
+        return HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Security with ticker {daily_price.ticker} not found",
+        )
+    if is_transient(exc):
+        return HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Daily price for {row} was not written: the database is unavailable",
+            headers={"Retry-After": "1"},
+        )
+    if isinstance(exc, IntegrityError):
+        return HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Daily price for {row} conflicts with existing data",
+        )
+    if isinstance(exc, DataError):
+        return HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Daily price for {row} has values the database cannot store",
+        )
+    return HTTPException(
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        detail=f"Daily price for {row} was not written",
+    )
+
+
+@router.post("/daily-prices/batch", response_model=DailyPriceBatchResult)
+async def upsert_daily_prices_batch(
+    batch: DailyPriceBatchCreate,
+    db: AsyncSession = Depends(get_async_db),
+) -> Any:
+    """
+    Insert or update many daily price records in one transaction.
+
+    Tickers are validated with a single query; rows for unknown tickers are
+    skipped and reported. Existing (time, ticker) rows are overwritten, so a
+    corrected batch can be re-sent safely.
+    """
+    tickers = {item.ticker for item in batch.items}
+    existing_tickers = await securities_async.get_existing_tickers(db, tickers)
+    unknown_tickers = sorted(tickers - existing_tickers)
+
+    rows = [item for item in batch.items if item.ticker in existing_tickers]
+    inserted, updated = await daily_prices_async.upsert_daily_prices(db=db, daily_prices=rows)
+
+    return {
+        "total": len(batch.items),
+        "inserted": inserted,
+        "updated": updated,
+        "duplicates": len(rows) - inserted - updated,
+        "rejected": len(batch.items) - len(rows),
+        "unknown_tickers": unknown_tickers,
+    }
 
 
 @router.get("/daily-prices", response_model=ExtendedDailyPriceList)
-def list_daily_prices(
-    db: Session = Depends(get_db),
+async def list_daily_prices(
+    db: AsyncSession = Depends(get_async_db),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     ticker: Optional[str] = Query(None, description="Filter by ticker symbol"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page; replaces skip"),
+    total_mode: TotalMode = Query(
+        TotalMode.EXACT, description="exact: cached COUNT(*); estimate: from table statistics; none: skip the total"
+    ),
+    layout: ResponseLayout = Query(
+        ResponseLayout.ROWS, description="rows: one object per price; columnar: one array per column"
+    ),
+    accept: Optional[str] = Header(None),
+    if_none_match: Optional[str] = Header(None),
 ) -> Any:
     """
     Retrieve daily prices with optional filtering.
+
+    Pages are ordered by time then ticker, newest first. Every full page
+    carries a `next_cursor`; passing it back as `cursor` continues right after
+    the last row with an index seek, so deep pages cost the same as the first.
+
+    `total_mode` controls the `total` field: `exact` counts rows (cached per
+    filter and invalidated on writes), `estimate` uses TimescaleDB/planner
+    statistics, and `none` returns null without counting.
+
+    With `layout=columnar` the response is `{"columns": {...}, "total": n}`
+    holding parallel ticker/time/open/high/low/close/volume arrays.
+
+    Requests with `Accept: application/vnd.apache.arrow.stream` or
+    `Accept: application/x-parquet` get every daily_prices column as a typed
+    Arrow IPC stream or Parquet file instead of JSON; the next cursor is sent
+    in the `X-Next-Cursor` header.
+
+    Responses are cached in-process and invalidated by writes to the ticker
+    (or to any ticker for unfiltered lists). They carry an `ETag` derived from
+    the latest price time and the price version stored in the database; a
+    matching `If-None-Match` gets a 304 without running the listing query.
     """
     filters = {}
     if ticker:
         filters["ticker"] = ticker
 
-    items = daily_prices_crud.get_daily_prices(
-        db=db, skip=skip, limit=limit, filters=filters
-    )
-    total = daily_prices_crud.count_daily_prices(db=db, filters=filters)
+    after = None
+    if cursor:
+        try:
+            after = decode_time_ticker_cursor(cursor)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor",
+            )
+        skip = 0
 
-    return {"items": items, "total": total}
+    binary_media_type = negotiate_binary_format(accept)
+
+    async def build() -> Response:
+        if binary_media_type:
+            rows = await daily_prices_async.get_daily_price_columns(
+                db=db, skip=skip, limit=limit, filters=filters,
+                columns=daily_prices_crud.DAILY_PRICE_COLUMNS, after=after,
+            )
+            content = encode_table(rows_to_table(rows, DAILY_PRICE_SCHEMA), binary_media_type)
+            headers = {}
+            cursor = next_cursor(rows, limit, "time", "ticker")
+            if cursor:
+                headers["X-Next-Cursor"] = cursor
+            return Response(content=content, media_type=binary_media_type, headers=headers)
+
+        if layout == ResponseLayout.COLUMNAR:
+            columns = daily_prices_crud.TICKER_CHART_COLUMNS
+            rows = await daily_prices_async.get_daily_price_columns(
+                db=db, skip=skip, limit=limit, filters=filters, columns=columns, after=after
+            )
+            total = await daily_prices_async.get_daily_prices_total(db=db, filters=filters, total_mode=total_mode.value)
+            return JSONResponse({
+                "columns": rows_to_columns(rows, list(columns)),
+                "total": total,
+                "next_cursor": next_cursor(rows, limit, "time", "ticker"),
+            })
+
+        items = await daily_prices_async.get_daily_price_columns(
+            db=db, skip=skip, limit=limit, filters=filters,
+            columns=daily_prices_crud.DAILY_PRICE_COLUMNS, after=after,
+        )
+        total = await daily_prices_async.get_daily_prices_total(db=db, filters=filters, total_mode=total_mode.value)
+
+        return DAILY_PRICE_LIST_JSON.response({
+            "items": items,
+            "total": total,
+            "next_cursor": next_cursor(items, limit, "time", "ticker"),
+        })
+
+    cache_key = (
+        "daily-prices", ticker, skip, limit, cursor, total_mode.value, layout.value, binary_media_type
+    )
+    watermark = await daily_prices_async.get_price_watermark(db, ticker=ticker)
+    etag = make_etag(cache_key, watermark)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    # Keyed by the watermark too, so writes made by other processes miss
+    return with_etag(await respond_cached_async((cache_key, watermark), [ticker or ALL_TICKERS], build), etag)
 
 
 @router.get("/daily-prices/{ticker}/range/{time_range}", response_model=ExtendedDailyPriceList)
-def get_daily_prices_by_time_range(
+async def get_daily_prices_by_time_range(
     ticker: str = Path(..., description="Ticker symbol of the security"),
     time_range: TimeRange = Path(..., description="Time range for data retrieval"),
     limit: int = Query(10000, ge=1, le=50000, description="Maximum number of data points to return"),
-    db: Session = Depends(get_db),
+    export_format: Optional[ExportFormat] = Query(
+        None, alias="format", description="Stream the rows as ndjson or csv instead of a JSON document"
+    ),
+    layout: ResponseLayout = Query(
+        ResponseLayout.ROWS, description="rows: one object per price; columnar: one array per column"
+    ),
+    max_points: Optional[int] = Query(
+        None, ge=3, le=10000, description="Downsample the series to at most this many points"
+    ),
+    downsample: DownsampleMethod = Query(
+        DownsampleMethod.LTTB, description="Downsampling method used with max_points"
+    ),
+    accept: Optional[str] = Header(None),
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db),
 ) -> Any:
     """
     Get daily prices for a specific ticker based on predefined time range.
@@ -93,35 +349,261 @@ def get_daily_prices_by_time_range(
     - 1y: Last 365 days
     - 5y: Last 5 years
     - all: All available data
+
+    With `format=ndjson` or `format=csv` the rows are streamed from a
+    server-side cursor as they are read, so memory stays flat for any range.
+
+    With `layout=columnar` the response is `{"columns": {...}, "total": n}`
+    holding parallel time/open/high/low/close/volume arrays, built directly
+    from query tuples.
+
+    Requests with `Accept: application/vnd.apache.arrow.stream` or
+    `Accept: application/x-parquet` get every daily_prices column as a typed
+    Arrow IPC stream or Parquet file instead of JSON.
+
+    `max_points` downsamples the close price series on the server with
+    Largest-Triangle-Three-Buckets (`downsample=lttb`) or per-bucket
+    min/max (`downsample=minmax`), keeping the shape of the chart while
+    bounding the payload. It does not apply to streamed formats.
+
+    Non-streamed responses are served from an in-process cache keyed by all
+    of the parameters above and invalidated when the ticker's prices change.
+    Every response carries an `ETag` derived from the ticker's latest price
+    time and price version; pollers sending it back in `If-None-Match` get a
+    304 without the range query running.
     """
-    # Check if the security exists
-    db_security = securities_crud.get_security_by_ticker(db, ticker=ticker)
+    # Check if the security exists first: an unknown ticker is a 404, never a 304
+    db_security = await securities_async.get_security_by_ticker(db, ticker=ticker)
     if not db_security:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Security with ticker {ticker} not found",
         )
-    
-    items = daily_prices_crud.get_daily_prices_by_time_range(
-        db=db, ticker=ticker, time_range=time_range, limit=limit
+
+    binary_media_type = negotiate_binary_format(accept)
+    cache_key = (
+        "range", ticker, time_range.value, limit, layout.value, binary_media_type, max_points, downsample.value
     )
-    
-    # Count items for response
-    total = len(items)
-    
-    return {"items": items, "total": total}
+    watermark = await daily_prices_async.get_price_watermark(db, ticker=ticker)
+    etag = make_etag(cache_key, export_format.value if export_format is not None else None, watermark)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    if export_format is not None:
+        headers = {}
+        if export_format == ExportFormat.CSV:
+            headers["Content-Disposition"] = f'attachment; filename="{ticker}_{time_range.value}.csv"'
+        headers["ETag"] = etag
+        return StreamingResponse(
+            stream_daily_prices_by_time_range(
+                ticker=ticker, time_range=time_range, limit=limit, export_format=export_format.value
+            ),
+            media_type=MEDIA_TYPES[export_format.value],
+            headers=headers,
+        )
+
+    async def build() -> Response:
+        if binary_media_type:
+            rows = await daily_prices_async.get_daily_price_columns_by_time_range(
+                db=db, ticker=ticker, time_range=time_range, limit=limit,
+                columns=daily_prices_crud.DAILY_PRICE_COLUMNS,
+            )
+            rows = downsample_rows(rows, max_points, downsample.value)
+            content = encode_table(rows_to_table(rows, DAILY_PRICE_SCHEMA), binary_media_type)
+            return Response(content=content, media_type=binary_media_type)
+
+        if layout == ResponseLayout.COLUMNAR:
+            columns = daily_prices_crud.CHART_COLUMNS
+            rows = await daily_prices_async.get_daily_price_columns_by_time_range(
+                db=db, ticker=ticker, time_range=time_range, limit=limit, columns=columns
+            )
+            rows = downsample_rows(rows, max_points, downsample.value, value_attr="close")
+            return JSONResponse({"columns": rows_to_columns(rows, list(columns)), "total": len(rows)})
+
+        items = await daily_prices_async.get_daily_price_columns_by_time_range(
+            db=db, ticker=ticker, time_range=time_range, limit=limit,
+            columns=daily_prices_crud.DAILY_PRICE_COLUMNS,
+        )
+        items = downsample_rows(items, max_points, downsample.value)
+
+        # Count items for response
+        total = len(items)
+
+        return DAILY_PRICE_LIST_JSON.response({"items": items, "total": total})
+
+    return with_etag(await respond_cached_async((cache_key, watermark), [ticker], build), etag)
+
+
+@router.post("/daily-prices/range", response_model=MultiTickerRangeResponse)
+async def get_daily_prices_by_time_range_multi(
+    range_request: MultiTickerRangeRequest,
+    db: AsyncSession = Depends(get_async_db),
+) -> Any:
+    """
+    Get daily prices for several tickers over the same time range.
+
+    Tickers are validated with one query and prices for all of them are read
+    with a single `ticker = ANY(:tickers)` query. Results are grouped by
+    ticker in request order; unknown tickers are listed in `not_found`.
+    With `layout=columnar` each ticker maps to `{"columns": {...}, "total": n}`.
+    """
+    tickers = list(dict.fromkeys(range_request.tickers))
+    existing_tickers = await securities_async.get_existing_tickers(db, tickers)
+    found = [ticker for ticker in tickers if ticker in existing_tickers]
+    not_found = [ticker for ticker in tickers if ticker not in existing_tickers]
+
+    columnar = range_request.layout == ResponseLayout.COLUMNAR
+    columns = daily_prices_crud.TICKER_CHART_COLUMNS if columnar else daily_prices_crud.DAILY_PRICE_COLUMNS
+    rows = []
+    if found:
+        rows = await daily_prices_async.get_daily_price_columns_by_time_range_multi(
+            db=db, tickers=found, time_range=range_request.time_range, limit=range_request.limit, columns=columns
+        )
+    rows_by_ticker = {ticker: list(group) for ticker, group in groupby(rows, key=lambda row: row.ticker)}
+
+    if columnar:
+        names = list(columns)
+        items = {}
+        for ticker in found:
+            ticker_rows = rows_by_ticker.get(ticker, [])
+            ticker_columns = rows_to_columns(ticker_rows, names)
+            del ticker_columns["ticker"]
+            items[ticker] = {"columns": ticker_columns, "total": len(ticker_rows)}
+        return JSONResponse({"items": items, "not_found": not_found})
+
+    items = {}
+    for ticker in found:
+        ticker_rows = rows_by_ticker.get(ticker, [])
+        items[ticker] = {"items": ticker_rows, "total": len(ticker_rows)}
+    return {"items": items, "not_found": not_found}
+
+
+@router.get("/daily-prices/{ticker}/ohlcv", response_model=OHLCVList)
+async def get_ohlcv(
+    ticker: str = Path(..., description="Ticker symbol of the security"),
+    interval: OHLCVInterval = Query(..., description="Bucket size: 1w, 1M, 1q or 1y"),
+    time_range: TimeRange = Query(TimeRange.ALL, description="Time range for data retrieval"),
+    limit: int = Query(1000, ge=1, le=10000, description="Maximum number of bars to return"),
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db),
+) -> Any:
+    """
+    Get weekly, monthly, quarterly or yearly OHLCV bars for a ticker.
+
+    Bars are aggregated in the database: first open, max high, min low,
+    last close and summed volume and order values per bucket. Responses
+    carry an `ETag`; a matching `If-None-Match` gets a 304.
+    """
+    # Check if the security exists first: an unknown ticker is a 404, never a 304
+    db_security = await securities_async.get_security_by_ticker(db, ticker=ticker)
+    if not db_security:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Security with ticker {ticker} not found",
+        )
+
+    etag = make_etag(
+        "ohlcv", ticker, interval.value, time_range.value, limit,
+        await daily_prices_async.get_price_watermark(db, ticker=ticker),
+    )
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    items = await daily_prices_async.get_ohlcv(
+        db=db, ticker=ticker, interval=interval.value, time_range=time_range, limit=limit
+    )
+    return with_etag(
+        model_response(OHLCVList, {"ticker": ticker, "interval": interval, "items": items, "total": len(items)}),
+        etag,
+    )
+
+
+@router.get("/daily-prices/{ticker}/indicators", response_model=IndicatorResponse)
+def get_indicators(
+    ticker: str = Path(..., description="Ticker symbol of the security"),
+    indicator_set: str = Query(
+        ..., alias="set", description="Comma separated indicators, e.g. sma20,ema50,rsi14,macd,bb20,atr14"
+    ),
+    time_range: TimeRange = Query(TimeRange.ONE_YEAR, description="Time range for data retrieval"),
+    limit: int = Query(10000, ge=1, le=50000, description="Maximum number of data points to return"),
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db),
+) -> Any:
+    """
+    Get the price series of a ticker together with technical indicators.
+
+    Supported indicators: `sma<n>`, `ema<n>`, `rsi<n>` (Wilder), `atr<n>`
+    (Wilder), `bb<n>` (Bollinger bands at 2 standard deviations, returned as
+    `bb<n>_upper/_middle/_lower`) and `macd` (12/26/9, returned as
+    `macd/macd_signal/macd_hist`).
+
+    The close/high/low arrays are loaded once, with enough history before the
+    range for every indicator to converge, and all indicators are computed
+    together with vectorized NumPy kernels that share rolling windows and
+    EMAs. The response is columnar, newest first, with indicator arrays
+    aligned to the price columns.
+    """
+    try:
+        names = parse_indicator_set(indicator_set)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+
+    # Check if the security exists first: an unknown ticker is a 404, never a 304
+    db_security = securities_crud.get_security_by_ticker(db, ticker=ticker)
+    if not db_security:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Security with ticker {ticker} not found",
+        )
+
+    cache_key = ("indicators", ticker, tuple(names), time_range.value, limit)
+    watermark = daily_prices_crud.get_price_watermark(db, ticker=ticker)
+    etag = make_etag(cache_key, watermark)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    def build() -> Response:
+        columns = daily_prices_crud.CHART_COLUMNS
+        rows = daily_prices_crud.get_daily_price_columns_by_time_range(
+            db=db, ticker=ticker, time_range=time_range, limit=limit, columns=columns
+        )
+        history = []
+        if rows:
+            history = daily_prices_crud.get_daily_price_columns_before(
+                db=db, ticker=ticker, before=rows[-1].time, limit=warmup_rows(names), columns=columns
+            )
+
+        # Oldest first for the kernels; outputs are sliced back to the range
+        series = (list(rows) + list(history))[::-1]
+        prices = {
+            name: np.array([getattr(row, name) for row in series], dtype=np.float64)
+            for name in ("close", "high", "low")
+        }
+        results = compute_indicators(names, prices["close"], prices["high"], prices["low"])
+
+        return JSONResponse({
+            "ticker": ticker,
+            "time_range": time_range.value,
+            "columns": rows_to_columns(rows, list(columns)),
+            "indicators": {
+                name: series_to_list(values[len(history):][::-1]) for name, values in results.items()
+            },
+            "total": len(rows),
+        })
+
+    return with_etag(respond_cached((cache_key, watermark), [ticker], build), etag)
 
 
 @router.get("/daily-prices/{ticker}/{time}", response_model=ExtendedDailyPriceResponse)
-def get_daily_price(
+async def get_daily_price(
     ticker: str,
     time: datetime,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> Any:
     """
     Get a specific daily price by ticker and time.
     """
-    db_daily_price = daily_prices_crud.get_daily_price_by_ticker_and_time(
+    db_daily_price = await daily_prices_async.get_daily_price_by_ticker_and_time(
         db=db, ticker=ticker, time=time
     )
     if not db_daily_price:
@@ -133,16 +615,16 @@ def get_daily_price(
 
 
 @router.put("/daily-prices/{ticker}/{time}", response_model=ExtendedDailyPriceResponse)
-def update_daily_price(
+async def update_daily_price(
     ticker: str,
     time: datetime,
     daily_price_update: DailyPriceUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> Any:
     """
     Update a daily price record.
     """
-    updated_daily_price = daily_prices_crud.update_daily_price(
+    updated_daily_price = await daily_prices_async.update_daily_price(
         db=db, ticker=ticker, time=time, daily_price=daily_price_update
     )
     if not updated_daily_price:
@@ -154,15 +636,15 @@ def update_daily_price(
 
 
 @router.delete("/daily-prices/{ticker}/{time}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_daily_price(
+async def delete_daily_price(
     ticker: str,
     time: datetime,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> None:
     """
     Delete a daily price record.
     """
-    success = daily_prices_crud.delete_daily_price(db=db, ticker=ticker, time=time)
+    success = await daily_prices_async.delete_daily_price(db=db, ticker=ticker, time=time)
     if not success:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
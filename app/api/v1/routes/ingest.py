@@ -0,0 +1,18 @@
+from typing import Any
+
+from fastapi import APIRouter
+
+from app.schemas.ingest import IngestStatsResponse
+from app.utils.ingest_buffer import get_ingest_buffer
+
+router = APIRouter(tags=["ingest"])
+
+
+@router.get("/ingest/stats", response_model=IngestStatsResponse)
+def get_ingest_stats() -> Any:
+    """
+    Get queue depth, flush and lag metrics of the write-behind ingest buffer
+    of this worker.
+    """
+    buffer = get_ingest_buffer()
+    return {"enabled": buffer is not None, "buffer": buffer.stats() if buffer is not None else None}
@@ -0,0 +1,75 @@
+from datetime import date
+from typing import Any, Optional
+
+from fastapi import APIRouter, Depends, Header, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.cache import ALL_TICKERS
+from app.core.dependencies import get_async_db, get_db
+from app.crud import market_async
+from app.schemas.market import MarketMovers, MarketSnapshot, MoverMetric, MoverOrder
+from app.utils.http_cache import etag_matches, make_etag, model_response, not_modified, respond_cached_async, with_etag
+from app.utils.rankings import get_day_rankings
+
+router = APIRouter(tags=["market"])
+
+
+@router.get("/market/snapshot", response_model=MarketSnapshot)
+async def get_market_snapshot(
+    exchange: Optional[str] = Query(None, description="Only securities listed on this exchange"),
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db),
+) -> Any:
+    """
+    Get the latest daily price of every active security in one request.
+
+    The board is read from the latest_prices table, which the write paths
+    keep up to date, instead of scanning daily_prices. Responses are cached
+    in-process, invalidated by writes, and carry an `ETag`.
+    """
+    cache_key = ("market-snapshot", exchange)
+    watermark = await market_async.get_snapshot_watermark(db)
+    etag = make_etag(cache_key, watermark)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    async def build() -> Response:
+        items = await market_async.get_market_snapshot(db, exchange=exchange)
+        as_of = max((item.time for item in items), default=None)
+        return model_response(MarketSnapshot, {"items": items, "total": len(items), "as_of": as_of})
+
+    return with_etag(await respond_cached_async((cache_key, watermark), [ALL_TICKERS], build), etag)
+
+
+@router.get("/market/movers", response_model=MarketMovers)
+def get_market_movers(
+    metric: MoverMetric = Query(MoverMetric.PERCENT_CHANGE, description="Value to rank securities by"),
+    order: MoverOrder = Query(
+        MoverOrder.TOP, description="top: highest values (gainers, most active); bottom: lowest (losers)"
+    ),
+    exchange: Optional[str] = Query(None, description="Only securities listed on this exchange"),
+    n: int = Query(20, ge=1, le=200, description="Number of securities to return"),
+    trading_day: Optional[date] = Query(None, description="Trading day to rank; the latest one by default"),
+    db: Session = Depends(get_db),
+) -> Any:
+    """
+    Get the top or bottom securities of a trading day by percent change
+    (gainers/losers), volume (most active) or foreign net buy value.
+
+    Rankings of a day are precomputed once from its cross-section, for the
+    whole market and per exchange, and kept until the next write to that
+    day; a request only slices the precomputed order.
+    """
+    rankings = get_day_rankings(db, day=trading_day)
+    items = []
+    if rankings is not None:
+        items = rankings.top(metric.value, n, exchange=exchange, ascending=order == MoverOrder.BOTTOM)
+    return {
+        "trading_day": rankings.day if rankings is not None else None,
+        "metric": metric,
+        "order": order,
+        "exchange": exchange,
+        "items": items,
+        "total": len(items),
+    }
@@ -1,29 +1,37 @@
 from typing import Any, Dict, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.orm import Session
-
-from app.core.dependencies import get_db
-from app.crud import securities as securities_crud
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from fastapi import status as http_status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.dependencies import get_async_db
+from app.crud import securities_async as securities_crud
+from app.utils.fast_json import SECURITIES_LIST_JSON
+from app.utils.http_cache import etag_matches, make_etag, model_response, not_modified, with_etag
+from app.utils.pagination import decode_ticker_cursor, next_cursor
 from app.schemas.securities import (
+    SecuritiesBatchCreate,
+    SecuritiesBatchResult,
     SecuritiesCreate,
     SecuritiesResponse,
     SecuritiesList,
     SecuritiesUpdate,
+    SecuritySearchItem,
+    SecuritySearchResults,
 )
 
 router = APIRouter(tags=["securities"])
 
 
 @router.post("/securities", response_model=SecuritiesResponse, status_code=status.HTTP_201_CREATED)
-def create_security(
+async def create_security(
     security: SecuritiesCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> Any:
     """
     Create a new security.
     """
     # Check if security with same ticker already exists
-    db_security = securities_crud.get_security_by_ticker(db, ticker=security.ticker)
+    db_security = await securities_crud.get_security_by_ticker(db, ticker=security.ticker)
     if db_security:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -32,28 +40,54 @@ def create_security(
 
     # Check if ISIN code is unique if provided
     if security.isin_code:
-        db_security_isin = securities_crud.get_security_by_isin(db, isin_code=security.isin_code)
+        db_security_isin = await securities_crud.get_security_by_isin(db, isin_code=security.isin_code)
         if db_security_isin:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Security with ISIN {security.isin_code} already exists",
             )
 
-    return securities_crud.create_security(db=db, security=security)
+    return await securities_crud.create_security(db=db, security=security)
+
+
+@router.post("/securities/batch", response_model=SecuritiesBatchResult)
+async def upsert_securities_batch(
+    batch: SecuritiesBatchCreate,
+    db: AsyncSession = Depends(get_async_db),
+) -> Any:
+    """
+    Insert or update many securities in one transaction.
+
+    Existing tickers are overwritten, so a corrected listing file can be
+    re-sent. ISIN uniqueness is checked for the whole batch with a single
+    query; rows whose ISIN belongs to another security (or to an earlier row
+    of the batch) are skipped and reported in `conflicts`.
+    """
+    return await securities_crud.upsert_securities(db=db, securities=batch.items)
 
 
 @router.get("/securities", response_model=SecuritiesList)
-def list_securities(
-    db: Session = Depends(get_db),
+async def list_securities(
+    db: AsyncSession = Depends(get_async_db),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     ticker: Optional[str] = None,
     exchange: Optional[str] = None,
     status: Optional[str] = None,
     margin_status: Optional[str] = None,
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page; replaces skip"),
+    if_none_match: Optional[str] = Header(None),
 ) -> Any:
     """
     Retrieve securities with optional filtering.
+
+    Securities are ordered by ticker. Every full page carries a `next_cursor`;
+    passing it back as `cursor` continues after the last ticker with an index
+    seek instead of OFFSET.
+
+    Responses carry an `ETag` derived from the latest `updated_at` and the
+    count of the filtered securities; a matching `If-None-Match` gets a 304
+    without the page being read.
     """
     # Build filter dict from parameters
     filters = {}
@@ -66,40 +100,96 @@ def list_securities(
     if margin_status:
         filters["margin_status"] = margin_status
 
-    items = securities_crud.get_securities(db=db, skip=skip, limit=limit, filters=filters)
-    total = securities_crud.count_securities(db=db, filters=filters)
-    
-    return {"items": items, "total": total}
+    after = None
+    if cursor:
+        try:
+            after = decode_ticker_cursor(cursor)
+        except ValueError:
+            # `status` is shadowed by the status filter parameter here
+            raise HTTPException(
+                status_code=http_status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor",
+            )
+        skip = 0
+
+    latest, total = await securities_crud.get_securities_watermark(db=db, filters=filters)
+    etag = make_etag("securities", sorted(filters.items()), skip, limit, cursor, latest, total)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    items = await securities_crud.get_securities(db=db, skip=skip, limit=limit, filters=filters, after=after)
+
+    return with_etag(
+        SECURITIES_LIST_JSON.response(
+            {"items": items, "total": total, "next_cursor": next_cursor(items, limit, "ticker")}
+        ),
+        etag,
+    )
+
+
+# Declared before /securities/{ticker} so "search" is not taken for a ticker
+@router.get("/securities/search", response_model=SecuritySearchResults)
+async def search_securities(
+    q: str = Query(..., min_length=1, max_length=100, description="Ticker or company name, or a prefix of one"),
+    limit: int = Query(10, ge=1, le=50),
+    db: AsyncSession = Depends(get_async_db),
+) -> Any:
+    """
+    Autocomplete search over ticker, short name and company name.
+
+    Matching ignores case and Vietnamese diacritics. Results are ranked exact
+    ticker first, then ticker prefixes, name prefixes, word prefixes,
+    substrings and finally fuzzy (typo-tolerant) matches.
+    """
+    results = await securities_crud.search_securities(db=db, query=q, limit=limit)
+    return SecuritySearchResults(
+        items=[
+            SecuritySearchItem(
+                ticker=security.ticker,
+                short_name=security.short_name,
+                company_name=security.company_name,
+                exchange=security.exchange,
+                status=security.status,
+                score=score,
+            )
+            for security, score in results
+        ]
+    )
 
 
 @router.get("/securities/{ticker}", response_model=SecuritiesResponse)
-def get_security(
+async def get_security(
     ticker: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
+    if_none_match: Optional[str] = Header(None),
 ) -> Any:
     """
     Get security details by ticker.
+    The `ETag` follows the security's `updated_at`.
     """
-    db_security = securities_crud.get_security_by_ticker(db=db, ticker=ticker)
+    db_security = await securities_crud.get_security_by_ticker(db=db, ticker=ticker)
     if not db_security:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Security with ticker {ticker} not found",
         )
-    return db_security
+    etag = make_etag("security", ticker, db_security.updated_at)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    return with_etag(model_response(SecuritiesResponse, db_security), etag)
 
 
 @router.put("/securities/{ticker}", response_model=SecuritiesResponse)
-def update_security(
+async def update_security(
     ticker: str,
     security_update: SecuritiesUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> Any:
     """
     Update a security by ticker.
     """
     # Check if security exists
-    db_security = securities_crud.get_security_by_ticker(db=db, ticker=ticker)
+    db_security = await securities_crud.get_security_by_ticker(db=db, ticker=ticker)
     if not db_security:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -108,28 +198,28 @@ def update_security(
 
     # Check if ISIN code is unique if being updated
     if security_update.isin_code:
-        db_security_isin = securities_crud.get_security_by_isin(db=db, isin_code=security_update.isin_code)
+        db_security_isin = await securities_crud.get_security_by_isin(db=db, isin_code=security_update.isin_code)
         if db_security_isin and db_security_isin.ticker != ticker:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Security with ISIN {security_update.isin_code} already exists",
             )
 
-    updated_security = securities_crud.update_security(
+    updated_security = await securities_crud.update_security(
         db=db, ticker=ticker, security=security_update
     )
     return updated_security
 
 
 @router.delete("/securities/{ticker}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_security(
+async def delete_security(
     ticker: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> None:
     """
     Delete a security by ticker.
     """
-    success = securities_crud.delete_security(db=db, ticker=ticker)
+    success = await securities_crud.delete_security(db=db, ticker=ticker)
     if not success:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
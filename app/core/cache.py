@@ -0,0 +1,187 @@
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime, timezone
+from typing import Any, Dict, Hashable, Iterable, Optional, Set, Tuple
+
+from app.core.config import settings
+
+
+class TTLCache:
+    """
+    Thread-safe in-process cache with a size bound, LRU eviction and a
+    time-to-live per entry.
+
+    Entries can carry tags (e.g. a ticker) so that every entry derived from
+    the same data can be dropped at once with invalidate_tag. An optional
+    max_weight bounds the summed weight of the entries (e.g. bytes) on top of
+    the entry count.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0, max_weight: Optional[int] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.max_weight = max_weight
+        self._data: "OrderedDict[Hashable, Tuple[float, Any, Tuple[Hashable, ...], int]]" = OrderedDict()
+        self._tags: Dict[Hashable, Set[Hashable]] = {}
+        self._weight = 0
+        self._lock = threading.Lock()
+        # Bumped by every invalidation so that values computed before a write
+        # are not stored after it (see set)
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for key, or default if missing or expired."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            expires_at, value, _, _ = entry
+            if expires_at < time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        tags: Iterable[Hashable] = (),
+        weight: int = 1,
+        generation: Optional[int] = None,
+    ) -> None:
+        """
+        Store value under key, evicting the least recently used entries if full.
+        When generation is given (read before computing value), the value is
+        dropped if an invalidation happened in the meantime.
+        """
+        tags = tuple(tags)
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            if key in self._data:
+                self._remove(key)
+            if self.max_weight is not None and weight > self.max_weight:
+                return
+            self._data[key] = (time.monotonic() + self.ttl, value, tags, weight)
+            self._weight += weight
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._data) > self.maxsize or (
+                self.max_weight is not None and self._weight > self.max_weight
+            ):
+                self._remove(next(iter(self._data)))
+                self.evictions += 1
+
+    def invalidate_tag(self, tag: Hashable) -> int:
+        """Drop every entry carrying tag and return how many were removed."""
+        with self._lock:
+            self.generation += 1
+            keys = self._tags.pop(tag, set())
+            for key in keys:
+                self._remove(key)
+            self.invalidations += len(keys)
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.generation += 1
+            self._data.clear()
+            self._tags.clear()
+            self._weight = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters used to size the cache."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._data),
+                "maxsize": self.maxsize,
+                "weight": self._weight,
+                "max_weight": self.max_weight,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else None,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def _remove(self, key: Hashable) -> Optional[Any]:
+        """Remove key and its tag references; the caller must hold the lock."""
+        entry = self._data.pop(key, None)
+        if entry is None:
+            return None
+        self._weight -= entry[3]
+        for tag in entry[2]:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+        return entry[1]
+
+
+# Tag for entries that depend on every ticker (e.g. unfiltered lists)
+ALL_TICKERS = "*"
+
+# Encoded responses of the daily price read endpoints, weighted by body size
+response_cache = TTLCache(
+    maxsize=settings.RESPONSE_CACHE_MAXSIZE,
+    ttl=settings.RESPONSE_CACHE_TTL_SECONDS,
+    max_weight=settings.RESPONSE_CACHE_MAX_BYTES,
+)
+
+# Exact list totals per filter set
+count_cache = TTLCache(maxsize=4096, ttl=settings.COUNT_CACHE_TTL_SECONDS)
+
+# Market movers rankings per trading day, tagged with day_tag(day)
+ranking_cache = TTLCache(maxsize=32, ttl=settings.RANKING_CACHE_TTL_SECONDS)
+
+
+def trading_day(when: datetime) -> date:
+    """UTC date of a bar time (naive times are taken as UTC)."""
+    if when.tzinfo is not None:
+        when = when.astimezone(timezone.utc)
+    return when.date()
+
+
+def day_tag(day: date) -> Tuple[str, date]:
+    """Tag of the cache entries derived from the bars of one trading day."""
+    return ("day", day)
+
+
+def invalidate_tickers(tickers: Iterable[str], times: Optional[Iterable[datetime]] = None) -> None:
+    """
+    Drop cached responses and counts that depend on the given tickers.
+    Called after every write to daily_prices made through the CRUD layer.
+    Writes of other processes are seen through the price versions the
+    response cache keys include (see get_price_watermark).
+
+    Rankings are only dropped for the trading days of times, the bars
+    written; without times (e.g. a securities change) for every day.
+    """
+    tickers = set(tickers)
+    for cache in (response_cache, count_cache):
+        cache.invalidate_tag(ALL_TICKERS)
+        for ticker in tickers:
+            cache.invalidate_tag(ticker)
+    if times is None:
+        ranking_cache.invalidate_tag(ALL_TICKERS)
+    else:
+        for day in {trading_day(when) for when in times}:
+            ranking_cache.invalidate_tag(day_tag(day))
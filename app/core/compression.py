@@ -0,0 +1,254 @@
+import zlib
+from functools import partial
+from typing import Callable, Dict, List, Optional, Tuple
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+# brotli and zstandard are in requirements.txt; should either be missing,
+# its encoding is not offered and clients fall back to gzip
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Media types worth compressing; Parquet is already compressed
+COMPRESSIBLE_MEDIA_TYPES = (
+    "application/json",
+    "application/x-ndjson",
+    "application/vnd.apache.arrow.stream",
+    "text/",
+)
+
+
+class Encoder:
+    """
+    Incremental compressor: compress buffers input, sync_flush emits
+    everything compressed so far as a decodable block (the stream goes on)
+    and flush ends the stream.
+    """
+
+    def __init__(
+        self,
+        compress: Callable[[bytes], bytes],
+        sync_flush: Callable[[], bytes],
+        flush: Callable[[], bytes],
+    ):
+        self.compress = compress
+        self.sync_flush = sync_flush
+        self.flush = flush
+
+
+def gzip_encoder(level: int) -> Encoder:
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    return Encoder(compressor.compress, partial(compressor.flush, zlib.Z_SYNC_FLUSH), compressor.flush)
+
+
+def brotli_encoder(quality: int) -> Encoder:
+    compressor = brotli.Compressor(quality=quality)
+    return Encoder(compressor.process, compressor.flush, compressor.finish)
+
+
+def zstd_encoder(level: int) -> Encoder:
+    compressor = zstandard.ZstdCompressor(level=level).compressobj()
+    return Encoder(
+        compressor.compress, partial(compressor.flush, zstandard.COMPRESSOBJ_FLUSH_BLOCK), compressor.flush
+    )
+
+
+def compress_all(encoder: Encoder, body: bytes) -> bytes:
+    """Compress a complete body into one finished stream."""
+    return encoder.compress(body) + encoder.flush()
+
+
+def available_encodings() -> Dict[str, Callable[[], Encoder]]:
+    """
+    Encoder factories at the configured levels for the supported content
+    codings, in order of preference for equal q-values.
+    """
+    encodings = {}
+    if zstandard is not None:
+        encodings["zstd"] = partial(zstd_encoder, settings.COMPRESSION_ZSTD_LEVEL)
+    if brotli is not None:
+        encodings["br"] = partial(brotli_encoder, settings.COMPRESSION_BROTLI_QUALITY)
+    encodings["gzip"] = partial(gzip_encoder, settings.COMPRESSION_GZIP_LEVEL)
+    return encodings
+
+
+def negotiate_encoding(accept_encoding: Optional[str], encodings: List[str]) -> Optional[str]:
+    """
+    Pick a content coding from an Accept-Encoding header (RFC 9110 12.5.3):
+    the supported coding with the highest q-value, ties broken by the order
+    of encodings; "*" stands for every coding not listed. Returns None when
+    nothing acceptable is supported.
+    """
+    if not accept_encoding:
+        return None
+
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[coding] = q
+
+    best: Optional[Tuple[float, int]] = None
+    chosen = None
+    for index, coding in enumerate(encodings):
+        q = weights.get(coding, weights.get("*", 0.0))
+        if q > 0 and (best is None or (q, -index) > best):
+            best = (q, -index)
+            chosen = coding
+    return chosen
+
+
+class CompressionMiddleware:
+    """
+    Compress responses with the best content coding the client accepts
+    (zstd, br or gzip), for compressible media types only.
+
+    Complete bodies smaller than COMPRESSION_MINIMUM_SIZE are sent as is;
+    those of COMPRESSION_THREADPOOL_MIN_SIZE or more are compressed in the
+    threadpool so the event loop keeps serving other requests. Streamed
+    responses (StreamingResponse) are compressed chunk by chunk as they are
+    produced, with a sync flush after every chunk, so memory stays flat and
+    each chunk reaches the client as soon as it is produced. Compressed
+    responses get a weak ETag, since the bytes differ from the identity
+    representation the strong ETag was computed for.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: Optional[int] = None,
+        threadpool_min_size: Optional[int] = None,
+    ):
+        self.app = app
+        self.minimum_size = settings.COMPRESSION_MINIMUM_SIZE if minimum_size is None else minimum_size
+        self.threadpool_min_size = (
+            settings.COMPRESSION_THREADPOOL_MIN_SIZE if threadpool_min_size is None else threadpool_min_size
+        )
+        self.encodings = available_encodings()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        coding = negotiate_encoding(Headers(scope=scope).get("accept-encoding"), list(self.encodings))
+        if coding is None:
+            await self.app(scope, receive, send)
+            return
+        responder = _CompressionResponder(
+            self.app, send, coding, self.encodings[coding], self.minimum_size, self.threadpool_min_size
+        )
+        await responder(scope, receive)
+
+
+class _CompressionResponder:
+    """Send wrapper compressing one response."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        send: Send,
+        coding: str,
+        encoder_factory: Callable[[], Encoder],
+        minimum_size: int,
+        threadpool_min_size: int,
+    ):
+        self.app = app
+        self.send = send
+        self.coding = coding
+        self.encoder_factory = encoder_factory
+        self.minimum_size = minimum_size
+        self.threadpool_min_size = threadpool_min_size
+        self.start_message: Optional[Message] = None
+        self.encoder: Optional[Encoder] = None
+        self.passthrough = False
+
+    async def __call__(self, scope: Scope, receive: Receive) -> None:
+        await self.app(scope, receive, self.send_compressed)
+
+    def _compressible(self, headers: Headers) -> bool:
+        media_type = headers.get("content-type", "").split(";", 1)[0].strip().lower()
+        return (
+            "content-encoding" not in headers
+            and self.start_message["status"] not in (204, 304)
+            and media_type.startswith(COMPRESSIBLE_MEDIA_TYPES)
+        )
+
+    def _start_compressed(self) -> MutableHeaders:
+        headers = MutableHeaders(raw=self.start_message["headers"])
+        headers["Content-Encoding"] = self.coding
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            headers["ETag"] = f"W/{etag}"
+        self.encoder = self.encoder_factory()
+        return headers
+
+    async def send_compressed(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            # Held back until the first body chunk shows whether it is streamed
+            self.start_message = message
+            headers = Headers(raw=message["headers"])
+            self.passthrough = not self._compressible(headers)
+            if not self.passthrough:
+                MutableHeaders(raw=message["headers"]).add_vary_header("Accept-Encoding")
+            return
+
+        if message["type"] != "http.response.body":
+            await self.send(message)
+            return
+
+        if self.passthrough:
+            if self.start_message is not None:
+                await self.send(self.start_message)
+                self.start_message = None
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.encoder is None:
+            if not more_body:
+                # Complete body: compress it in one go unless it is small
+                if len(body) >= self.minimum_size:
+                    headers = self._start_compressed()
+                    if len(body) >= self.threadpool_min_size:
+                        body = await run_in_threadpool(compress_all, self.encoder, body)
+                    else:
+                        body = compress_all(self.encoder, body)
+                    headers["Content-Length"] = str(len(body))
+                    message["body"] = body
+                await self.send(self.start_message)
+                await self.send(message)
+                return
+
+            headers = self._start_compressed()
+            del headers["Content-Length"]
+            await self.send(self.start_message)
+
+        # A sync flush emits the chunk now instead of leaving it in the
+        # compressor's buffer until enough input has accumulated
+        chunk = self.encoder.compress(body)
+        chunk += self.encoder.sync_flush() if more_body else self.encoder.flush()
+        if chunk or not more_body:
+            await self.send({"type": "http.response.body", "body": chunk, "more_body": more_body})
@@ -17,12 +17,73 @@ class Settings(BaseSettings):
     
     # TimescaleDB specific settings
     TIMESCALEDB_ENABLED: bool = True
+    # Serve OHLCV resampling from the continuous aggregates created by the
+    # add_ohlcv_continuous_aggregates migration
+    OHLCV_CONTINUOUS_AGGREGATES_ENABLED: bool = True
+    
+    # Seconds an exact list total stays cached (writes in this process invalidate it sooner)
+    COUNT_CACHE_TTL_SECONDS: int = 300
+    
+    # In-process cache of encoded daily price responses
+    RESPONSE_CACHE_ENABLED: bool = True
+    RESPONSE_CACHE_MAXSIZE: int = 1024
+    RESPONSE_CACHE_MAX_BYTES: int = 256 * 1024 * 1024
+    RESPONSE_CACHE_TTL_SECONDS: int = 60
+    
+    # Seconds precomputed market movers rankings of a trading day stay cached
+    # (a write to the day, from any process, moves its price version sooner)
+    RANKING_CACHE_TTL_SECONDS: int = 300
+    
+    # Response compression (zstd, br or gzip), negotiated with Accept-Encoding
+    COMPRESSION_ENABLED: bool = True
+    # Complete bodies below this many bytes are sent uncompressed
+    COMPRESSION_MINIMUM_SIZE: int = 1024
+    # Complete bodies from this many bytes on are compressed in the threadpool
+    # instead of on the event loop
+    COMPRESSION_THREADPOOL_MIN_SIZE: int = 256 * 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 5
+    COMPRESSION_ZSTD_LEVEL: int = 3
+    
+    # Write-behind ingestion of single-row POST /daily-prices: rows are
+    # queued and upserted in batches of INGEST_BATCH_SIZE rows, at most
+    # INGEST_FLUSH_INTERVAL_MS after the oldest queued row
+    INGEST_BUFFER_ENABLED: bool = False
+    INGEST_BUFFER_MAX_ROWS: int = 50000
+    INGEST_BATCH_SIZE: int = 500
+    INGEST_FLUSH_INTERVAL_MS: int = 50
+    # Seconds a write waits for room in a full buffer before a 503
+    INGEST_ENQUEUE_TIMEOUT_SECONDS: float = 1.0
+    # Default of the durable query parameter: acknowledge after the commit
+    INGEST_DURABLE_ACK: bool = False
+    # Retries of a batch write failing with a transient database error, the
+    # first after INGEST_RETRY_BACKOFF_MS, doubling each time
+    INGEST_FLUSH_RETRIES: int = 5
+    INGEST_RETRY_BACKOFF_MS: int = 100
+    
+    # In-memory securities catalog serving ticker/ISIN lookups and filtered
+    # listings; refreshed on securities_changed notifications and, as a
+    # fallback, when a fingerprint check every interval sees a change
+    SECURITIES_CATALOG_ENABLED: bool = True
+    SECURITIES_CATALOG_CHECK_INTERVAL_SECONDS: float = 5.0
     
     # SQLAlchemy connection string
     @property
     def SQLALCHEMY_DATABASE_URI(self) -> str:
         return f"postgresql://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_SERVER}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
     
+    # asyncio engine used by the async routes (asyncpg driver)
+    ASYNC_DB_POOL_SIZE: int = 20
+    ASYNC_DB_MAX_OVERFLOW: int = 20
+    # Server-side prepared statements kept per connection, so repeated
+    # queries skip parsing and planning; set to 0 behind PgBouncer in
+    # transaction pooling mode
+    ASYNC_DB_PREPARED_STATEMENT_CACHE_SIZE: int = 500
+    
+    @property
+    def ASYNC_SQLALCHEMY_DATABASE_URI(self) -> str:
+        return f"postgresql+asyncpg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_SERVER}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
+    
     # CORS settings
     BACKEND_CORS_ORIGINS: list[str] = ["*"]
 
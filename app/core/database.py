@@ -1,7 +1,9 @@
 from sqlalchemy import create_engine, MetaData, text
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 from contextlib import contextmanager
+from functools import lru_cache
 from typing import Generator
 import logging
 
@@ -27,6 +29,45 @@ engine = create_engine(
 # SessionLocal factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+
+@lru_cache()
+def get_async_engine() -> AsyncEngine:
+    """
+    asyncio engine used by the async routes.
+    Created on first use, so scripts that only use the sync engine (bulk
+    loader, migrations) do not need the async driver.
+    """
+    return create_async_engine(
+        settings.ASYNC_SQLALCHEMY_DATABASE_URI,
+        pool_pre_ping=True,
+        pool_recycle=3600,
+        pool_size=settings.ASYNC_DB_POOL_SIZE,
+        max_overflow=settings.ASYNC_DB_MAX_OVERFLOW,
+        echo=False,
+        connect_args={
+            "prepared_statement_cache_size": settings.ASYNC_DB_PREPARED_STATEMENT_CACHE_SIZE,
+            "server_settings": {
+                "search_path": settings.POSTGRES_SCHEMA,
+                "application_name": "iqx_backend",
+            },
+        },
+    )
+
+
+@lru_cache()
+def get_async_sessionmaker() -> async_sessionmaker:
+    """
+    AsyncSession factory. Objects are not expired on commit, because
+    reloading expired attributes would need implicit IO.
+    """
+    return async_sessionmaker(get_async_engine(), autoflush=False, expire_on_commit=False)
+
+
+async def dispose_async_engine() -> None:
+    """Close the pooled connections of the async engine, if it was created."""
+    if get_async_engine.cache_info().currsize:
+        await get_async_engine().dispose()
+
 # Base class for models
 Base = declarative_base()
 
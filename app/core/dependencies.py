@@ -1,7 +1,8 @@
-from typing import Generator
+from typing import AsyncGenerator, Generator
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.core.database import SessionLocal
+from app.core.database import SessionLocal, get_async_sessionmaker
 
 
 def get_db() -> Generator[Session, None, None]:
@@ -20,4 +21,20 @@ def get_db() -> Generator[Session, None, None]:
     try:
         yield db
     finally:
-        db.close() 
\ No newline at end of file
+        db.close() 
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency for async FastAPI routes to get an AsyncSession.
+
+    Usage in FastAPI route:
+    ```
+    @app.get("/items/")
+    async def read_items(db: AsyncSession = Depends(get_async_db)):
+        items = await crud.get_items(db)
+        return items
+    ```
+    """
+    async with get_async_sessionmaker()() as db:
+        yield db
@@ -112,6 +112,9 @@ def create_continuous_aggregate(
     group_by_columns: Optional[List[str]] = None,
     refresh_policy_start: Optional[str] = None,
     refresh_policy_interval: Optional[str] = None,
+    bucket_column: Optional[str] = None,
+    materialized_only: Optional[bool] = None,
+    with_no_data: bool = False,
 ) -> bool:
     """
     Create a continuous aggregate view for a hypertable.
@@ -127,6 +130,11 @@ def create_continuous_aggregate(
         group_by_columns: Additional columns to group by
         refresh_policy_start: Start offset for refresh policy (e.g., '1 day')
         refresh_policy_interval: Interval for refresh policy (e.g., '1 hour')
+        bucket_column: Alias for the time bucket column (optional)
+        materialized_only: Set timescaledb.materialized_only; False also returns
+            rows not yet materialized (real-time aggregation)
+        with_no_data: Create the view empty so it can be created inside a
+            transaction; the refresh policy fills it later
         
     Returns:
         bool: True if successful, False if failed
@@ -139,25 +147,39 @@ def create_continuous_aggregate(
         agg_list = ", ".join(aggregates)
         
         # Build GROUP BY clause
+        bucket = f"time_bucket('{time_bucket}', time)"
         group_by = []
-        group_by.append(f"time_bucket('{time_bucket}', time)")
+        group_by.append(bucket)
         if group_by_columns:
             group_by.extend(group_by_columns)
         group_by_clause = ", ".join(group_by)
         
+        # Build the SELECT list, naming the bucket column if requested
+        select_columns = [f"{bucket} AS {bucket_column}" if bucket_column else bucket]
+        if group_by_columns:
+            select_columns.extend(group_by_columns)
+        select_clause = ", ".join(select_columns)
+        
         # Build the WHERE clause
         where_sql = f"WHERE {where_clause}" if where_clause else ""
         
+        # Build the view options
+        options = ["timescaledb.continuous"]
+        if materialized_only is not None:
+            options.append(f"timescaledb.materialized_only = {'true' if materialized_only else 'false'}")
+        options_clause = ", ".join(options)
+        
         # Construct the SQL for creating the continuous aggregate
         sql = f"""
         CREATE MATERIALIZED VIEW {schema_prefix}{view_name}
-        WITH (timescaledb.continuous) AS
+        WITH ({options_clause}) AS
         SELECT 
-            {group_by_clause},
+            {select_clause},
             {agg_list}
         FROM {schema_prefix}{hypertable_name}
         {where_sql}
         GROUP BY {group_by_clause}
+        {"WITH NO DATA" if with_no_data else ""}
         """
         
         # Execute the query
@@ -181,4 +203,44 @@ def create_continuous_aggregate(
     except Exception as e:
         db.rollback()
         logger.error(f"Failed to create continuous aggregate {view_name}: {e}")
-        return False 
\ No newline at end of file
+        return False 
+
+def refresh_continuous_aggregate(
+    db: Session,
+    view_name: str,
+    schema: Optional[str] = None,
+    window_start: Optional[str] = None,
+    window_end: Optional[str] = None,
+) -> bool:
+    """
+    Materialize a continuous aggregate over a time window.
+    
+    Refresh policies only cover a recent window, so a view created
+    WITH NO DATA must be refreshed once over its whole history; with
+    window_start and window_end left as None the entire range is refreshed.
+    The CALL cannot run inside a transaction, so it runs on its own
+    autocommit connection.
+    
+    Args:
+        db: SQLAlchemy database session
+        view_name: Name of the continuous aggregate view
+        schema: Database schema name (optional)
+        window_start: Start of the window, as a timestamp literal (optional)
+        window_end: End of the window, as a timestamp literal (optional)
+        
+    Returns:
+        bool: True if successful, False if failed
+    """
+    try:
+        schema_prefix = f"{schema}." if schema else ""
+        with db.get_bind().connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+            connection.execute(
+                text("CALL refresh_continuous_aggregate(CAST(:view AS regclass), CAST(:start AS timestamptz), CAST(:end AS timestamptz))"),
+                {"view": f"{schema_prefix}{view_name}", "start": window_start, "end": window_end},
+            )
+        
+        logger.info(f"Successfully refreshed continuous aggregate {view_name}")
+        return True
+    except Exception as e:
+        logger.error(f"Failed to refresh continuous aggregate {view_name}: {e}")
+        return False
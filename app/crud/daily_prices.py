@@ -1,91 +1,527 @@
+import json
 from datetime import datetime, timedelta
-from typing import List, Optional, Dict, Any
+from typing import Iterator, List, Optional, Dict, Any, Tuple
 
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_
+from sqlalchemy import func, and_, any_, bindparam, cast, column, literal_column, select, table, text, tuple_, BigInteger, Float, Numeric
+from sqlalchemy.engine import Row
+from sqlalchemy.sql import Select
+from sqlalchemy.dialects.postgresql import ARRAY, aggregate_order_by, array_agg, insert
 
+from app.core.cache import ALL_TICKERS, count_cache, invalidate_tickers
+from app.core.config import settings
+from app.crud.market import refresh_latest_prices, remove_latest_price
+from app.crud.price_versions import ALL_PRICE_VERSIONS_STMT, PRICE_VERSION_BY_TICKER_STMT, bump_price_versions
 from app.models.daily_prices import DailyPrice
 from app.schemas.daily_prices import DailyPriceCreate, DailyPriceUpdate
 
+# Rows per multi-row INSERT batch of UPSERT_STMT (15 columns each, well
+# under the 65535 bind parameter limit of PostgreSQL)
+UPSERT_CHUNK_SIZE = 1000
+
+# Every daily_prices column, keyed by name
+DAILY_PRICE_COLUMNS = {column.name: column for column in DailyPrice.__table__.columns}
+
+# Columns returned by the columnar (chart) layout, keyed by output name
+CHART_COLUMNS = {
+    "time": DailyPrice.time,
+    "open": DailyPrice.open_price,
+    "high": DailyPrice.high_price,
+    "low": DailyPrice.low_price,
+    "close": DailyPrice.close_price,
+    "volume": DailyPrice.volume,
+}
+TICKER_CHART_COLUMNS = {"ticker": DailyPrice.ticker, **CHART_COLUMNS}
+
+# OHLCV resampling intervals: time_bucket width, date_trunc unit and the
+# continuous aggregate that materializes the interval
+OHLCV_INTERVALS = {
+    "1w": {"bucket": "1 week", "unit": "week", "view": "daily_prices_ohlcv_weekly"},
+    "1M": {"bucket": "1 month", "unit": "month", "view": "daily_prices_ohlcv_monthly"},
+    "1q": {"bucket": "3 months", "unit": "quarter", "view": "daily_prices_ohlcv_quarterly"},
+    "1y": {"bucket": "1 year", "unit": "year", "view": "daily_prices_ohlcv_yearly"},
+}
+
+# Columns summed within each OHLCV bucket
+OHLCV_SUM_COLUMNS = [
+    "volume",
+    "buy_order_value",
+    "sell_order_value",
+    "foreign_net_buy_value",
+    "buy_order_quantity",
+    "sell_order_quantity",
+    "foreign_net_buy_quantity",
+]
+
+# Hot lookups, built once with bound parameters: the statement, its cache
+# key and its compiled SQL are reused, each call only binds values
+DAILY_PRICE_BY_KEY_STMT = select(DailyPrice).where(
+    DailyPrice.time == bindparam("time"), DailyPrice.ticker == bindparam("ticker")
+)
+LATEST_TIME_STMT = select(func.max(DailyPrice.time))
+LATEST_TIME_BY_TICKER_STMT = LATEST_TIME_STMT.where(DailyPrice.ticker == bindparam("ticker"))
+# Version and latest time in one statement, so both come from one snapshot
+WATERMARK_STMT = select(ALL_PRICE_VERSIONS_STMT.scalar_subquery(), LATEST_TIME_STMT.scalar_subquery())
+WATERMARK_BY_TICKER_STMT = select(
+    PRICE_VERSION_BY_TICKER_STMT.scalar_subquery(), LATEST_TIME_BY_TICKER_STMT.scalar_subquery()
+)
+
+
+def _filter_conditions(filters: Optional[Dict[str, Any]]) -> List[Any]:
+    """
+    Build equality conditions for the filters that match DailyPrice columns.
+    """
+    filter_conditions = []
+    if filters:
+        for key, value in filters.items():
+            if hasattr(DailyPrice, key) and value is not None:
+                filter_conditions.append(getattr(DailyPrice, key) == value)
+    return filter_conditions
+
+
+def select_columns(columns: Dict[str, Any]) -> Select:
+    """
+    Build a SELECT of the given columns labelled by their output names.
+    Numeric columns are cast to float in the database so rows come back as
+    plain Python floats instead of Decimal.
+    """
+    selected = []
+    for name, column in columns.items():
+        if isinstance(column.type, Numeric) and not isinstance(column.type, Float):
+            column = cast(column, Float)
+        selected.append(column.label(name))
+    return select(*selected)
+
+
+def _list_conditions(
+    filters: Optional[Dict[str, Any]], after: Optional[Tuple[datetime, str]]
+) -> List[Any]:
+    """
+    Build the WHERE conditions of a list query: filters plus the keyset
+    condition that continues after the (time, ticker) key of the previous page.
+    """
+    conditions = _filter_conditions(filters)
+    if after is not None:
+        conditions.append(tuple_(DailyPrice.time, DailyPrice.ticker) < tuple_(*after))
+    return conditions
+
+
+def list_stmt(
+    stmt: Select,
+    skip: int = 0,
+    limit: int = 100,
+    filters: Optional[Dict[str, Any]] = None,
+    after: Optional[Tuple[datetime, str]] = None,
+) -> Select:
+    """
+    Apply the filtering, ordering and paging of a daily price listing to stmt
+    (a SELECT of DailyPrice or of select_columns).
+    """
+    filter_conditions = _list_conditions(filters, after)
+    if filter_conditions:
+        stmt = stmt.where(and_(*filter_conditions))
+
+    stmt = stmt.order_by(DailyPrice.time.desc(), DailyPrice.ticker.desc())
+    return stmt.offset(skip).limit(limit)
+
 
 def get_daily_prices(
     db: Session,
     skip: int = 0,
     limit: int = 100,
     filters: Optional[Dict[str, Any]] = None,
+    after: Optional[Tuple[datetime, str]] = None,
 ) -> List[DailyPrice]:
     """
     Get a list of daily prices with optional filtering, pagination.
-    Results are ordered by time descending (newest first).
+    Results are ordered by time descending (newest first), then ticker.
+    Pass the (time, ticker) of the last row of a page as after to get the next
+    page with an index seek instead of OFFSET.
     """
-    query = db.query(DailyPrice)
+    stmt = list_stmt(select(DailyPrice), skip, limit, filters, after)
+    return db.execute(stmt).scalars().all()
 
-    if filters:
-        filter_conditions = []
-        for key, value in filters.items():
-            if hasattr(DailyPrice, key) and value is not None:
-                filter_conditions.append(getattr(DailyPrice, key) == value)
-        if filter_conditions:
-            query = query.filter(and_(*filter_conditions))
 
-    return query.order_by(DailyPrice.time.desc()).offset(skip).limit(limit).all()
+def get_daily_price_columns(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    filters: Optional[Dict[str, Any]] = None,
+    columns: Dict[str, Any] = CHART_COLUMNS,
+    after: Optional[Tuple[datetime, str]] = None,
+) -> List[Row]:
+    """
+    Get daily prices as plain tuples of the requested columns.
+    Same filtering, ordering and paging as get_daily_prices, without building ORM objects.
+    """
+    stmt = list_stmt(select_columns(columns), skip, limit, filters, after)
+    return db.execute(stmt).all()
 
 
-def get_daily_prices_by_time_range(
-    db: Session,
-    ticker: str,
-    time_range: str,
-    limit: int = 10000,
-) -> List[DailyPrice]:
+def get_time_range_start(time_range: str) -> Optional[datetime]:
     """
-    Get daily prices for a specific ticker filtered by time range.
-    Time range can be: 1d, 1m, 3m, 6m, 1y, 5y, all
-    Results are ordered by time descending (newest first).
+    Get the earliest timestamp included in a predefined time range.
+    Returns None for "all", which has no lower bound.
     """
-    query = db.query(DailyPrice).filter(DailyPrice.ticker == ticker)
-    
     # Get current date for calculations
     now = datetime.utcnow()
-    
-    # Apply time range filter
+
     if time_range == "1d":
-        one_day_ago = now - timedelta(days=1)
-        query = query.filter(DailyPrice.time >= one_day_ago)
+        return now - timedelta(days=1)
     elif time_range == "1m":
-        one_month_ago = now - timedelta(days=30)
-        query = query.filter(DailyPrice.time >= one_month_ago)
+        return now - timedelta(days=30)
     elif time_range == "3m":
-        three_months_ago = now - timedelta(days=90)
-        query = query.filter(DailyPrice.time >= three_months_ago)
+        return now - timedelta(days=90)
     elif time_range == "6m":
-        six_months_ago = now - timedelta(days=180)
-        query = query.filter(DailyPrice.time >= six_months_ago)
+        return now - timedelta(days=180)
     elif time_range == "1y":
-        one_year_ago = now - timedelta(days=365)
-        query = query.filter(DailyPrice.time >= one_year_ago)
+        return now - timedelta(days=365)
     elif time_range == "5y":
-        five_years_ago = now - timedelta(days=365*5)
-        query = query.filter(DailyPrice.time >= five_years_ago)
+        return now - timedelta(days=365*5)
     # For "all", no time filtering needed
-    
-    return query.order_by(DailyPrice.time.desc()).limit(limit).all()
+    return None
+
+
+def time_range_stmt(stmt: Select, ticker: str, time_range: str, limit: int = 10000) -> Select:
+    """
+    Restrict stmt (a SELECT of DailyPrice or of select_columns) to a ticker
+    and time range, newest first.
+    """
+    stmt = stmt.where(DailyPrice.ticker == ticker)
+
+    # Apply time range filter
+    start = get_time_range_start(time_range)
+    if start is not None:
+        stmt = stmt.where(DailyPrice.time >= start)
+
+    return stmt.order_by(DailyPrice.time.desc()).limit(limit)
+
+
+def get_daily_prices_by_time_range(
+    db: Session,
+    ticker: str,
+    time_range: str,
+    limit: int = 10000,
+) -> List[DailyPrice]:
+    """
+    Get daily prices for a specific ticker filtered by time range.
+    Time range can be: 1d, 1m, 3m, 6m, 1y, 5y, all
+    Results are ordered by time descending (newest first).
+    """
+    stmt = time_range_stmt(select(DailyPrice), ticker, time_range, limit)
+    return db.execute(stmt).scalars().all()
+
+
+def get_daily_price_columns_by_time_range(
+    db: Session,
+    ticker: str,
+    time_range: str,
+    limit: int = 10000,
+    columns: Dict[str, Any] = CHART_COLUMNS,
+) -> List[Row]:
+    """
+    Get daily prices for a ticker and time range as plain tuples of the
+    requested columns, ordered by time descending (newest first).
+    """
+    stmt = time_range_stmt(select_columns(columns), ticker, time_range, limit)
+    return db.execute(stmt).all()
+
+
+def get_daily_price_columns_before(
+    db: Session,
+    ticker: str,
+    before: datetime,
+    limit: int,
+    columns: Dict[str, Any] = CHART_COLUMNS,
+) -> List[Row]:
+    """
+    Get the limit latest daily prices of a ticker strictly before a time, as
+    plain tuples of the requested columns, ordered by time descending.
+    Used to load the warm-up history of indicators computed over a range.
+    """
+    stmt = (
+        select_columns(columns)
+        .where(DailyPrice.ticker == ticker, DailyPrice.time < before)
+        .order_by(DailyPrice.time.desc())
+        .limit(limit)
+    )
+    return db.execute(stmt).all()
+
+
+def time_range_multi_stmt(
+    tickers: List[str],
+    time_range: str,
+    limit: int = 10000,
+    columns: Dict[str, Any] = TICKER_CHART_COLUMNS,
+) -> Select:
+    """
+    Build the SELECT of get_daily_price_columns_by_time_range_multi.
+    """
+    row_number = func.row_number().over(
+        partition_by=DailyPrice.ticker, order_by=DailyPrice.time.desc()
+    ).label("row_number")
+    inner = select_columns(columns).add_columns(row_number).where(
+        DailyPrice.ticker == any_(bindparam("tickers", tickers, type_=ARRAY(DailyPrice.ticker.type)))
+    )
+
+    start = get_time_range_start(time_range)
+    if start is not None:
+        inner = inner.where(DailyPrice.time >= start)
+
+    ranked = inner.subquery()
+    stmt = (
+        select(*[ranked.c[name] for name in columns])
+        .where(ranked.c.row_number <= limit)
+        .order_by(ranked.c.ticker, ranked.c.time.desc())
+    )
+    return stmt
+
+
+def get_daily_price_columns_by_time_range_multi(
+    db: Session,
+    tickers: List[str],
+    time_range: str,
+    limit: int = 10000,
+    columns: Dict[str, Any] = TICKER_CHART_COLUMNS,
+) -> List[Row]:
+    """
+    Get daily prices for several tickers and a time range in a single query,
+    as plain tuples of the requested columns (which must include ticker and time).
+    At most limit rows are returned per ticker, ordered by ticker and then
+    time descending (newest first).
+    """
+    return db.execute(time_range_multi_stmt(tickers, time_range, limit, columns)).all()
+
+
+def iter_daily_prices_by_time_range(
+    db: Session,
+    ticker: str,
+    time_range: str,
+    limit: int = 10000,
+    chunk_size: int = 1000,
+) -> Iterator[Row]:
+    """
+    Stream daily prices for a ticker and time range as plain rows.
+    Rows are read from a server-side cursor chunk_size at a time, so memory
+    use does not depend on the number of rows.
+    Results are ordered by time descending (newest first).
+    """
+    stmt = select(*DailyPrice.__table__.columns).where(DailyPrice.ticker == ticker)
+
+    start = get_time_range_start(time_range)
+    if start is not None:
+        stmt = stmt.where(DailyPrice.time >= start)
+
+    stmt = stmt.order_by(DailyPrice.time.desc()).limit(limit)
+    return iter(db.execute(stmt.execution_options(yield_per=chunk_size)))
+
+
+def _ohlcv_type(name: str) -> Any:
+    """
+    Output type of an OHLCV column: volumes and quantities stay integers,
+    prices and values are returned as floats.
+    """
+    table_column = DailyPrice.__table__.c.get(name)
+    if table_column is not None and isinstance(table_column.type, BigInteger):
+        return BigInteger
+    return Float
+
+
+def ohlcv_stmt(ticker: str, interval: str, time_range: str = "all", limit: int = 1000) -> Select:
+    """
+    Build the SELECT of get_ohlcv.
+    """
+    spec = OHLCV_INTERVALS[interval]
+    start = get_time_range_start(time_range)
+
+    if settings.TIMESCALEDB_ENABLED and settings.OHLCV_CONTINUOUS_AGGREGATES_ENABLED:
+        view = table(
+            spec["view"],
+            column("bucket"), column("ticker"),
+            column("open"), column("high"), column("low"), column("close"),
+            *[column(name) for name in OHLCV_SUM_COLUMNS],
+        )
+        bucket = view.c.bucket
+        values = {name: view.c[name] for name in ["open", "high", "low", "close", *OHLCV_SUM_COLUMNS]}
+        stmt = select(
+            bucket.label("time"),
+            *[cast(value, _ohlcv_type(name)).label(name) for name, value in values.items()],
+        ).where(view.c.ticker == ticker)
+        if start is not None:
+            stmt = stmt.where(bucket >= func.time_bucket(literal_column(f"INTERVAL '{spec['bucket']}'"), start))
+    else:
+        bucket = func.date_trunc(spec["unit"], DailyPrice.time)
+        stmt = select(
+            bucket.label("time"),
+            cast(array_agg(aggregate_order_by(DailyPrice.open_price, DailyPrice.time.asc()))[1], Float).label("open"),
+            cast(func.max(DailyPrice.high_price), Float).label("high"),
+            cast(func.min(DailyPrice.low_price), Float).label("low"),
+            cast(array_agg(aggregate_order_by(DailyPrice.close_price, DailyPrice.time.desc()))[1], Float).label("close"),
+            *[
+                cast(func.sum(DailyPrice.__table__.c[name]), _ohlcv_type(name)).label(name)
+                for name in OHLCV_SUM_COLUMNS
+            ],
+        ).where(DailyPrice.ticker == ticker).group_by(bucket)
+        if start is not None:
+            stmt = stmt.where(DailyPrice.time >= func.date_trunc(spec["unit"], start))
+
+    return stmt.order_by(bucket.desc()).limit(limit)
+
+
+def get_ohlcv(
+    db: Session,
+    ticker: str,
+    interval: str,
+    time_range: str = "all",
+    limit: int = 1000,
+) -> List[Row]:
+    """
+    Get OHLCV bars for a ticker resampled to a weekly, monthly, quarterly or
+    yearly interval, aggregated in the database.
+    Reads the continuous aggregate for the interval when TimescaleDB is
+    enabled, otherwise groups the raw rows with date_trunc.
+    The bucket containing the start of the time range is included in full.
+    Results are ordered by bucket time descending (newest first).
+    """
+    return db.execute(ohlcv_stmt(ticker, interval, time_range, limit)).all()
+
+
+def count_stmt(filters: Optional[Dict[str, Any]] = None) -> Select:
+    """
+    Build the COUNT(*) of a filtered daily price listing.
+    """
+    stmt = select(func.count(DailyPrice.time))
+
+    filter_conditions = _filter_conditions(filters)
+    if filter_conditions:
+        stmt = stmt.where(and_(*filter_conditions))
+    return stmt
 
 
 def count_daily_prices(db: Session, filters: Optional[Dict[str, Any]] = None) -> int:
     """
     Count total number of daily prices with optional filtering.
     """
-    query = db.query(func.count(DailyPrice.time))
+    return db.execute(count_stmt(filters)).scalar()
+
+
+def count_cache_key(filters: Optional[Dict[str, Any]]) -> Tuple[Dict[str, Any], Tuple, str]:
+    """
+    Active filters, count_cache key and invalidation tag of a filter set.
+    """
+    active = {key: value for key, value in (filters or {}).items() if value is not None}
+    return active, tuple(sorted(active.items())), active.get("ticker", ALL_TICKERS)
+
+
+def count_daily_prices_cached(db: Session, filters: Optional[Dict[str, Any]] = None) -> int:
+    """
+    Exact count of daily prices, cached per filter set and tagged by ticker
+    (or ALL_TICKERS when unfiltered).
+    Cached counts are dropped when rows of the same ticker are written through
+    this module, and expire after COUNT_CACHE_TTL_SECONDS for writes made elsewhere.
+    """
+    active, key, tag = count_cache_key(filters)
+    total = count_cache.get(key)
+    if total is None:
+        generation = count_cache.generation
+        total = count_daily_prices(db, filters=active)
+        count_cache.set(key, total, tags=[tag], generation=generation)
+    return total
+
+
+def table_estimate_stmt() -> Any:
+    """
+    Statistics-based row count of the whole daily_prices table: TimescaleDB
+    approximate_row_count, or pg_class.reltuples without TimescaleDB.
+    """
+    if settings.TIMESCALEDB_ENABLED:
+        return text("SELECT approximate_row_count('daily_prices')")
+    return text("SELECT reltuples FROM pg_class WHERE oid = 'daily_prices'::regclass")
+
+
+def filtered_rows_stmt(filters: Optional[Dict[str, Any]] = None) -> Optional[Select]:
+    """
+    SELECT of the rows matching the filters, whose planner estimate is used
+    as a filtered total; None without filters.
+    """
+    filter_conditions = _filter_conditions(filters)
+    if not filter_conditions:
+        return None
+    return select(DailyPrice.time).where(and_(*filter_conditions))
+
+
+def plan_rows(plan: Any) -> int:
+    """
+    Top-level row estimate of an EXPLAIN (FORMAT JSON) result.
+    """
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def estimate_daily_prices_count(db: Session, filters: Optional[Dict[str, Any]] = None) -> int:
+    """
+    Estimate the number of daily prices without scanning the table.
+    Unfiltered totals come from TimescaleDB approximate_row_count (or
+    pg_class.reltuples without TimescaleDB); filtered totals come from the
+    planner's row estimate for the filtered query.
+    """
+    stmt = filtered_rows_stmt(filters)
+    if stmt is None:
+        estimate = db.execute(table_estimate_stmt()).scalar()
+        return max(int(estimate or 0), 0)
+
+    compiled = stmt.compile(dialect=db.get_bind().dialect)
+    plan = db.connection().exec_driver_sql(
+        f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params
+    ).scalar()
+    return plan_rows(plan)
 
-    if filters:
-        filter_conditions = []
-        for key, value in filters.items():
-            if hasattr(DailyPrice, key) and value is not None:
-                filter_conditions.append(getattr(DailyPrice, key) == value)
-        if filter_conditions:
-            query = query.filter(and_(*filter_conditions))
 
-    return query.scalar()
+def get_daily_prices_total(
+    db: Session, filters: Optional[Dict[str, Any]] = None, total_mode: str = "exact"
+) -> Optional[int]:
+    """
+    Get the total for a daily price listing.
+    total_mode is "exact" (cached COUNT(*)), "estimate" (statistics) or "none".
+    """
+    if total_mode == "none":
+        return None
+    if total_mode == "estimate":
+        return estimate_daily_prices_count(db, filters=filters)
+    return count_daily_prices_cached(db, filters=filters)
+
+
+def latest_time_query(ticker: Optional[str] = None) -> Tuple[Select, Dict[str, Any]]:
+    """
+    The MAX(time) of the daily prices of a ticker (or of every ticker), as a
+    prebuilt statement and its parameters.
+    """
+    if ticker:
+        return LATEST_TIME_BY_TICKER_STMT, {"ticker": ticker}
+    return LATEST_TIME_STMT, {}
+
+
+def watermark_query(ticker: Optional[str] = None) -> Tuple[Select, Dict[str, Any]]:
+    """
+    The watermark statement of a ticker (or of every ticker) and its parameters.
+    """
+    if ticker:
+        return WATERMARK_BY_TICKER_STMT, {"ticker": ticker}
+    return WATERMARK_STMT, {}
+
+
+def get_price_watermark(db: Session, ticker: Optional[str] = None) -> Tuple[int, Optional[datetime]]:
+    """
+    Cheap fingerprint of the daily prices of a ticker (or of every ticker):
+    the version in daily_price_versions and the latest time, read with one
+    primary key lookup and one index-backed MAX instead of the full query.
+    Versions are bumped in the transaction of every write, whichever process
+    makes it, so the fingerprint also moves on updates and backfills that
+    leave the latest time unchanged.
+    """
+    version, latest = db.execute(*watermark_query(ticker)).one()
+    return version or 0, latest
 
 
 def get_daily_price_by_ticker_and_time(
@@ -94,11 +530,7 @@ def get_daily_price_by_ticker_and_time(
     """
     Get a daily price by its ticker and time.
     """
-    return (
-        db.query(DailyPrice)
-        .filter(DailyPrice.ticker == ticker, DailyPrice.time == time)
-        .first()
-    )
+    return db.execute(DAILY_PRICE_BY_KEY_STMT, {"time": time, "ticker": ticker}).scalars().first()
 
 
 def create_daily_price(db: Session, daily_price: DailyPriceCreate) -> DailyPrice:
@@ -107,11 +539,94 @@ def create_daily_price(db: Session, daily_price: DailyPriceCreate) -> DailyPrice
     """
     db_daily_price = DailyPrice(**daily_price.dict())
     db.add(db_daily_price)
+    db.flush()
+    refresh_latest_prices(db, [daily_price.ticker], since=daily_price.time)
+    bump_price_versions(db, [daily_price.ticker], times=[daily_price.time])
     db.commit()
+    invalidate_tickers([daily_price.ticker], times=[daily_price.time])
     db.refresh(db_daily_price)
     return db_daily_price
 
 
+def unique_upsert_rows(daily_prices: List[DailyPriceCreate]) -> List[Dict[str, Any]]:
+    """
+    Row dicts of a batch with one row per (time, ticker), the last one winning:
+    ON CONFLICT cannot touch the same row twice in one statement.
+    """
+    unique_rows: Dict[Tuple[datetime, str], Dict[str, Any]] = {}
+    for daily_price in daily_prices:
+        unique_rows[(daily_price.time, daily_price.ticker)] = daily_price.dict()
+    return list(unique_rows.values())
+
+
+def oldest_time_by_ticker(rows: List[Dict[str, Any]]) -> Dict[str, datetime]:
+    """
+    Oldest time written per ticker in a batch of row dicts: the lower bound
+    refresh_latest_prices needs for each ticker of a mixed batch.
+    """
+    oldest: Dict[str, datetime] = {}
+    for row in rows:
+        ticker = row["ticker"]
+        if ticker not in oldest or row["time"] < oldest[ticker]:
+            oldest[ticker] = row["time"]
+    return oldest
+
+
+def _upsert_stmt() -> Any:
+    """
+    INSERT ... ON CONFLICT (time, ticker) DO UPDATE of one row, returning an
+    "inserted" flag.
+    """
+    stmt = insert(DailyPrice)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[DailyPrice.time, DailyPrice.ticker],
+        set_={
+            column.name: stmt.excluded[column.name]
+            for column in DailyPrice.__table__.columns
+            if column.name not in ("time", "ticker")
+        },
+    )
+    # xmax is 0 for freshly inserted tuples and non-zero for updated ones
+    return stmt.returning(literal_column("xmax = 0").label("inserted")).execution_options(
+        insertmanyvalues_page_size=UPSERT_CHUNK_SIZE
+    )
+
+
+# Executed with a list of rows: SQLAlchemy batches them into multi-row
+# INSERTs of UPSERT_CHUNK_SIZE rows (insertmanyvalues) from the one compiled
+# statement, where a values() statement per chunk would be recompiled for
+# every call
+UPSERT_STMT = _upsert_stmt()
+
+
+def upsert_daily_prices(
+    db: Session, daily_prices: List[DailyPriceCreate]
+) -> Tuple[int, int]:
+    """
+    Insert or update many daily prices in a single transaction.
+    Rows are written with multi-row INSERT ... ON CONFLICT (time, ticker) DO UPDATE,
+    and latest_prices is refreshed for the touched tickers in the same transaction.
+    When the same (time, ticker) appears more than once, the last row wins.
+    Returns a tuple of (inserted, updated) row counts.
+    """
+    rows = unique_upsert_rows(daily_prices)
+    unique_tickers = {row["ticker"] for row in rows}
+
+    inserted = 0
+    updated = 0
+    if rows:
+        for row in db.execute(UPSERT_STMT, rows):
+            if row.inserted:
+                inserted += 1
+            else:
+                updated += 1
+        refresh_latest_prices(db, unique_tickers, since=oldest_time_by_ticker(rows))
+        bump_price_versions(db, unique_tickers, times=[row["time"] for row in rows])
+    db.commit()
+    invalidate_tickers(unique_tickers, times=[row["time"] for row in rows])
+    return inserted, updated
+
+
 def update_daily_price(
     db: Session, ticker: str, time: datetime, daily_price: DailyPriceUpdate
 ) -> Optional[DailyPrice]:
@@ -126,7 +641,11 @@ def update_daily_price(
     for key, value in update_data.items():
         setattr(db_daily_price, key, value)
 
+    db.flush()
+    refresh_latest_prices(db, [ticker], since=time)
+    bump_price_versions(db, [ticker], times=[time])
     db.commit()
+    invalidate_tickers([ticker], times=[time])
     db.refresh(db_daily_price)
     return db_daily_price
 
@@ -140,5 +659,9 @@ def delete_daily_price(db: Session, ticker: str, time: datetime) -> bool:
         return False
 
     db.delete(db_daily_price)
+    db.flush()
+    remove_latest_price(db, ticker, time)
+    bump_price_versions(db, [ticker], times=[time])
     db.commit()
+    invalidate_tickers([ticker], times=[time])
     return True 
\ No newline at end of file
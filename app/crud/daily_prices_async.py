@@ -0,0 +1,272 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import count_cache, invalidate_tickers
+from app.crud.daily_prices import (
+    CHART_COLUMNS,
+    DAILY_PRICE_BY_KEY_STMT,
+    TICKER_CHART_COLUMNS,
+    UPSERT_STMT,
+    count_cache_key,
+    count_stmt,
+    filtered_rows_stmt,
+    list_stmt,
+    ohlcv_stmt,
+    oldest_time_by_ticker,
+    plan_rows,
+    select_columns,
+    table_estimate_stmt,
+    time_range_multi_stmt,
+    time_range_stmt,
+    unique_upsert_rows,
+    watermark_query,
+)
+from app.crud.market_async import refresh_latest_prices, remove_latest_price
+from app.crud.price_versions_async import bump_price_versions
+from app.models.daily_prices import DailyPrice
+from app.schemas.daily_prices import DailyPriceCreate, DailyPriceUpdate
+
+# Async versions of the app.crud.daily_prices functions used by the async
+# routes. Statements are built by the sync module, so both stay identical.
+
+
+async def get_daily_prices(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    filters: Optional[Dict[str, Any]] = None,
+    after: Optional[Tuple[datetime, str]] = None,
+) -> List[DailyPrice]:
+    """
+    Get a list of daily prices with optional filtering, pagination.
+    Results are ordered by time descending (newest first), then ticker.
+    """
+    stmt = list_stmt(select(DailyPrice), skip, limit, filters, after)
+    return (await db.execute(stmt)).scalars().all()
+
+
+async def get_daily_price_columns(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    filters: Optional[Dict[str, Any]] = None,
+    columns: Dict[str, Any] = CHART_COLUMNS,
+    after: Optional[Tuple[datetime, str]] = None,
+) -> List[Row]:
+    """
+    Get daily prices as plain tuples of the requested columns.
+    """
+    stmt = list_stmt(select_columns(columns), skip, limit, filters, after)
+    return (await db.execute(stmt)).all()
+
+
+async def get_daily_prices_by_time_range(
+    db: AsyncSession,
+    ticker: str,
+    time_range: str,
+    limit: int = 10000,
+) -> List[DailyPrice]:
+    """
+    Get daily prices for a specific ticker filtered by time range, newest first.
+    """
+    stmt = time_range_stmt(select(DailyPrice), ticker, time_range, limit)
+    return (await db.execute(stmt)).scalars().all()
+
+
+async def get_daily_price_columns_by_time_range(
+    db: AsyncSession,
+    ticker: str,
+    time_range: str,
+    limit: int = 10000,
+    columns: Dict[str, Any] = CHART_COLUMNS,
+) -> List[Row]:
+    """
+    Get daily prices for a ticker and time range as plain tuples of the
+    requested columns, newest first.
+    """
+    stmt = time_range_stmt(select_columns(columns), ticker, time_range, limit)
+    return (await db.execute(stmt)).all()
+
+
+async def get_daily_price_columns_by_time_range_multi(
+    db: AsyncSession,
+    tickers: List[str],
+    time_range: str,
+    limit: int = 10000,
+    columns: Dict[str, Any] = TICKER_CHART_COLUMNS,
+) -> List[Row]:
+    """
+    Get daily prices for several tickers and a time range in a single query,
+    at most limit rows per ticker, ordered by ticker and time descending.
+    """
+    return (await db.execute(time_range_multi_stmt(tickers, time_range, limit, columns))).all()
+
+
+async def get_ohlcv(
+    db: AsyncSession,
+    ticker: str,
+    interval: str,
+    time_range: str = "all",
+    limit: int = 1000,
+) -> List[Row]:
+    """
+    Get OHLCV bars for a ticker resampled to a weekly, monthly, quarterly or
+    yearly interval, newest first.
+    """
+    return (await db.execute(ohlcv_stmt(ticker, interval, time_range, limit))).all()
+
+
+async def count_daily_prices(db: AsyncSession, filters: Optional[Dict[str, Any]] = None) -> int:
+    """
+    Count total number of daily prices with optional filtering.
+    """
+    return (await db.execute(count_stmt(filters))).scalar()
+
+
+async def count_daily_prices_cached(db: AsyncSession, filters: Optional[Dict[str, Any]] = None) -> int:
+    """
+    Exact count of daily prices, sharing count_cache with the sync module.
+    """
+    active, key, tag = count_cache_key(filters)
+    total = count_cache.get(key)
+    if total is None:
+        generation = count_cache.generation
+        total = await count_daily_prices(db, filters=active)
+        count_cache.set(key, total, tags=[tag], generation=generation)
+    return total
+
+
+async def estimate_daily_prices_count(db: AsyncSession, filters: Optional[Dict[str, Any]] = None) -> int:
+    """
+    Estimate the number of daily prices from table statistics or the
+    planner's row estimate, without scanning the table.
+    """
+    stmt = filtered_rows_stmt(filters)
+    if stmt is None:
+        estimate = (await db.execute(table_estimate_stmt())).scalar()
+        return max(int(estimate or 0), 0)
+
+    # EXPLAIN cannot be prepared with parameters, so the (escaped) filter
+    # values are rendered inline
+    compiled = stmt.compile(dialect=db.get_bind().dialect, compile_kwargs={"literal_binds": True})
+    connection = await db.connection()
+    plan = (await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}")).scalar()
+    return plan_rows(plan)
+
+
+async def get_daily_prices_total(
+    db: AsyncSession, filters: Optional[Dict[str, Any]] = None, total_mode: str = "exact"
+) -> Optional[int]:
+    """
+    Get the total for a daily price listing.
+    total_mode is "exact" (cached COUNT(*)), "estimate" (statistics) or "none".
+    """
+    if total_mode == "none":
+        return None
+    if total_mode == "estimate":
+        return await estimate_daily_prices_count(db, filters=filters)
+    return await count_daily_prices_cached(db, filters=filters)
+
+
+async def get_price_watermark(db: AsyncSession, ticker: Optional[str] = None) -> Tuple[int, Optional[datetime]]:
+    """
+    Version and latest time of the daily prices of a ticker (or of every
+    ticker); see app.crud.daily_prices.get_price_watermark.
+    """
+    version, latest = (await db.execute(*watermark_query(ticker))).one()
+    return version or 0, latest
+
+
+async def get_daily_price_by_ticker_and_time(
+    db: AsyncSession, ticker: str, time: datetime
+) -> Optional[DailyPrice]:
+    """
+    Get a daily price by its ticker and time.
+    """
+    result = await db.execute(DAILY_PRICE_BY_KEY_STMT, {"time": time, "ticker": ticker})
+    return result.scalars().first()
+
+
+async def create_daily_price(db: AsyncSession, daily_price: DailyPriceCreate) -> DailyPrice:
+    """
+    Create a new daily price.
+    """
+    db_daily_price = DailyPrice(**daily_price.dict())
+    db.add(db_daily_price)
+    await db.flush()
+    await refresh_latest_prices(db, [daily_price.ticker], since=daily_price.time)
+    await bump_price_versions(db, [daily_price.ticker], times=[daily_price.time])
+    await db.commit()
+    invalidate_tickers([daily_price.ticker], times=[daily_price.time])
+    await db.refresh(db_daily_price)
+    return db_daily_price
+
+
+async def upsert_daily_prices(
+    db: AsyncSession, daily_prices: List[DailyPriceCreate]
+) -> Tuple[int, int]:
+    """
+    Insert or update many daily prices in a single transaction.
+    Returns a tuple of (inserted, updated) row counts.
+    """
+    rows = unique_upsert_rows(daily_prices)
+    unique_tickers = {row["ticker"] for row in rows}
+
+    inserted = 0
+    updated = 0
+    if rows:
+        result = await db.execute(UPSERT_STMT, rows)
+        for row in result:
+            if row.inserted:
+                inserted += 1
+            else:
+                updated += 1
+        await refresh_latest_prices(db, unique_tickers, since=oldest_time_by_ticker(rows))
+        await bump_price_versions(db, unique_tickers, times=[row["time"] for row in rows])
+    await db.commit()
+    invalidate_tickers(unique_tickers, times=[row["time"] for row in rows])
+    return inserted, updated
+
+
+async def update_daily_price(
+    db: AsyncSession, ticker: str, time: datetime, daily_price: DailyPriceUpdate
+) -> Optional[DailyPrice]:
+    """
+    Update a daily price by ticker and time.
+    """
+    db_daily_price = await get_daily_price_by_ticker_and_time(db, ticker, time)
+    if not db_daily_price:
+        return None
+
+    update_data = daily_price.dict(exclude_unset=True)
+    for key, value in update_data.items():
+        setattr(db_daily_price, key, value)
+
+    await db.flush()
+    await refresh_latest_prices(db, [ticker], since=time)
+    await bump_price_versions(db, [ticker], times=[time])
+    await db.commit()
+    invalidate_tickers([ticker], times=[time])
+    await db.refresh(db_daily_price)
+    return db_daily_price
+
+
+async def delete_daily_price(db: AsyncSession, ticker: str, time: datetime) -> bool:
+    """
+    Delete a daily price by ticker and time.
+    """
+    db_daily_price = await get_daily_price_by_ticker_and_time(db, ticker, time)
+    if not db_daily_price:
+        return False
+
+    await db.delete(db_daily_price)
+    await db.flush()
+    await remove_latest_price(db, ticker, time)
+    await bump_price_versions(db, [ticker], times=[time])
+    await db.commit()
+    invalidate_tickers([ticker], times=[time])
+    return True
@@ -0,0 +1,151 @@
+from datetime import datetime
+from typing import Any, Iterable, List, Mapping, Optional, Tuple, Union
+
+from sqlalchemy import Float, and_, any_, bindparam, cast, delete, func, select
+from sqlalchemy.engine import Row
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+from app.crud.price_versions import ALL_PRICE_VERSIONS_STMT
+from app.models.daily_prices import DailyPrice
+from app.models.latest_prices import LatestPrice
+from app.models.securities import Securities
+
+# Column names shared by daily_prices and latest_prices
+LATEST_PRICE_COLUMNS = [column.name for column in DailyPrice.__table__.columns]
+
+
+def refresh_latest_prices_stmt(
+    tickers: List[str], since: Optional[Union[datetime, Mapping[str, datetime]]] = None
+) -> Any:
+    """
+    Build the INSERT ... SELECT DISTINCT ON of refresh_latest_prices.
+    """
+    columns = [DailyPrice.__table__.c[name] for name in LATEST_PRICE_COLUMNS]
+    if isinstance(since, Mapping):
+        # One lower bound per ticker, joined in as unnest(tickers, since)
+        bounds = func.unnest(
+            bindparam("tickers", tickers, type_=ARRAY(DailyPrice.ticker.type)),
+            bindparam("since", [since[ticker] for ticker in tickers], type_=ARRAY(DailyPrice.time.type)),
+        ).table_valued("ticker", "since").render_derived(name="bounds")
+        source = select(*columns).join(
+            bounds, and_(bounds.c.ticker == DailyPrice.ticker, DailyPrice.time >= bounds.c.since)
+        )
+    else:
+        source = select(*columns).where(
+            DailyPrice.ticker == any_(bindparam("tickers", tickers, type_=ARRAY(DailyPrice.ticker.type)))
+        )
+        if since is not None:
+            source = source.where(DailyPrice.time >= since)
+    source = source.distinct(DailyPrice.ticker).order_by(DailyPrice.ticker, DailyPrice.time.desc())
+
+    stmt = insert(LatestPrice).from_select(LATEST_PRICE_COLUMNS, source)
+    return stmt.on_conflict_do_update(
+        index_elements=[LatestPrice.ticker],
+        set_={name: stmt.excluded[name] for name in LATEST_PRICE_COLUMNS if name != "ticker"},
+        where=LatestPrice.time <= stmt.excluded.time,
+    )
+
+
+def refresh_latest_prices(
+    db: Session, tickers: Iterable[str], since: Optional[Union[datetime, Mapping[str, datetime]]] = None
+) -> None:
+    """
+    Bring latest_prices up to date for the given tickers after a write.
+
+    The newest daily_prices row of each ticker (looking only at rows from
+    since on, when given; since is one time for every ticker or a mapping
+    of each ticker to its own lower bound) is merged in with a single
+    INSERT ... SELECT DISTINCT ON; an existing row is only replaced by one that is not older,
+    so concurrent writers cannot move a ticker back in time.
+    Runs in the caller's transaction; the caller commits.
+    """
+    tickers = list(set(tickers))
+    if tickers:
+        db.execute(refresh_latest_prices_stmt(tickers, since))
+
+
+def remove_latest_price(db: Session, ticker: str, time: datetime) -> None:
+    """
+    Update latest_prices after the daily price of ticker at time was deleted:
+    if it was the latest one, fall back to the previous row (if any).
+    Runs in the caller's transaction; the caller commits.
+    """
+    result = db.execute(
+        delete(LatestPrice).where(LatestPrice.ticker == ticker, LatestPrice.time == time)
+    )
+    if result.rowcount:
+        refresh_latest_prices(db, [ticker])
+
+
+def market_snapshot_stmt(exchange: Optional[str] = None) -> Select:
+    """
+    Build the SELECT of get_market_snapshot.
+    """
+    stmt = (
+        select(LatestPrice)
+        .join(Securities, Securities.ticker == LatestPrice.ticker)
+        .where(Securities.status == "active")
+    )
+    if exchange:
+        stmt = stmt.where(Securities.exchange == exchange)
+    return stmt.order_by(LatestPrice.ticker)
+
+
+def get_market_snapshot(db: Session, exchange: Optional[str] = None) -> List[LatestPrice]:
+    """
+    Get the latest daily price of every active security, optionally for one
+    exchange, ordered by ticker. Reads latest_prices only (one row per ticker).
+    """
+    return db.execute(market_snapshot_stmt(exchange)).scalars().all()
+
+
+# Sum of the price versions, latest bar time and number of bars in
+# latest_prices, and the latest change to securities (status and exchange
+# decide which bars are listed), in one statement
+SNAPSHOT_WATERMARK_STMT = select(
+    ALL_PRICE_VERSIONS_STMT.scalar_subquery(),
+    select(func.max(LatestPrice.time)).scalar_subquery(),
+    select(func.count(LatestPrice.ticker)).scalar_subquery(),
+    select(func.max(Securities.updated_at)).scalar_subquery(),
+    select(func.count(Securities.ticker)).scalar_subquery(),
+)
+
+
+def get_snapshot_watermark(db: Session) -> Tuple[Any, ...]:
+    """
+    Cheap fingerprint of the market snapshot, read from the database so it
+    moves with writes made by any process: the sum of the daily price
+    versions (see get_price_watermark), the latest bar time and number of
+    bars in latest_prices, and the latest securities change.
+    """
+    return tuple(db.execute(SNAPSHOT_WATERMARK_STMT).one())
+
+
+def get_latest_trading_day(db: Session) -> Optional[datetime]:
+    """
+    Time of the newest bar in latest_prices, used as the default trading day.
+    """
+    return db.query(func.max(LatestPrice.time)).scalar()
+
+
+def get_day_cross_section(db: Session, start: datetime, end: datetime) -> List[Row]:
+    """
+    Get the daily prices of every active security with a bar in [start, end),
+    with the exchange of the security, ordered by ticker.
+    """
+    stmt = (
+        select(
+            DailyPrice.ticker,
+            Securities.exchange,
+            cast(DailyPrice.close_price, Float).label("close_price"),
+            DailyPrice.percent_change,
+            DailyPrice.volume,
+            cast(DailyPrice.foreign_net_buy_value, Float).label("foreign_net_buy_value"),
+        )
+        .join(Securities, Securities.ticker == DailyPrice.ticker)
+        .where(DailyPrice.time >= start, DailyPrice.time < end, Securities.status == "active")
+        .order_by(DailyPrice.ticker)
+    )
+    return db.execute(stmt).all()
@@ -0,0 +1,46 @@
+from datetime import datetime
+from typing import Any, Iterable, List, Mapping, Optional, Tuple, Union
+
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.market import SNAPSHOT_WATERMARK_STMT, market_snapshot_stmt, refresh_latest_prices_stmt
+from app.models.latest_prices import LatestPrice
+
+
+async def refresh_latest_prices(
+    db: AsyncSession, tickers: Iterable[str], since: Optional[Union[datetime, Mapping[str, datetime]]] = None
+) -> None:
+    """
+    Async version of app.crud.market.refresh_latest_prices.
+    Runs in the caller's transaction; the caller commits.
+    """
+    tickers = list(set(tickers))
+    if tickers:
+        await db.execute(refresh_latest_prices_stmt(tickers, since))
+
+
+async def remove_latest_price(db: AsyncSession, ticker: str, time: datetime) -> None:
+    """
+    Async version of app.crud.market.remove_latest_price.
+    Runs in the caller's transaction; the caller commits.
+    """
+    result = await db.execute(
+        delete(LatestPrice).where(LatestPrice.ticker == ticker, LatestPrice.time == time)
+    )
+    if result.rowcount:
+        await refresh_latest_prices(db, [ticker])
+
+
+async def get_market_snapshot(db: AsyncSession, exchange: Optional[str] = None) -> List[LatestPrice]:
+    """
+    Async version of app.crud.market.get_market_snapshot.
+    """
+    return (await db.execute(market_snapshot_stmt(exchange))).scalars().all()
+
+
+async def get_snapshot_watermark(db: AsyncSession) -> Tuple[Any, ...]:
+    """
+    Async version of app.crud.market.get_snapshot_watermark.
+    """
+    return tuple((await db.execute(SNAPSHOT_WATERMARK_STMT)).one())
@@ -0,0 +1,81 @@
+from datetime import date, datetime
+from typing import Any, Iterable, List, Optional
+
+from sqlalchemy import BigInteger, any_, bindparam, func, literal, select
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlalchemy.orm import Session
+
+from app.core.cache import trading_day
+from app.models.price_versions import DayPriceVersion, PriceVersion
+
+
+def _bump_versions_stmt(model: Any, key: str) -> Any:
+    """
+    INSERT ... ON CONFLICT DO UPDATE adding one to the version of every
+    key in the :<key>s array parameter (starting new keys at 1).
+    """
+    keys = func.unnest(bindparam(f"{key}s", type_=ARRAY(model.__table__.c[key].type))).label(key)
+    # Rows are locked in key order, so concurrent writers cannot deadlock
+    source = select(keys, literal(1, BigInteger)).order_by(keys)
+    stmt = insert(model).from_select([key, "version"], source)
+    return stmt.on_conflict_do_update(
+        index_elements=[model.__table__.c[key]],
+        set_={"version": model.version + 1, "updated_at": func.now()},
+    )
+
+
+BUMP_PRICE_VERSIONS_STMT = _bump_versions_stmt(PriceVersion, "ticker")
+BUMP_DAY_PRICE_VERSIONS_STMT = _bump_versions_stmt(DayPriceVersion, "day")
+
+# Version of one ticker (NULL before its first write) and the sum over every
+# ticker, which grows with any write; read by the watermark statements
+PRICE_VERSION_BY_TICKER_STMT = select(PriceVersion.version).where(PriceVersion.ticker == bindparam("ticker"))
+ALL_PRICE_VERSIONS_STMT = select(func.coalesce(func.sum(PriceVersion.version), 0))
+# Sum over a set of tickers; versions only grow, so it moves with any write
+# to one of them
+PRICE_VERSIONS_OF_TICKERS_STMT = ALL_PRICE_VERSIONS_STMT.where(
+    PriceVersion.ticker == any_(bindparam("tickers", type_=ARRAY(PriceVersion.ticker.type)))
+)
+# Version of one trading day (NULL before its first write)
+DAY_PRICE_VERSION_STMT = select(DayPriceVersion.version).where(DayPriceVersion.day == bindparam("day"))
+
+
+def written_days(times: Optional[Iterable[datetime]]) -> List[date]:
+    """Sorted trading days of the bar times of a write."""
+    return sorted({trading_day(when) for when in times or ()})
+
+
+def bump_price_versions(
+    db: Session, tickers: Iterable[str], times: Optional[Iterable[datetime]] = None
+) -> None:
+    """
+    Bump the versions of tickers whose daily prices were written, and of
+    the trading days of the written times.
+    Runs in the caller's transaction, so the new versions become visible
+    with the write they stand for; the caller commits.
+    """
+    tickers = sorted(set(tickers))
+    if tickers:
+        db.execute(BUMP_PRICE_VERSIONS_STMT, {"tickers": tickers})
+    days = written_days(times)
+    if days:
+        db.execute(BUMP_DAY_PRICE_VERSIONS_STMT, {"days": days})
+
+
+def get_price_versions(db: Session, tickers: Iterable[str]) -> int:
+    """
+    Watermark of the daily prices of several tickers: the sum of their
+    versions, which any write to one of them (from any process) moves.
+    """
+    tickers = sorted(set(tickers))
+    if not tickers:
+        return 0
+    return db.execute(PRICE_VERSIONS_OF_TICKERS_STMT, {"tickers": tickers}).scalar()
+
+
+def get_day_price_version(db: Session, day: date) -> int:
+    """
+    Watermark of the daily prices of one trading day, moved by writes to
+    that day from any process; 0 before the first one.
+    """
+    return db.execute(DAY_PRICE_VERSION_STMT, {"day": day}).scalar() or 0
@@ -0,0 +1,21 @@
+from datetime import datetime
+from typing import Iterable, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.price_versions import BUMP_DAY_PRICE_VERSIONS_STMT, BUMP_PRICE_VERSIONS_STMT, written_days
+
+
+async def bump_price_versions(
+    db: AsyncSession, tickers: Iterable[str], times: Optional[Iterable[datetime]] = None
+) -> None:
+    """
+    Async version of app.crud.price_versions.bump_price_versions.
+    Runs in the caller's transaction; the caller commits.
+    """
+    tickers = sorted(set(tickers))
+    if tickers:
+        await db.execute(BUMP_PRICE_VERSIONS_STMT, {"tickers": tickers})
+    days = written_days(times)
+    if days:
+        await db.execute(BUMP_DAY_PRICE_VERSIONS_STMT, {"days": days})
@@ -1,59 +1,156 @@
-from typing import List, Optional, Dict, Any
+from datetime import datetime
+from typing import Iterable, List, Optional, Dict, Any, Set, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_
+from sqlalchemy import func, and_, bindparam, literal_column, select
+from sqlalchemy.sql import Select
+from sqlalchemy.dialects.postgresql import insert
 
+from app.core.cache import invalidate_tickers
 from app.models.securities import Securities
 from app.schemas.securities import SecuritiesCreate, SecuritiesUpdate
+from app.utils.securities_catalog import catalog_discard, catalog_put, catalog_put_many, catalog_snapshot
 
 
-def get_securities(db: Session, skip: int = 0, limit: int = 100, filters: Optional[Dict[str, Any]] = None) -> List[Securities]:
+# Hot lookups, built once with bound parameters: the statement, its cache
+# key and its compiled SQL are reused, each call only binds values
+SECURITY_BY_TICKER_STMT = select(Securities).where(Securities.ticker == bindparam("ticker"))
+SECURITY_BY_ISIN_STMT = select(Securities).where(Securities.isin_code == bindparam("isin_code"))
+ISIN_OWNERS_STMT = select(Securities.isin_code, Securities.ticker).where(
+    Securities.isin_code.in_(bindparam("isin_codes", expanding=True))
+)
+
+
+def _filter_conditions(filters: Optional[Dict[str, Any]]) -> List[Any]:
     """
-    Get a list of securities with optional filtering, pagination
+    Build equality conditions for the filters that match Securities columns.
     """
-    query = db.query(Securities)
-    
-    # Apply filters if provided
+    filter_conditions = []
     if filters:
-        filter_conditions = []
         for key, value in filters.items():
             if hasattr(Securities, key) and value is not None:
                 filter_conditions.append(getattr(Securities, key) == value)
-        if filter_conditions:
-            query = query.filter(and_(*filter_conditions))
-    
-    return query.offset(skip).limit(limit).all()
+    return filter_conditions
+
+
+def securities_stmt(
+    skip: int = 0,
+    limit: int = 100,
+    filters: Optional[Dict[str, Any]] = None,
+    after: Optional[str] = None,
+) -> Select:
+    """
+    Build the SELECT of get_securities.
+    """
+    stmt = select(Securities)
+
+    # Apply filters if provided
+    filter_conditions = _filter_conditions(filters)
+    if filter_conditions:
+        stmt = stmt.where(and_(*filter_conditions))
+
+    if after is not None:
+        stmt = stmt.where(Securities.ticker > after)
+
+    return stmt.order_by(Securities.ticker).offset(skip).limit(limit)
+
+
+def get_securities(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    filters: Optional[Dict[str, Any]] = None,
+    after: Optional[str] = None,
+) -> List[Securities]:
+    """
+    Get a list of securities with optional filtering, pagination.
+    Results are ordered by ticker; pass the last ticker of a page as after
+    to get the next page with an index seek instead of OFFSET.
+    """
+    snapshot = catalog_snapshot()
+    if snapshot is not None:
+        return snapshot.list(skip, limit, filters, after)
+    return db.execute(securities_stmt(skip, limit, filters, after)).scalars().all()
 
 
 def count_securities(db: Session, filters: Optional[Dict[str, Any]] = None) -> int:
     """
     Count total number of securities with optional filtering
     """
+    snapshot = catalog_snapshot()
+    if snapshot is not None:
+        return len(snapshot.matching(filters))
+
     query = db.query(func.count(Securities.ticker))
     
     # Apply filters if provided
-    if filters:
-        filter_conditions = []
-        for key, value in filters.items():
-            if hasattr(Securities, key) and value is not None:
-                filter_conditions.append(getattr(Securities, key) == value)
-        if filter_conditions:
-            query = query.filter(and_(*filter_conditions))
+    filter_conditions = _filter_conditions(filters)
+    if filter_conditions:
+        query = query.filter(and_(*filter_conditions))
     
     return query.scalar()
 
 
+def watermark_stmt(filters: Optional[Dict[str, Any]] = None) -> Select:
+    """
+    Build the SELECT of get_securities_watermark.
+    """
+    stmt = select(func.max(Securities.updated_at), func.count(Securities.ticker))
+
+    # Apply filters if provided
+    filter_conditions = _filter_conditions(filters)
+    if filter_conditions:
+        stmt = stmt.where(and_(*filter_conditions))
+    return stmt
+
+
+def get_securities_watermark(
+    db: Session, filters: Optional[Dict[str, Any]] = None
+) -> Tuple[Optional[datetime], int]:
+    """
+    Cheap fingerprint of a filtered securities listing: the latest updated_at
+    (moved by inserts and updates) and the row count (moved by deletes).
+    """
+    snapshot = catalog_snapshot()
+    if snapshot is not None:
+        return snapshot.watermark(filters)
+    latest, count = db.execute(watermark_stmt(filters)).one()
+    return latest, count
+
+
 def get_security_by_ticker(db: Session, ticker: str) -> Optional[Securities]:
     """
     Get a security by its ticker
     """
-    return db.query(Securities).filter(Securities.ticker == ticker).first()
+    snapshot = catalog_snapshot()
+    if snapshot is not None:
+        return snapshot.get(ticker)
+    return db.execute(SECURITY_BY_TICKER_STMT, {"ticker": ticker}).scalars().first()
+
+
+def get_existing_tickers(db: Session, tickers: Iterable[str], use_catalog: bool = True) -> Set[str]:
+    """
+    Return the subset of the given tickers that exist, using a single query.
+    Pass use_catalog=False where a ticker deleted moments ago must not count,
+    e.g. right before inserting rows that reference it.
+    """
+    snapshot = catalog_snapshot() if use_catalog else None
+    if snapshot is not None:
+        return snapshot.existing(tickers)
+    tickers = list(set(tickers))
+    if not tickers:
+        return set()
+    rows = db.query(Securities.ticker).filter(Securities.ticker.in_(tickers)).all()
+    return {row.ticker for row in rows}
 
 
 def get_security_by_isin(db: Session, isin_code: str) -> Optional[Securities]:
     """
     Get a security by its ISIN code
     """
-    return db.query(Securities).filter(Securities.isin_code == isin_code).first()
+    snapshot = catalog_snapshot()
+    if snapshot is not None:
+        return snapshot.get_by_isin(isin_code)
+    return db.execute(SECURITY_BY_ISIN_STMT, {"isin_code": isin_code}).scalars().first()
 
 
 def create_security(db: Session, security: SecuritiesCreate) -> Securities:
@@ -64,6 +161,7 @@ def create_security(db: Session, security: SecuritiesCreate) -> Securities:
     db.add(db_security)
     db.commit()
     db.refresh(db_security)
+    catalog_put(db_security)
     return db_security
 
 
@@ -71,7 +169,7 @@ def update_security(db: Session, ticker: str, security: SecuritiesUpdate) -> Opt
     """
     Update a security by ticker
     """
-    db_security = db.query(Securities).filter(Securities.ticker == ticker).first()
+    db_security = db.get(Securities, ticker)
     if not db_security:
         return None
     
@@ -80,7 +178,10 @@ def update_security(db: Session, ticker: str, security: SecuritiesUpdate) -> Opt
         setattr(db_security, key, value)
     
     db.commit()
+    # Status and exchange changes affect cached market snapshots
+    invalidate_tickers([ticker])
     db.refresh(db_security)
+    catalog_put(db_security)
     return db_security
 
 
@@ -88,10 +189,129 @@ def delete_security(db: Session, ticker: str) -> bool:
     """
     Delete a security by ticker
     """
-    db_security = db.query(Securities).filter(Securities.ticker == ticker).first()
+    db_security = db.get(Securities, ticker)
     if not db_security:
         return False
     
     db.delete(db_security)
     db.commit()
-    return True 
\ No newline at end of file
+    invalidate_tickers([ticker])
+    catalog_discard(ticker)
+    return True 
+
+
+def plan_securities_upsert(
+    securities: List[SecuritiesCreate], isin_owners: Dict[str, str]
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], int]:
+    """
+    Split a batch into the rows to upsert and the ISIN conflicts to report.
+
+    When a ticker appears more than once the last row wins (the others are
+    counted as duplicates). A row is rejected when its ISIN belongs to
+    another existing security (isin_owners: ISIN -> ticker, from one
+    set-based query) or to an earlier row of the batch. Returns the rows,
+    the conflicts and the number of duplicates.
+    """
+    unique: Dict[str, Tuple[int, SecuritiesCreate]] = {}
+    for index, security in enumerate(securities):
+        unique[security.ticker] = (index, security)
+
+    rows: List[Dict[str, Any]] = []
+    conflicts: List[Dict[str, Any]] = []
+    claimed: Dict[str, str] = {}
+    for index, security in sorted(unique.values(), key=lambda item: item[0]):
+        isin_code = security.isin_code
+        if isin_code:
+            owner = isin_owners.get(isin_code)
+            if owner is not None and owner != security.ticker:
+                conflicts.append({
+                    "index": index,
+                    "ticker": security.ticker,
+                    "isin_code": isin_code,
+                    "conflicting_ticker": owner,
+                    "reason": "ISIN belongs to an existing security",
+                })
+                continue
+            if isin_code in claimed:
+                conflicts.append({
+                    "index": index,
+                    "ticker": security.ticker,
+                    "isin_code": isin_code,
+                    "conflicting_ticker": claimed[isin_code],
+                    "reason": "ISIN used by an earlier row of the batch",
+                })
+                continue
+            claimed[isin_code] = security.ticker
+        rows.append(security.dict())
+    return rows, conflicts, len(securities) - len(unique)
+
+
+def _securities_upsert_stmt() -> Any:
+    """
+    INSERT ... ON CONFLICT (ticker) DO UPDATE of one SecuritiesCreate row,
+    returning every column and an "inserted" flag.
+    """
+    stmt = insert(Securities)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Securities.ticker],
+        set_={
+            **{name: stmt.excluded[name] for name in SecuritiesCreate.model_fields if name != "ticker"},
+            "updated_at": func.now(),
+        },
+    )
+    # xmax is 0 for freshly inserted tuples and non-zero for updated ones
+    return stmt.returning(
+        *Securities.__table__.columns,
+        literal_column("xmax = 0").label("inserted"),
+        sort_by_parameter_order=True,
+    )
+
+
+# Executed with a list of rows: SQLAlchemy batches them into multi-row
+# INSERTs (insertmanyvalues) from the one compiled statement, where a
+# values() statement per chunk would be recompiled for every call
+SECURITIES_UPSERT_STMT = _securities_upsert_stmt()
+
+
+def upsert_securities(db: Session, securities: List[SecuritiesCreate]) -> Dict[str, Any]:
+    """
+    Insert or update many securities in a single transaction, checking ISIN
+    uniqueness for the whole batch with one query (see
+    plan_securities_upsert). Returns the counts and conflicts of
+    SecuritiesBatchResult.
+    """
+    isin_codes = list({security.isin_code for security in securities if security.isin_code})
+    isin_owners = {}
+    if isin_codes:
+        isin_owners = dict(db.execute(ISIN_OWNERS_STMT, {"isin_codes": isin_codes}).all())
+    rows, conflicts, duplicates = plan_securities_upsert(securities, isin_owners)
+
+    written = db.execute(SECURITIES_UPSERT_STMT, rows).all() if rows else []
+    db.commit()
+    return securities_upsert_result(securities, written, conflicts, duplicates)
+
+
+def securities_upsert_result(
+    securities: List[SecuritiesCreate],
+    written: List[Any],
+    conflicts: List[Dict[str, Any]],
+    duplicates: int,
+) -> Dict[str, Any]:
+    """
+    Invalidate caches and update the catalog for the committed rows of an
+    upsert, and build its SecuritiesBatchResult.
+    """
+    tickers = [row.ticker for row in written]
+    if tickers:
+        # Status and exchange changes affect cached market snapshots
+        invalidate_tickers(tickers)
+        catalog_put_many(written)
+    inserted = sum(1 for row in written if row.inserted)
+    return {
+        "total": len(securities),
+        "inserted": inserted,
+        "updated": len(written) - inserted,
+        "duplicates": duplicates,
+        "rejected": len(conflicts),
+        "conflicts": conflicts,
+    }
@@ -0,0 +1,166 @@
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import invalidate_tickers
+from app.crud.securities import (
+    ISIN_OWNERS_STMT,
+    SECURITY_BY_ISIN_STMT,
+    SECURITY_BY_TICKER_STMT,
+    SECURITIES_UPSERT_STMT,
+    plan_securities_upsert,
+    securities_stmt,
+    securities_upsert_result,
+    watermark_stmt,
+)
+from app.models.securities import Securities
+from app.schemas.securities import SecuritiesCreate, SecuritiesUpdate
+from app.utils.securities_catalog import catalog_discard, catalog_put, catalog_snapshot
+from app.utils.securities_search import build_search_index, cached_search_index
+
+
+async def get_securities(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    filters: Optional[Dict[str, Any]] = None,
+    after: Optional[str] = None,
+) -> List[Securities]:
+    """
+    Async version of app.crud.securities.get_securities.
+    """
+    snapshot = catalog_snapshot()
+    if snapshot is not None:
+        return snapshot.list(skip, limit, filters, after)
+    return (await db.execute(securities_stmt(skip, limit, filters, after))).scalars().all()
+
+
+async def get_securities_watermark(
+    db: AsyncSession, filters: Optional[Dict[str, Any]] = None
+) -> Tuple[Optional[datetime], int]:
+    """
+    Async version of app.crud.securities.get_securities_watermark.
+    """
+    snapshot = catalog_snapshot()
+    if snapshot is not None:
+        return snapshot.watermark(filters)
+    latest, count = (await db.execute(watermark_stmt(filters))).one()
+    return latest, count
+
+
+async def search_securities(db: AsyncSession, query: str, limit: int = 10) -> List[Tuple[Any, float]]:
+    """
+    Autocomplete search over ticker, short_name and company_name, as
+    (security, score) best first. The in-memory index is rebuilt, in the
+    threadpool, when the catalog snapshot (or, without the catalog, the
+    table watermark) changes and the catalog listener has not indexed it.
+    """
+    snapshot = catalog_snapshot()
+    key = snapshot if snapshot is not None else await get_securities_watermark(db)
+    index = cached_search_index(key)
+    if index is None:
+        if snapshot is not None:
+            records = snapshot.by_ticker.values()
+        else:
+            records = (await db.execute(select(Securities))).scalars().all()
+        index = await run_in_threadpool(build_search_index, key, records)
+    return index.search(query, limit)
+
+
+async def get_security_by_ticker(db: AsyncSession, ticker: str) -> Optional[Securities]:
+    """
+    Get a security by its ticker
+    """
+    snapshot = catalog_snapshot()
+    if snapshot is not None:
+        return snapshot.get(ticker)
+    return (await db.execute(SECURITY_BY_TICKER_STMT, {"ticker": ticker})).scalars().first()
+
+
+async def get_existing_tickers(db: AsyncSession, tickers: Iterable[str]) -> Set[str]:
+    """
+    Return the subset of the given tickers that exist, using a single query
+    """
+    snapshot = catalog_snapshot()
+    if snapshot is not None:
+        return snapshot.existing(tickers)
+    tickers = list(set(tickers))
+    if not tickers:
+        return set()
+    result = await db.execute(select(Securities.ticker).where(Securities.ticker.in_(tickers)))
+    return set(result.scalars())
+
+
+async def get_security_by_isin(db: AsyncSession, isin_code: str) -> Optional[Securities]:
+    """
+    Get a security by its ISIN code
+    """
+    snapshot = catalog_snapshot()
+    if snapshot is not None:
+        return snapshot.get_by_isin(isin_code)
+    return (await db.execute(SECURITY_BY_ISIN_STMT, {"isin_code": isin_code})).scalars().first()
+
+
+async def create_security(db: AsyncSession, security: SecuritiesCreate) -> Securities:
+    """
+    Create a new security
+    """
+    db_security = Securities(**security.dict())
+    db.add(db_security)
+    await db.commit()
+    await db.refresh(db_security)
+    catalog_put(db_security)
+    return db_security
+
+
+async def upsert_securities(db: AsyncSession, securities: List[SecuritiesCreate]) -> Dict[str, Any]:
+    """
+    Async version of app.crud.securities.upsert_securities.
+    """
+    isin_codes = list({security.isin_code for security in securities if security.isin_code})
+    isin_owners = {}
+    if isin_codes:
+        isin_owners = dict((await db.execute(ISIN_OWNERS_STMT, {"isin_codes": isin_codes})).all())
+    rows, conflicts, duplicates = plan_securities_upsert(securities, isin_owners)
+
+    written = (await db.execute(SECURITIES_UPSERT_STMT, rows)).all() if rows else []
+    await db.commit()
+    return securities_upsert_result(securities, written, conflicts, duplicates)
+
+
+async def update_security(db: AsyncSession, ticker: str, security: SecuritiesUpdate) -> Optional[Securities]:
+    """
+    Update a security by ticker
+    """
+    db_security = await db.get(Securities, ticker)
+    if not db_security:
+        return None
+
+    update_data = security.dict(exclude_unset=True)
+    for key, value in update_data.items():
+        setattr(db_security, key, value)
+
+    await db.commit()
+    # Status and exchange changes affect cached market snapshots
+    invalidate_tickers([ticker])
+    await db.refresh(db_security)
+    catalog_put(db_security)
+    return db_security
+
+
+async def delete_security(db: AsyncSession, ticker: str) -> bool:
+    """
+    Delete a security by ticker
+    """
+    db_security = await db.get(Securities, ticker)
+    if not db_security:
+        return False
+
+    await db.delete(db_security)
+    await db.commit()
+    invalidate_tickers([ticker])
+    catalog_discard(ticker)
+    return True
@@ -1,10 +1,14 @@
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 import logging
 
+from app.core.compression import CompressionMiddleware
 from app.core.config import settings
-from app.core.database import setup_timescale
+from app.core.database import dispose_async_engine, setup_timescale
 from app.api.v1 import api_router
+from app.utils.ingest_buffer import start_ingest_buffer, stop_ingest_buffer
+from app.utils.securities_catalog import start_securities_catalog, stop_securities_catalog
 
 # Configure logging
 logging.basicConfig(
@@ -29,6 +33,10 @@ if settings.BACKEND_CORS_ORIGINS:
         allow_headers=["*"],
     )
 
+# Compress responses for clients that accept it
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
+
 # Include API routers
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
@@ -43,12 +51,18 @@ async def startup_db_client():
         logger.info("Database connection established successfully")
     except Exception as e:
         logger.error(f"Database connection failed: {e}")
+    await run_in_threadpool(start_securities_catalog)
+    start_ingest_buffer()
 
 
 @app.on_event("shutdown")
 async def shutdown_db_client():
     """Close database connections when the application shuts down."""
     logger.info("Closing database connections...")
+    # Queued rows are written before the connections go away
+    await run_in_threadpool(stop_ingest_buffer)
+    await run_in_threadpool(stop_securities_catalog)
+    await dispose_async_engine()
 
 
 @app.get("/")
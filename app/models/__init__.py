@@ -1,4 +1,6 @@
 from app.models.daily_prices import DailyPrice
+from app.models.latest_prices import LatestPrice
+from app.models.price_versions import DayPriceVersion, PriceVersion
 from app.models.securities import Securities
 
-__all__ = ["SensorData", "Securities", "DailyPrice"] 
\ No newline at end of file
+__all__ = ["SensorData", "Securities", "DailyPrice", "LatestPrice", "PriceVersion", "DayPriceVersion"] 
\ No newline at end of file
@@ -0,0 +1,39 @@
+from sqlalchemy import Column, String, Numeric, BigInteger, Float, DateTime, ForeignKey
+from sqlalchemy.orm import relationship
+
+from app.core.database import Base
+
+
+class LatestPrice(Base):
+    """
+    Latest daily_prices row of every ticker, kept up to date by the write
+    paths (CRUD layer and bulk loader) so that the market board does not
+    scan the hypertable.
+    """
+    __tablename__ = "latest_prices"
+
+    # --- Primary key and foreign key ---
+    ticker = Column(String(10), ForeignKey("securities.ticker"), primary_key=True)
+    time = Column(DateTime(timezone=True), nullable=False)
+
+    # --- Basic price data (OHLC) ---
+    open_price = Column(Numeric(18, 2))
+    high_price = Column(Numeric(18, 2))
+    low_price = Column(Numeric(18, 2))
+    close_price = Column(Numeric(18, 2))
+
+    # --- Transaction data ---
+    volume = Column(BigInteger)
+    price_change = Column(Numeric(18, 2))
+    percent_change = Column(Float)
+
+    # --- Foreign trade and cash flow data ---
+    buy_order_value = Column(Numeric(20, 2))
+    sell_order_value = Column(Numeric(20, 2))
+    foreign_net_buy_value = Column(Numeric(20, 2))
+
+    buy_order_quantity = Column(BigInteger)
+    sell_order_quantity = Column(BigInteger)
+    foreign_net_buy_quantity = Column(BigInteger)
+
+    security = relationship("Securities")
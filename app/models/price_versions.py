@@ -0,0 +1,31 @@
+from sqlalchemy import BigInteger, Column, Date, DateTime, String, func
+
+from app.core.database import Base
+
+
+class PriceVersion(Base):
+    """
+    Version of the daily prices of every ticker, bumped in the transaction
+    of every write to daily_prices (CRUD layer and bulk loader). HTTP
+    validators are derived from it, so they change with writes made by any
+    process, including updates that leave the latest time unchanged.
+    """
+    __tablename__ = "daily_price_versions"
+
+    ticker = Column(String(10), primary_key=True)
+    version = Column(BigInteger, nullable=False, server_default="0")
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+
+class DayPriceVersion(Base):
+    """
+    Version of the daily prices of every trading day (UTC date of the bar
+    time), bumped with PriceVersion. Caches derived from the cross-section
+    of a day (market movers rankings) are keyed by it, so writes to that day
+    made by any process move the key and writes to other days do not.
+    """
+    __tablename__ = "daily_price_day_versions"
+
+    day = Column(Date, primary_key=True)
+    version = Column(BigInteger, nullable=False, server_default="0")
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
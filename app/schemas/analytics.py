@@ -0,0 +1,34 @@
+from enum import Enum
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+from app.schemas.daily_prices import TimeRange
+
+
+class MatrixKind(str, Enum):
+    CORRELATION = "correlation"
+    COVARIANCE = "covariance"
+
+
+class CorrelationRequest(BaseModel):
+    tickers: List[str] = Field(..., description="Ticker symbols to correlate", min_length=2, max_length=500)
+    time_range: TimeRange = Field(TimeRange.ONE_YEAR, description="Window of close prices to use")
+    kind: MatrixKind = Field(MatrixKind.CORRELATION, description="correlation or covariance of log returns")
+    min_periods: int = Field(
+        20, description="Minimum number of common return days for a pair to get a value", ge=2
+    )
+    include_returns: bool = Field(False, description="Also return the date x ticker log return matrix")
+
+
+class CorrelationResponse(BaseModel):
+    tickers: List[str] = Field(..., description="Row and column order of the matrices")
+    kind: MatrixKind
+    time_range: TimeRange
+    matrix: List[List[Optional[float]]] = Field(..., description="Pairwise matrix; null for pairs with too few common days")
+    observations: List[List[int]] = Field(..., description="Number of common return days of every pair")
+    dates: Optional[List[str]] = Field(None, description="Dates of the return rows (with include_returns)")
+    returns: Optional[List[List[Optional[float]]]] = Field(
+        None, description="Log returns, one row per date and one column per ticker (with include_returns)"
+    )
+    not_found: List[str] = Field(default_factory=list, description="Requested tickers that do not exist")
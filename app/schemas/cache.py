@@ -0,0 +1,22 @@
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+
+class CacheStats(BaseModel):
+    entries: int = Field(..., description="Number of cached entries")
+    maxsize: int = Field(..., description="Maximum number of entries")
+    weight: int = Field(..., description="Summed weight of the entries (bytes for responses)")
+    max_weight: Optional[int] = Field(None, description="Maximum summed weight")
+    ttl_seconds: float = Field(..., description="Time to live of an entry")
+    hits: int = Field(..., description="Lookups served from the cache")
+    misses: int = Field(..., description="Lookups that had to be computed")
+    hit_ratio: Optional[float] = Field(None, description="hits / (hits + misses)")
+    evictions: int = Field(..., description="Entries evicted to respect the size bounds")
+    expirations: int = Field(..., description="Entries dropped because their TTL passed")
+    invalidations: int = Field(..., description="Entries dropped by writes")
+
+
+class CacheStatsResponse(BaseModel):
+    responses: CacheStats
+    counts: CacheStats
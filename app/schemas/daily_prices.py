@@ -1,6 +1,6 @@
 from datetime import datetime
 from enum import Enum
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from pydantic import BaseModel, Field, computed_field
 
@@ -15,6 +15,34 @@ class TimeRange(str, Enum):
     ALL = "all"
 
 
+class ExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+class ResponseLayout(str, Enum):
+    ROWS = "rows"
+    COLUMNAR = "columnar"
+
+
+class TotalMode(str, Enum):
+    EXACT = "exact"
+    ESTIMATE = "estimate"
+    NONE = "none"
+
+
+class DownsampleMethod(str, Enum):
+    LTTB = "lttb"
+    MINMAX = "minmax"
+
+
+class OHLCVInterval(str, Enum):
+    ONE_WEEK = "1w"
+    ONE_MONTH = "1M"
+    ONE_QUARTER = "1q"
+    ONE_YEAR = "1y"
+
+
 class DailyPriceBase(BaseModel):
     time: datetime = Field(..., description="Timestamp of the trading day")
     ticker: str = Field(..., description="Stock ticker symbol", max_length=10)
@@ -41,6 +69,21 @@ class DailyPriceCreate(DailyPriceBase):
     pass
 
 
+class DailyPriceBatchCreate(BaseModel):
+    items: List[DailyPriceCreate] = Field(
+        ..., description="Daily price rows to insert or update", min_length=1, max_length=10000
+    )
+
+
+class DailyPriceBatchResult(BaseModel):
+    total: int = Field(..., description="Number of rows received")
+    inserted: int = Field(..., description="Rows inserted as new records")
+    updated: int = Field(..., description="Existing rows overwritten")
+    duplicates: int = Field(..., description="Rows superseded by a later row with the same ticker and time")
+    rejected: int = Field(..., description="Rows skipped because their ticker does not exist")
+    unknown_tickers: List[str] = Field(default_factory=list, description="Tickers not found in securities")
+
+
 class DailyPriceUpdate(BaseModel):
     open_price: Optional[float] = Field(None, description="Opening price")
     high_price: Optional[float] = Field(None, description="Highest price")
@@ -116,4 +159,58 @@ class DailyPriceList(BaseModel):
 
 class ExtendedDailyPriceList(BaseModel):
     items: List[ExtendedDailyPriceResponse]
-    total: int 
\ No newline at end of file
+    total: Optional[int]
+    next_cursor: Optional[str] = Field(None, description="Cursor of the next page, if any") 
+
+
+class OHLCVBar(BaseModel):
+    time: datetime = Field(..., description="Start of the bucket")
+    open: Optional[float] = Field(None, description="First opening price in the bucket")
+    high: Optional[float] = Field(None, description="Highest price in the bucket")
+    low: Optional[float] = Field(None, description="Lowest price in the bucket")
+    close: Optional[float] = Field(None, description="Last closing price in the bucket")
+
+    volume: Optional[int] = Field(None, description="Total trading volume")
+    buy_order_value: Optional[float] = Field(None, description="Total buy order value")
+    sell_order_value: Optional[float] = Field(None, description="Total sell order value")
+    foreign_net_buy_value: Optional[float] = Field(None, description="Total foreign net buy value")
+
+    buy_order_quantity: Optional[int] = Field(None, description="Total buy order quantity")
+    sell_order_quantity: Optional[int] = Field(None, description="Total sell order quantity")
+    foreign_net_buy_quantity: Optional[int] = Field(None, description="Total foreign net buy quantity")
+
+    class Config:
+        orm_mode = True
+
+
+class OHLCVList(BaseModel):
+    ticker: str
+    interval: OHLCVInterval
+    items: List[OHLCVBar]
+    total: int
+
+
+class IndicatorResponse(BaseModel):
+    ticker: str
+    time_range: TimeRange
+    columns: Dict[str, List] = Field(
+        ..., description="Parallel time/open/high/low/close/volume arrays, newest first"
+    )
+    indicators: Dict[str, List[Optional[float]]] = Field(
+        ..., description="Indicator series aligned with columns; null where not yet defined"
+    )
+    total: int
+
+
+class MultiTickerRangeRequest(BaseModel):
+    tickers: List[str] = Field(..., description="Ticker symbols to load", min_length=1, max_length=200)
+    time_range: TimeRange = Field(..., description="Time range for data retrieval")
+    limit: int = Field(10000, description="Maximum number of data points per ticker", ge=1, le=50000)
+    layout: ResponseLayout = Field(
+        ResponseLayout.ROWS, description="rows: one object per price; columnar: one array per column"
+    )
+
+
+class MultiTickerRangeResponse(BaseModel):
+    items: Dict[str, ExtendedDailyPriceList] = Field(..., description="Daily prices grouped by ticker")
+    not_found: List[str] = Field(default_factory=list, description="Requested tickers that do not exist")
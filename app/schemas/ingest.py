@@ -0,0 +1,31 @@
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+
+class IngestBufferStats(BaseModel):
+    running: bool = Field(..., description="Whether the flusher thread is alive")
+    depth: int = Field(..., description="Rows queued and not yet written")
+    max_rows: int = Field(..., description="Capacity of the queue")
+    max_depth: int = Field(..., description="Highest depth seen")
+    batch_size: int = Field(..., description="Rows written per batch at most")
+    flush_interval_ms: float = Field(..., description="Longest wait before a partial batch is written")
+    oldest_queued_ms: Optional[float] = Field(None, description="Age of the oldest queued row")
+    enqueued: int = Field(..., description="Rows accepted")
+    rejected: int = Field(..., description="Rows refused because the queue stayed full")
+    flushed_rows: int = Field(..., description="Rows committed")
+    flushed_batches: int = Field(..., description="Batches committed")
+    average_batch_rows: Optional[float] = Field(None, description="flushed_rows / flushed_batches")
+    failed_rows: int = Field(..., description="Rows dropped because the database refused them or stayed unreachable")
+    retried_writes: int = Field(..., description="Batch writes retried after a transient error")
+    split_batches: int = Field(..., description="Batches split to isolate rows the database refused")
+    unknown_ticker_rows: int = Field(..., description="Rows dropped because their ticker no longer exists")
+    last_flush_ms: Optional[float] = Field(None, description="Duration of the last batch write")
+    max_flush_ms: float = Field(..., description="Longest batch write")
+    last_lag_ms: Optional[float] = Field(None, description="Enqueue-to-commit time of the oldest row of the last batch")
+    max_lag_ms: float = Field(..., description="Longest enqueue-to-commit time")
+
+
+class IngestStatsResponse(BaseModel):
+    enabled: bool = Field(..., description="Whether write-behind ingestion is on in this worker")
+    buffer: Optional[IngestBufferStats] = None
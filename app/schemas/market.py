@@ -0,0 +1,43 @@
+from datetime import date, datetime
+from enum import Enum
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+from app.schemas.daily_prices import ExtendedDailyPriceResponse
+
+
+class MarketSnapshot(BaseModel):
+    items: List[ExtendedDailyPriceResponse] = Field(..., description="Latest daily price of every security")
+    total: int
+    as_of: Optional[datetime] = Field(None, description="Time of the newest bar in the snapshot")
+
+
+class MoverMetric(str, Enum):
+    PERCENT_CHANGE = "percent_change"
+    VOLUME = "volume"
+    FOREIGN_NET_BUY_VALUE = "foreign_net_buy_value"
+
+
+class MoverOrder(str, Enum):
+    TOP = "top"
+    BOTTOM = "bottom"
+
+
+class MoverItem(BaseModel):
+    rank: int
+    ticker: str
+    exchange: Optional[str] = None
+    close_price: Optional[float] = Field(None, description="Closing price")
+    percent_change: Optional[float] = Field(None, description="Percentage change")
+    volume: Optional[int] = Field(None, description="Trading volume")
+    foreign_net_buy_value: Optional[float] = Field(None, description="Foreign net buy value")
+
+
+class MarketMovers(BaseModel):
+    trading_day: Optional[date] = Field(None, description="Trading day that was ranked")
+    metric: MoverMetric
+    order: MoverOrder
+    exchange: Optional[str] = None
+    items: List[MoverItem]
+    total: int
@@ -31,6 +31,29 @@ class SecuritiesCreate(SecuritiesBase):
     pass
 
 
+class SecuritiesBatchCreate(BaseModel):
+    items: List[SecuritiesCreate] = Field(
+        ..., description="Securities to insert or update", min_length=1, max_length=10000
+    )
+
+
+class SecuritiesBatchConflict(BaseModel):
+    index: int = Field(..., description="Position of the rejected row in items")
+    ticker: str
+    isin_code: str
+    conflicting_ticker: str = Field(..., description="Security that already holds the ISIN")
+    reason: str
+
+
+class SecuritiesBatchResult(BaseModel):
+    total: int = Field(..., description="Number of rows received")
+    inserted: int = Field(..., description="Securities inserted")
+    updated: int = Field(..., description="Existing securities overwritten")
+    duplicates: int = Field(..., description="Rows superseded by a later row with the same ticker")
+    rejected: int = Field(..., description="Rows skipped because of an ISIN conflict")
+    conflicts: List[SecuritiesBatchConflict] = Field(default_factory=list, description="Rejected rows")
+
+
 class SecuritiesUpdate(BaseModel):
     isin_code: Optional[str] = Field(None, description="ISIN code", max_length=20)
     company_name: Optional[str] = Field(None, description="Full company name", max_length=255)
@@ -64,4 +87,18 @@ class SecuritiesResponse(SecuritiesBase):
 
 class SecuritiesList(BaseModel):
     items: List[SecuritiesResponse]
-    total: int 
\ No newline at end of file
+    total: int
+    next_cursor: Optional[str] = Field(None, description="Cursor of the next page, if any") 
+
+
+class SecuritySearchItem(BaseModel):
+    ticker: str
+    short_name: Optional[str] = None
+    company_name: str
+    exchange: Optional[str] = None
+    status: Optional[str] = None
+    score: float = Field(..., description="Match quality; higher is better")
+
+
+class SecuritySearchResults(BaseModel):
+    items: List[SecuritySearchItem]
@@ -0,0 +1,86 @@
+from datetime import datetime
+from typing import Any, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+def pivot_prices(
+    rows: Sequence[Any], tickers: Sequence[str], value_attr: str = "close"
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Arrange (ticker, time, value) rows into a date x ticker matrix.
+
+    Returns the sorted distinct times and a float matrix with one column per
+    ticker (in the given order) and NaN where a ticker has no row that day.
+    """
+    if not rows:
+        return np.empty(0, dtype=object), np.empty((0, len(tickers)))
+
+    times = np.array([row.time for row in rows], dtype=object)
+    dates, row_index = np.unique(times, return_inverse=True)
+    column_of = {ticker: i for i, ticker in enumerate(tickers)}
+    column_index = np.fromiter((column_of[row.ticker] for row in rows), dtype=np.int64, count=len(rows))
+
+    prices = np.full((len(dates), len(tickers)), np.nan)
+    prices[row_index, column_index] = np.array(
+        [getattr(row, value_attr) for row in rows], dtype=np.float64
+    )
+    return dates, prices
+
+
+def log_returns(prices: np.ndarray) -> np.ndarray:
+    """
+    Log returns between consecutive dates of a date x ticker price matrix.
+    A return is NaN when either price is missing or not positive, so a
+    missing day drops the returns on both sides of it instead of bridging
+    the gap with a multi-day return.
+    """
+    with np.errstate(invalid="ignore", divide="ignore"):
+        logs = np.log(np.where(prices > 0, prices, np.nan))
+    return np.diff(logs, axis=0)
+
+
+def pairwise_matrix(
+    returns: np.ndarray, kind: str = "correlation", min_periods: int = 2
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Pairwise-complete correlation or covariance of the columns of returns.
+
+    For every pair only the dates where both returns exist are used, like
+    pandas DataFrame.corr/cov, but all pairs are computed together with a
+    handful of matrix products over the validity mask instead of a loop
+    over pairs. Pairs with fewer than min_periods common dates are NaN.
+    Returns the matrix and the number of common dates of every pair.
+    """
+    valid = ~np.isnan(returns)
+    mask = valid.astype(np.float64)
+    values = np.where(valid, returns, 0.0)
+
+    counts = mask.T @ mask
+    # sums[i, j]: sum of column i over the dates where i and j both exist
+    sums = values.T @ mask
+    squares = (values * values).T @ mask
+    products = values.T @ values
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        degrees = counts - 1.0
+        covariance = (products - sums * sums.T / counts) / degrees
+        if kind == "covariance":
+            result = covariance
+        else:
+            variance = (squares - sums * sums / counts) / degrees
+            result = covariance / np.sqrt(variance * variance.T)
+            np.clip(result, -1.0, 1.0, out=result)
+
+    result[counts < max(min_periods, 2)] = np.nan
+    return result, counts.astype(np.int64)
+
+
+def matrix_to_lists(matrix: np.ndarray) -> List[List[Optional[float]]]:
+    """Convert a float matrix to nested JSON-ready lists, NaN becoming None."""
+    return [[None if value != value else value for value in row] for row in matrix.tolist()]
+
+
+def dates_to_strings(dates: Sequence[datetime]) -> List[str]:
+    """ISO 8601 strings of the dates of a pivoted matrix."""
+    return [value.isoformat() for value in dates]
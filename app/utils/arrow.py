@@ -0,0 +1,79 @@
+import io
+from typing import Any, Dict, Optional, Sequence
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy import BigInteger, DateTime, Float, Numeric, String
+
+from app.models.daily_prices import DailyPrice
+
+ARROW_STREAM_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+PARQUET_MEDIA_TYPE = "application/x-parquet"
+BINARY_MEDIA_TYPES = (ARROW_STREAM_MEDIA_TYPE, PARQUET_MEDIA_TYPE)
+
+
+def _arrow_type(column) -> pa.DataType:
+    """
+    Map a SQLAlchemy column type to the Arrow type used on the wire.
+    """
+    if isinstance(column.type, DateTime):
+        return pa.timestamp("us", tz="UTC")
+    if isinstance(column.type, BigInteger):
+        return pa.int64()
+    if isinstance(column.type, (Numeric, Float)):
+        return pa.float64()
+    if isinstance(column.type, String):
+        return pa.string()
+    raise TypeError(f"No Arrow type for column {column.name} ({column.type})")
+
+
+def arrow_schema(columns: Dict[str, Any]) -> pa.Schema:
+    """
+    Build an Arrow schema for the given output name -> column mapping.
+    """
+    return pa.schema(
+        [pa.field(name, _arrow_type(column), nullable=column.nullable) for name, column in columns.items()]
+    )
+
+
+DAILY_PRICE_SCHEMA = arrow_schema({column.name: column for column in DailyPrice.__table__.columns})
+
+
+def negotiate_binary_format(accept: Optional[str]) -> Optional[str]:
+    """
+    Return the Arrow or Parquet media type requested by an Accept header,
+    or None when the client wants the default JSON response.
+    """
+    if not accept:
+        return None
+    for part in accept.split(","):
+        media_type = part.split(";", 1)[0].strip().lower()
+        if media_type in BINARY_MEDIA_TYPES:
+            return media_type
+    return None
+
+
+def rows_to_table(rows: Sequence[Sequence[Any]], schema: pa.Schema) -> pa.Table:
+    """
+    Build a typed Arrow table from result tuples ordered like the schema.
+    """
+    if not rows:
+        return schema.empty_table()
+    arrays = [
+        pa.array(values, type=field.type)
+        for field, values in zip(schema, zip(*rows))
+    ]
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+
+def encode_table(table: pa.Table, media_type: str) -> bytes:
+    """
+    Serialize a table as an Arrow IPC stream or a Parquet file.
+    """
+    sink = io.BytesIO()
+    if media_type == PARQUET_MEDIA_TYPE:
+        pq.write_table(table, sink, compression="zstd")
+    else:
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+    return sink.getvalue()
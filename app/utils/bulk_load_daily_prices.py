@@ -0,0 +1,358 @@
+"""
+Parallel bulk loader for the daily_prices hypertable.
+
+Reads CSV/Parquet files of OHLCV rows, validates them in vectorized batches
+against the DailyPrice columns and streams them into PostgreSQL with COPY
+from several worker processes.
+
+Usage:
+    python -m app.utils.bulk_load_daily_prices data/*.parquet --workers 8
+    python -m app.utils.bulk_load_daily_prices prices.csv --split-by time --mode upsert
+"""
+import argparse
+import io
+import logging
+import time as time_module
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import BigInteger, Float, Numeric, text
+
+from app.core.database import SessionLocal, engine
+from app.crud.market import refresh_latest_prices
+from app.crud.price_versions import bump_price_versions
+from app.models.daily_prices import DailyPrice
+
+logger = logging.getLogger(__name__)
+
+# Column order used for COPY, taken straight from the model
+COLUMNS: List[str] = [column.name for column in DailyPrice.__table__.columns]
+KEY_COLUMNS = ["time", "ticker"]
+VALUE_COLUMNS = [name for name in COLUMNS if name not in KEY_COLUMNS]
+TICKER_MAX_LENGTH = DailyPrice.__table__.c.ticker.type.length
+
+# Statements used by the loader workers
+COPY_SQL = "COPY {table} ({columns}) FROM STDIN WITH (FORMAT csv)"
+STAGE_SQL = "CREATE TEMP TABLE {stage} (LIKE daily_prices INCLUDING DEFAULTS) ON COMMIT DROP"
+UPSERT_SQL = """
+    INSERT INTO daily_prices ({columns})
+    SELECT {columns} FROM {stage}
+    ON CONFLICT (time, ticker) DO {action}
+"""
+STAGE_TABLE = "daily_prices_stage"
+
+SPLIT_CHOICES = ("ticker", "time")
+MODE_CHOICES = ("copy", "upsert", "skip")
+
+
+@dataclass
+class LoadStats:
+    """Counters reported at the end of a load."""
+
+    rows_read: int = 0
+    rows_loaded: int = 0
+    rejected: Dict[str, int] = field(default_factory=dict)
+
+    def reject(self, reason: str, count: int) -> None:
+        if count:
+            self.rejected[reason] = self.rejected.get(reason, 0) + int(count)
+
+    @property
+    def rows_rejected(self) -> int:
+        return sum(self.rejected.values())
+
+
+def _numeric_bound(column) -> Optional[float]:
+    """Largest absolute value a Numeric(precision, scale) column can hold."""
+    if isinstance(column.type, Numeric) and not isinstance(column.type, Float):
+        if column.type.precision is not None:
+            return float(10 ** (column.type.precision - (column.type.scale or 0)))
+    return None
+
+
+def iter_batches(path: Path, batch_size: int) -> Iterator[pd.DataFrame]:
+    """
+    Yield DataFrames of at most batch_size rows from a CSV or Parquet file.
+    """
+    suffix = path.suffix.lower()
+    if suffix in (".parquet", ".pq"):
+        import pyarrow.parquet as pq
+
+        parquet_file = pq.ParquetFile(path)
+        for record_batch in parquet_file.iter_batches(batch_size=batch_size):
+            yield record_batch.to_pandas()
+    elif suffix in (".csv", ".gz", ".txt"):
+        yield from pd.read_csv(path, chunksize=batch_size, dtype={"ticker": "string"})
+    else:
+        raise ValueError(f"Unsupported file type: {path}")
+
+
+def validate_batch(
+    frame: pd.DataFrame, known_tickers: Set[str], stats: LoadStats
+) -> pd.DataFrame:
+    """
+    Coerce a raw batch to the DailyPrice column types and drop invalid rows.
+
+    All checks are vectorized over the whole batch; rejected rows are counted
+    in stats by reason.
+    """
+    missing = [name for name in KEY_COLUMNS if name not in frame.columns]
+    if missing:
+        raise ValueError(f"Missing required columns: {', '.join(missing)}")
+
+    out = pd.DataFrame(index=frame.index)
+    valid = np.ones(len(frame), dtype=bool)
+
+    # --- Primary key columns ---
+    out["time"] = pd.to_datetime(frame["time"], utc=True, errors="coerce")
+    bad_time = out["time"].isna().to_numpy()
+    stats.reject("invalid_time", (bad_time & valid).sum())
+    valid &= ~bad_time
+
+    out["ticker"] = frame["ticker"].astype("string").str.strip()
+    bad_ticker = (
+        out["ticker"].isna() | (out["ticker"].str.len() > TICKER_MAX_LENGTH)
+    ).fillna(True).to_numpy(dtype=bool)
+    stats.reject("invalid_ticker", (bad_ticker & valid).sum())
+    valid &= ~bad_ticker
+
+    unknown = ~out["ticker"].isin(known_tickers).fillna(False).to_numpy(dtype=bool)
+    stats.reject("unknown_ticker", (unknown & valid).sum())
+    valid &= ~unknown
+
+    # --- Value columns ---
+    for name in VALUE_COLUMNS:
+        column = DailyPrice.__table__.c[name]
+        if name not in frame.columns:
+            out[name] = pd.Series(pd.NA, index=frame.index, dtype="Float64")
+            continue
+
+        raw = frame[name]
+        values = pd.to_numeric(raw, errors="coerce")
+        # Values that were present but could not be parsed are rejected
+        unparsable = (values.isna() & raw.notna()).to_numpy(dtype=bool)
+        numbers = values.to_numpy(dtype="float64", na_value=np.nan)
+
+        if isinstance(column.type, BigInteger):
+            out_of_range = np.isinf(numbers) | (np.abs(np.nan_to_num(numbers)) >= 2**63)
+            out_of_range |= np.isfinite(numbers) & (numbers != np.round(numbers))
+        else:
+            bound = _numeric_bound(column)
+            out_of_range = np.isinf(numbers)
+            if bound is not None:
+                out_of_range |= np.abs(np.nan_to_num(numbers)) >= bound
+
+        bad = unparsable | out_of_range
+        values = values.astype("float64").mask(bad)
+        if isinstance(column.type, BigInteger):
+            values = values.astype("Int64")
+        stats.reject(f"invalid_{name}", (bad & valid).sum())
+        valid &= ~bad
+        out[name] = values
+
+    out = out[valid]
+
+    # Later rows win over earlier duplicates of the same (time, ticker)
+    duplicated = out.duplicated(subset=KEY_COLUMNS, keep="last")
+    stats.reject("duplicate_in_file", duplicated.sum())
+    return out[~duplicated][COLUMNS]
+
+
+def partition_batch(frame: pd.DataFrame, workers: int, split_by: str) -> List[pd.DataFrame]:
+    """
+    Split a validated batch into independent partitions for the workers.
+
+    Splitting by ticker keeps each ticker's rows together; splitting by time
+    groups rows by calendar month so that each partition lands in few
+    hypertable chunks.
+    """
+    if frame.empty:
+        return []
+    if split_by == "ticker":
+        codes = pd.util.hash_array(frame["ticker"].to_numpy(dtype=object)) % workers
+    else:
+        codes = frame["time"].dt.tz_convert(None).dt.to_period("M").astype(str).to_numpy()
+    return [part for _, part in frame.groupby(codes, sort=False)]
+
+
+# --- Worker process ---
+
+_worker_connection = None
+
+
+def _init_worker() -> None:
+    """Open one raw DBAPI connection per worker process."""
+    global _worker_connection
+    # Connections inherited from the parent must not be shared after fork
+    engine.dispose(close=False)
+    _worker_connection = engine.raw_connection()
+
+
+def _copy_partition(frame: pd.DataFrame, mode: str) -> int:
+    """
+    Write one partition with COPY and return the number of rows sent.
+
+    mode "copy" streams straight into daily_prices and fails on existing keys;
+    "upsert" and "skip" COPY into a temporary stage table and merge it with
+    ON CONFLICT DO UPDATE / DO NOTHING.
+    """
+    buffer = io.StringIO()
+    frame.to_csv(buffer, index=False, header=False, date_format="%Y-%m-%d %H:%M:%S.%f%z")
+    buffer.seek(0)
+
+    column_list = ", ".join(COLUMNS)
+    cursor = _worker_connection.cursor()
+    try:
+        if mode == "copy":
+            cursor.copy_expert(COPY_SQL.format(table="daily_prices", columns=column_list), buffer)
+        else:
+            cursor.execute(STAGE_SQL.format(stage=STAGE_TABLE))
+            cursor.copy_expert(COPY_SQL.format(table=STAGE_TABLE, columns=column_list), buffer)
+            if mode == "upsert":
+                assignments = ", ".join(f"{name} = EXCLUDED.{name}" for name in VALUE_COLUMNS)
+                action = f"UPDATE SET {assignments}"
+            else:
+                action = "NOTHING"
+            cursor.execute(UPSERT_SQL.format(columns=column_list, stage=STAGE_TABLE, action=action))
+        _worker_connection.commit()
+    except Exception:
+        _worker_connection.rollback()
+        raise
+    finally:
+        cursor.close()
+    return len(frame)
+
+
+# --- Driver ---
+
+
+def load_known_tickers() -> Set[str]:
+    """Fetch every ticker in the securities table with a single query."""
+    db = SessionLocal()
+    try:
+        return set(db.execute(text("SELECT ticker FROM securities")).scalars())
+    finally:
+        db.close()
+
+
+def update_latest_prices(oldest_loaded: Dict[str, pd.Timestamp], days_loaded: Set[pd.Timestamp]) -> None:
+    """
+    Merge the newest loaded row of every touched ticker into latest_prices
+    with one set-based statement, looking at each ticker's rows from the
+    oldest one loaded for it on, and bump the price versions of the tickers
+    and of the loaded days (given by their UTC midnights) so HTTP
+    validators and market movers rankings of every API process change.
+    """
+    if not oldest_loaded:
+        return
+    db = SessionLocal()
+    try:
+        since = {ticker: oldest.to_pydatetime() for ticker, oldest in oldest_loaded.items()}
+        refresh_latest_prices(db, since.keys(), since=since)
+        bump_price_versions(db, since.keys(), times=[day.to_pydatetime() for day in days_loaded])
+        db.commit()
+    finally:
+        db.close()
+
+
+def load_files(
+    paths: List[Path],
+    workers: int = 4,
+    split_by: str = "ticker",
+    mode: str = "copy",
+    batch_size: int = 200_000,
+) -> LoadStats:
+    """
+    Load files into daily_prices using a pool of COPY workers.
+
+    At most two partitions per worker are kept in flight so memory stays
+    bounded regardless of file size. latest_prices and the price versions
+    are updated for the loaded tickers at the end, also when the load fails
+    after committing some partitions.
+    """
+    stats = LoadStats()
+    known_tickers = load_known_tickers()
+    logger.info(f"Loaded {len(known_tickers)} known tickers")
+
+    started = time_module.perf_counter()
+    max_in_flight = workers * 2
+    in_flight = set()
+    oldest_loaded: Dict[str, pd.Timestamp] = {}
+    days_loaded: Set[pd.Timestamp] = set()
+
+    def drain(block_until: int) -> None:
+        nonlocal in_flight
+        while len(in_flight) > block_until:
+            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                stats.rows_loaded += future.result()
+            elapsed = time_module.perf_counter() - started
+            logger.info(
+                f"{stats.rows_loaded:,} rows loaded "
+                f"({stats.rows_loaded / max(elapsed, 1e-9):,.0f} rows/s)"
+            )
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+            for path in paths:
+                logger.info(f"Reading {path}")
+                for raw in iter_batches(path, batch_size):
+                    stats.rows_read += len(raw)
+                    batch = validate_batch(raw, known_tickers, stats)
+                    for ticker, oldest in batch.groupby("ticker")["time"].min().items():
+                        if ticker not in oldest_loaded or oldest < oldest_loaded[ticker]:
+                            oldest_loaded[ticker] = oldest
+                    days_loaded.update(batch["time"].dt.floor("D").unique())
+                    for partition in partition_batch(batch, workers, split_by):
+                        drain(max_in_flight - 1)
+                        in_flight.add(executor.submit(_copy_partition, partition, mode))
+            drain(0)
+    finally:
+        # Partitions committed before a failure are visible to readers
+        update_latest_prices(oldest_loaded, days_loaded)
+
+    elapsed = time_module.perf_counter() - started
+    logger.info(
+        f"Done: {stats.rows_loaded:,} rows loaded, {stats.rows_rejected:,} rejected "
+        f"in {elapsed:.1f}s ({stats.rows_loaded / max(elapsed, 1e-9):,.0f} rows/s)"
+    )
+    for reason, count in sorted(stats.rejected.items()):
+        logger.info(f"  rejected {reason}: {count:,}")
+    return stats
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Bulk load daily prices with COPY")
+    parser.add_argument("files", nargs="+", type=Path, help="CSV or Parquet files to load")
+    parser.add_argument("--workers", type=int, default=4, help="Number of COPY worker processes")
+    parser.add_argument(
+        "--split-by", choices=SPLIT_CHOICES, default="ticker",
+        help="Partition rows across workers by ticker or by monthly time chunk",
+    )
+    parser.add_argument(
+        "--mode", choices=MODE_CHOICES, default="copy",
+        help="copy: plain COPY (fails on duplicates); upsert: update existing rows; "
+             "skip: keep existing rows",
+    )
+    parser.add_argument("--batch-size", type=int, default=200_000, help="Rows validated per batch")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+    load_files(
+        args.files,
+        workers=args.workers,
+        split_by=args.split_by,
+        mode=args.mode,
+        batch_size=args.batch_size,
+    )
+
+
+if __name__ == "__main__":
+    main()
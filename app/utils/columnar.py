@@ -0,0 +1,21 @@
+from datetime import datetime
+from typing import Any, Dict, List, Sequence
+
+
+def rows_to_columns(rows: Sequence[Sequence[Any]], names: Sequence[str]) -> Dict[str, List[Any]]:
+    """
+    Transpose result tuples into one list per column (struct of arrays).
+
+    Datetime columns are converted to ISO 8601 strings so the result can be
+    passed straight to a JSON response.
+    """
+    if not rows:
+        return {name: [] for name in names}
+
+    columns = {}
+    for name, values in zip(names, zip(*rows)):
+        if isinstance(values[0], datetime):
+            columns[name] = [value.isoformat() for value in values]
+        else:
+            columns[name] = list(values)
+    return columns
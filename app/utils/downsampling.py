@@ -0,0 +1,133 @@
+from datetime import datetime
+from typing import Any, List, Optional, Sequence
+
+import numpy as np
+
+
+def _bucket_edges(n: int, buckets: int) -> np.ndarray:
+    """
+    Split the inner points 1..n-2 into equally sized buckets.
+    Returns buckets + 1 edges; bucket i covers [edges[i], edges[i + 1]).
+    """
+    return np.linspace(1, n - 1, buckets + 1).astype(np.int64)
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, max_points: int) -> np.ndarray:
+    """
+    Select at most max_points indices with Largest-Triangle-Three-Buckets.
+
+    The first and last points are always kept. For every bucket the point
+    forming the largest triangle with the previously selected point and the
+    average of the next bucket is chosen. Bucket averages are computed for
+    all buckets at once; the remaining loop runs once per bucket, not per row.
+    NaN values are never selected unless a bucket has nothing else.
+    """
+    n = len(x)
+    if max_points >= n:
+        return np.arange(n)
+    if max_points < 3:
+        # No room for inner buckets: the first and last points only
+        return np.array([0, n - 1][:max(max_points, 0)], dtype=np.int64)
+
+    buckets = max_points - 2
+    edges = _bucket_edges(n, buckets)
+    valid = ~np.isnan(y)
+    y_filled = np.where(valid, y, 0.0)
+
+    # Average point of every bucket, plus the last point as a final "bucket"
+    counts = np.add.reduceat(valid.astype(np.float64), edges[:-1])
+    sums_x = np.add.reduceat(np.where(valid, x, 0.0), edges[:-1])
+    sums_y = np.add.reduceat(y_filled, edges[:-1])
+    with np.errstate(invalid="ignore", divide="ignore"):
+        avg_x = np.append(sums_x / counts, x[-1])
+        avg_y = np.append(sums_y / counts, y_filled[-1])
+    # Buckets without valid values fall back to their positional midpoint
+    empty = np.append(counts == 0, False)
+    mid = np.append((edges[:-1] + edges[1:] - 1) // 2, n - 1)
+    avg_x[empty] = x[mid[empty]]
+    avg_y[empty] = y_filled[mid[empty]]
+
+    selected = np.empty(max_points, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    a = 0
+    for i in range(buckets):
+        start, stop = edges[i], edges[i + 1]
+        bx = x[start:stop]
+        by = y_filled[start:stop]
+        area = np.abs(
+            (x[a] - avg_x[i + 1]) * (by - y_filled[a])
+            - (x[a] - bx) * (avg_y[i + 1] - y_filled[a])
+        )
+        area[~valid[start:stop]] = -1.0
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+def minmax_indices(x: np.ndarray, y: np.ndarray, max_points: int) -> np.ndarray:
+    """
+    Select at most max_points indices keeping the minimum and maximum of each
+    bucket, plus the first and last points. Fully vectorized.
+    Below 4 points there is no room for a min/max pair, so LTTB picks them.
+    """
+    n = len(x)
+    if max_points >= n:
+        return np.arange(n)
+    if max_points < 4:
+        return lttb_indices(x, y, max_points)
+
+    buckets = (max_points - 2) // 2
+    edges = _bucket_edges(n, buckets)
+    inner = np.arange(1, n - 1)
+    bucket_ids = np.searchsorted(edges, inner, side="right") - 1
+    starts = edges[:-1] - 1
+    ends = edges[1:] - 1
+
+    # Sorting by (bucket, value) puts each bucket's min first and max last
+    low_order = np.lexsort((np.where(np.isnan(y[inner]), np.inf, y[inner]), bucket_ids))
+    high_order = np.lexsort((np.where(np.isnan(y[inner]), -np.inf, y[inner]), bucket_ids))
+    non_empty = ends > starts
+    mins = inner[low_order[starts[non_empty]]]
+    maxs = inner[high_order[ends[non_empty] - 1]]
+
+    return np.unique(np.concatenate(([0, n - 1], mins, maxs)))
+
+
+def downsample_indices(
+    times: Sequence[datetime],
+    values: Sequence[Optional[float]],
+    max_points: int,
+    method: str = "lttb",
+) -> np.ndarray:
+    """
+    Pick the indices of at most max_points rows that preserve the visual shape
+    of a time series, using "lttb" or "minmax" downsampling.
+    """
+    x = np.fromiter((time.timestamp() for time in times), dtype=np.float64, count=len(times))
+    y = np.array(values, dtype=np.float64)
+    if method == "minmax":
+        return minmax_indices(x, y, max_points)
+    return lttb_indices(x, y, max_points)
+
+
+def downsample_rows(
+    rows: List[Any],
+    max_points: Optional[int],
+    method: str = "lttb",
+    value_attr: str = "close_price",
+) -> List[Any]:
+    """
+    Downsample query rows (ORM objects or result rows with a time attribute)
+    to at most max_points, using value_attr as the series value.
+    Rows are returned in their original order.
+    """
+    if not max_points or len(rows) <= max_points:
+        return rows
+    indices = downsample_indices(
+        [row.time for row in rows],
+        [getattr(row, value_attr) for row in rows],
+        max_points,
+        method,
+    )
+    return [rows[i] for i in indices]
@@ -0,0 +1,91 @@
+import csv
+import io
+import json
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Iterable, Iterator, Sequence
+
+from app.core.database import SessionLocal
+from app.crud import daily_prices as daily_prices_crud
+from app.models.daily_prices import DailyPrice
+
+# Column order of exported rows, same as the daily_prices table
+EXPORT_COLUMNS = [column.name for column in DailyPrice.__table__.columns]
+
+# Number of rows encoded before a chunk is handed to the response
+ROWS_PER_CHUNK = 500
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def _to_json_value(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def iter_ndjson(rows: Iterable[Sequence[Any]], columns: Sequence[str] = EXPORT_COLUMNS) -> Iterator[bytes]:
+    """
+    Encode rows as newline-delimited JSON, one object per row.
+    """
+    lines = []
+    for row in rows:
+        lines.append(json.dumps(
+            {name: _to_json_value(value) for name, value in zip(columns, row)},
+            separators=(",", ":"),
+        ))
+        if len(lines) >= ROWS_PER_CHUNK:
+            yield ("\n".join(lines) + "\n").encode("utf-8")
+            lines = []
+    if lines:
+        yield ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def iter_csv(rows: Iterable[Sequence[Any]], columns: Sequence[str] = EXPORT_COLUMNS) -> Iterator[bytes]:
+    """
+    Encode rows as CSV with a header line.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(columns)
+
+    count = 0
+    for row in rows:
+        writer.writerow(
+            value.isoformat() if isinstance(value, datetime) else value for value in row
+        )
+        count += 1
+        if count >= ROWS_PER_CHUNK:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+            count = 0
+    yield buffer.getvalue().encode("utf-8")
+
+
+def stream_daily_prices_by_time_range(
+    ticker: str,
+    time_range: str,
+    limit: int,
+    export_format: str,
+) -> Iterator[bytes]:
+    """
+    Stream encoded daily prices for a ticker and time range.
+
+    The generator owns its database session so that it stays open while the
+    response body is being sent, after request dependencies have finished.
+    """
+    encode = iter_ndjson if export_format == "ndjson" else iter_csv
+    db = SessionLocal()
+    try:
+        rows = daily_prices_crud.iter_daily_prices_by_time_range(
+            db=db, ticker=ticker, time_range=time_range, limit=limit
+        )
+        yield from encode(rows)
+    finally:
+        db.close()
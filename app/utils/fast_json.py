@@ -0,0 +1,136 @@
+import operator
+from typing import Any, Callable, Dict, List, Optional, Sequence, Type, get_args
+
+import orjson
+from fastapi import Response
+from pydantic import BaseModel
+
+from app.schemas.daily_prices import ExtendedDailyPriceList, ExtendedDailyPriceResponse
+from app.schemas.securities import SecuritiesList, SecuritiesResponse
+from app.utils.http_cache import model_response
+
+# pydantic writes floats from 1e16 up with a signed exponent ("1e+16") and
+# orjson without ("1e16"); payloads holding such values take the pydantic
+# path so the bytes never differ
+_PLAIN_FLOAT_LIMIT = 1e16
+
+# Computed columns from the converted field columns, by output name
+ComputedColumns = Dict[str, Callable[[Dict[str, List[Any]]], List[Any]]]
+
+
+def _is_float_field(annotation: Any) -> bool:
+    """Whether a field is float or Optional[float]."""
+    return annotation is float or float in get_args(annotation)
+
+
+def _to_floats(values: Sequence[Any]) -> List[Optional[float]]:
+    """float() every value (e.g. Decimal from Numeric columns), keeping None."""
+    try:
+        return list(map(float, values))
+    except TypeError:
+        return [None if value is None else float(value) for value in values]
+
+
+class ListSerializer:
+    """
+    Encodes list responses of a response model with orjson, producing the
+    same bytes as model_response but without building a model per row.
+
+    Rows (result tuples or ORM objects) are read with one attrgetter per
+    row, transposed to columns, float fields are converted once per column
+    (Decimal from Numeric columns becomes float, as pydantic does) and the
+    computed fields of the item model are evaluated column-wise. Field and
+    computed field order is taken from the models, so it follows schema
+    changes; a computed field without a column function is an error at
+    import time.
+    """
+
+    def __init__(
+        self,
+        list_model: Type[BaseModel],
+        item_model: Type[BaseModel],
+        computed: Optional[ComputedColumns] = None,
+    ):
+        computed = computed or {}
+        if list(computed) != list(item_model.model_computed_fields):
+            raise ValueError(f"Column functions must match the computed fields of {item_model.__name__}")
+        self.list_model = list_model
+        self.item_model = item_model
+        self.computed = computed
+        self.fields = list(item_model.model_fields)
+        self.keys = self.fields + list(computed)
+        self.float_fields = {
+            name for name, field in item_model.model_fields.items() if _is_float_field(field.annotation)
+        }
+        self._getter = operator.attrgetter(*self.fields)
+
+    def _columns(self, rows: Sequence[Any]) -> Optional[List[List[Any]]]:
+        """Output columns in key order, or None if a value needs the pydantic path."""
+        if getattr(rows[0], "_fields", None) == tuple(self.fields):
+            # Result rows already in field order
+            fields = list(zip(*rows))
+        else:
+            fields = list(zip(*map(self._getter, rows)))
+
+        columns: Dict[str, List[Any]] = {}
+        for name, values in zip(self.fields, fields):
+            if name in self.float_fields:
+                values = _to_floats(values)
+            columns[name] = values
+        for name, compute in self.computed.items():
+            columns[name] = compute(columns)
+
+        for name in self.float_fields.union(self.computed):
+            # filter(None, ...) skips None and zero, neither of which matters here
+            if max(map(abs, filter(None, columns[name])), default=0.0) >= _PLAIN_FLOAT_LIMIT:
+                return None
+        return [columns[name] for name in self.keys]
+
+    def response(self, payload: Dict[str, Any]) -> Response:
+        """
+        Encode payload ({"items": rows, ...other list fields}) like
+        model_response(list_model, payload) would.
+        """
+        rows = payload["items"]
+        items: List[Dict[str, Any]] = []
+        if rows:
+            columns = self._columns(rows)
+            if columns is None:
+                return model_response(self.list_model, payload)
+            keys = self.keys
+            items = [dict(zip(keys, values)) for values in zip(*columns)]
+
+        document = {}
+        for name, field in self.list_model.model_fields.items():
+            document[name] = items if name == "items" else payload.get(name, field.default)
+        body = orjson.dumps(document, option=orjson.OPT_UTC_Z)
+        return Response(content=body, media_type="application/json")
+
+
+def _percent_change_points(columns: Dict[str, List[Any]]) -> List[Optional[float]]:
+    return [None if value is None else value * 100 for value in columns["percent_change"]]
+
+
+def _total_value(columns: Dict[str, List[Any]]) -> List[Optional[float]]:
+    return [
+        volume * close if volume is not None and close is not None else None
+        for volume, close in zip(columns["volume"], columns["close_price"])
+    ]
+
+
+# Mirrors the computed fields of ExtendedDailyPriceResponse
+DAILY_PRICE_LIST_JSON = ListSerializer(
+    ExtendedDailyPriceList,
+    ExtendedDailyPriceResponse,
+    computed={
+        "change": _percent_change_points,
+        "currentPrice": lambda columns: columns["close_price"],
+        "openPrice": lambda columns: columns["open_price"],
+        "highPrice": lambda columns: columns["high_price"],
+        "lowPrice": lambda columns: columns["low_price"],
+        "totalVolume": lambda columns: columns["volume"],
+        "totalValue": _total_value,
+    },
+)
+
+SECURITIES_LIST_JSON = ListSerializer(SecuritiesList, SecuritiesResponse)
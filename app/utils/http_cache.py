@@ -0,0 +1,129 @@
+import hashlib
+from typing import Any, Awaitable, Callable, Hashable, Iterable, Optional, Type
+
+from fastapi import Response
+from pydantic import BaseModel
+
+from app.core.cache import response_cache
+from app.core.config import settings
+
+# Headers that are recomputed for every response and must not be replayed
+_VOLATILE_HEADERS = {"content-length"}
+
+
+def model_response(model: Type[BaseModel], payload: Any) -> Response:
+    """
+    Validate payload against a response model and return it as an encoded
+    JSON response, so the body can be cached as bytes.
+    """
+    body = model.model_validate(payload, from_attributes=True).model_dump_json()
+    return Response(content=body, media_type="application/json")
+
+
+def _cached_response(key: Hashable) -> Optional[Response]:
+    """Rebuild a cached response, or return None on a miss."""
+    cached = response_cache.get(key)
+    if cached is None:
+        return None
+    body, media_type, headers = cached
+    return Response(content=body, media_type=media_type, headers=headers)
+
+
+def _store_response(key: Hashable, tags: Iterable[str], response: Response, generation: int) -> None:
+    """Cache a successful response as encoded bytes."""
+    if response.status_code == 200:
+        headers = {
+            name: value for name, value in response.headers.items()
+            if name not in _VOLATILE_HEADERS and name != "content-type"
+        }
+        response_cache.set(
+            key,
+            (response.body, response.media_type, headers),
+            tags=tags,
+            weight=len(response.body),
+            generation=generation,
+        )
+
+
+def respond_cached(
+    key: Hashable,
+    tags: Iterable[str],
+    build: Callable[[], Response],
+) -> Response:
+    """
+    Return the cached response for key, or build it and cache it.
+
+    Responses are stored as encoded bytes tagged by ticker, so writes through
+    the CRUD layer can invalidate them (see app.core.cache.invalidate_tickers).
+    Only successful responses are cached; errors raised by build propagate.
+    """
+    if not settings.RESPONSE_CACHE_ENABLED:
+        return build()
+
+    cached = _cached_response(key)
+    if cached is not None:
+        return cached
+
+    generation = response_cache.generation
+    response = build()
+    _store_response(key, tags, response, generation)
+    return response
+
+
+async def respond_cached_async(
+    key: Hashable,
+    tags: Iterable[str],
+    build: Callable[[], Awaitable[Response]],
+) -> Response:
+    """
+    Same as respond_cached for async routes, where build is a coroutine function.
+    """
+    if not settings.RESPONSE_CACHE_ENABLED:
+        return await build()
+
+    cached = _cached_response(key)
+    if cached is not None:
+        return cached
+
+    generation = response_cache.generation
+    response = await build()
+    _store_response(key, tags, response, generation)
+    return response
+
+
+def make_etag(*parts: Any) -> str:
+    """
+    Build a strong ETag from the request variant and a data watermark.
+    """
+    digest = hashlib.blake2b(repr(parts).encode("utf-8"), digest_size=12).hexdigest()
+    return f'"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Whether an If-None-Match header matches etag. The comparison is weak,
+    as RFC 9110 requires for If-None-Match: W/ prefixes are ignored.
+    """
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def not_modified(etag: str) -> Response:
+    """304 response for a matching If-None-Match, without a body."""
+    return Response(status_code=304, headers={"ETag": etag})
+
+
+def with_etag(response: Response, etag: str) -> Response:
+    """Attach etag to a response if it succeeded."""
+    if response.status_code == 200:
+        response.headers["ETag"] = etag
+    return response
@@ -0,0 +1,103 @@
+"""
+Import an exchange listing / securities reference file.
+
+Reads a CSV, JSON or Parquet file with SecuritiesCreate columns (ticker and
+company_name required), validates every row and upserts the valid ones in
+a single transaction, like POST /securities/batch: existing tickers are
+overwritten and rows whose ISIN belongs to another security are reported.
+
+Usage:
+    python -m app.utils.import_securities listings/hose.csv
+"""
+import argparse
+import logging
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+from pydantic import ValidationError
+
+from app.core.database import SessionLocal
+from app.crud import securities as securities_crud
+from app.schemas.securities import SecuritiesCreate
+
+logger = logging.getLogger(__name__)
+
+
+def read_rows(path: Path) -> List[Dict[str, Any]]:
+    """Rows of a CSV, JSON or Parquet file as dicts, missing values as None."""
+    suffix = path.suffix.lower()
+    if suffix in (".parquet", ".pq"):
+        frame = pd.read_parquet(path)
+    elif suffix == ".json":
+        frame = pd.read_json(path, dtype=False)
+    elif suffix in (".csv", ".gz", ".txt"):
+        # Keep codes such as "000001" as written; pydantic parses the numbers
+        frame = pd.read_csv(path, dtype=str)
+    else:
+        raise ValueError(f"Unsupported file type: {path}")
+    frame = frame.astype(object).where(frame.notna(), None)
+    return frame.to_dict(orient="records")
+
+
+def validate_rows(rows: List[Dict[str, Any]]) -> Tuple[List[SecuritiesCreate], List[Tuple[int, str]]]:
+    """Valid rows as SecuritiesCreate, and (row number, error) for the others."""
+    fields = SecuritiesCreate.model_fields
+    securities = []
+    invalid = []
+    for number, row in enumerate(rows, start=1):
+        try:
+            securities.append(SecuritiesCreate(**{key: value for key, value in row.items() if key in fields}))
+        except ValidationError as e:
+            invalid.append((number, "; ".join(
+                f"{'.'.join(map(str, error['loc']))}: {error['msg']}" for error in e.errors()
+            )))
+    return securities, invalid
+
+
+def import_securities(path: Path) -> Optional[Dict[str, Any]]:
+    """Validate and upsert one file; returns the SecuritiesBatchResult counts."""
+    started = time.perf_counter()
+    securities, invalid = validate_rows(read_rows(path))
+    for number, error in invalid:
+        logger.warning(f"Row {number}: {error}")
+    if not securities:
+        logger.error(f"No valid rows in {path}")
+        return None
+
+    db = SessionLocal()
+    try:
+        result = securities_crud.upsert_securities(db, securities)
+    finally:
+        db.close()
+
+    # Conflict indexes are positions among the valid rows
+    for conflict in result["conflicts"]:
+        logger.warning(
+            f"{conflict['ticker']}: ISIN {conflict['isin_code']} is held by "
+            f"{conflict['conflicting_ticker']} ({conflict['reason']})"
+        )
+    logger.info(
+        f"{path}: {result['inserted']} inserted, {result['updated']} updated, "
+        f"{result['duplicates']} duplicates, {result['rejected']} ISIN conflicts, "
+        f"{len(invalid)} invalid rows in {time.perf_counter() - started:.2f}s"
+    )
+    return result
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Import a securities reference file")
+    parser.add_argument("files", nargs="+", type=Path, help="CSV, JSON or Parquet files to import")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+    for path in args.files:
+        import_securities(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,271 @@
+import re
+from typing import Callable, Dict, Hashable, List, Optional, Sequence
+
+import numpy as np
+
+# Largest window accepted for a single indicator
+MAX_PERIOD = 500
+
+# Default MACD periods (fast EMA, slow EMA, signal EMA)
+MACD_PERIODS = (12, 26, 9)
+
+# Width of the Bollinger bands in standard deviations
+BOLLINGER_WIDTH = 2.0
+
+# Smallest decay factor accumulated inside one EMA block; bounds the scale
+# of the rescaled inputs so the block-wise cumulative sum stays accurate
+_EMA_BLOCK_DECAY = 1e-8
+
+_INDICATOR_PATTERN = re.compile(r"^(sma|ema|rsi|bb|atr)(\d+)$|^macd$")
+
+
+def parse_indicator_set(spec: str) -> List[str]:
+    """
+    Parse a comma separated indicator set such as "sma20,ema50,rsi14,macd".
+    Duplicates are dropped, order is kept. Raises ValueError for unknown names.
+    """
+    names = []
+    for name in spec.split(","):
+        name = name.strip().lower()
+        if not name:
+            continue
+        match = _INDICATOR_PATTERN.match(name)
+        if not match:
+            raise ValueError(f"Unknown indicator {name!r}")
+        if match.group(2) is not None:
+            period = int(match.group(2))
+            if not 1 <= period <= MAX_PERIOD:
+                raise ValueError(f"Period of {name!r} must be between 1 and {MAX_PERIOD}")
+        if name not in names:
+            names.append(name)
+    if not names:
+        raise ValueError("No indicator requested")
+    return names
+
+
+def warmup_rows(names: Sequence[str]) -> int:
+    """
+    Number of rows to load before the first returned row so that every
+    indicator has converged: windows need their length, EMAs four spans and
+    Wilder averages (RSI, ATR) ten periods.
+    """
+    rows = 0
+    for name in names:
+        match = _INDICATOR_PATTERN.match(name)
+        if name == "macd":
+            fast, slow, signal = MACD_PERIODS
+            needed = 4 * slow + 4 * signal
+        else:
+            kind, period = match.group(1), int(match.group(2))
+            needed = {"sma": period, "bb": period, "ema": 4 * period}.get(kind, 10 * period)
+        rows = max(rows, needed)
+    return rows
+
+
+def _forward_fill(values: np.ndarray) -> np.ndarray:
+    """Replace NaN with the last valid value; leading NaN are kept."""
+    valid = ~np.isnan(values)
+    if valid.all():
+        return values
+    index = np.where(valid, np.arange(len(values)), 0)
+    np.maximum.accumulate(index, out=index)
+    filled = values[index]
+    filled[: np.argmax(valid) if valid.any() else len(values)] = np.nan
+    return filled
+
+
+def _first_valid(values: np.ndarray) -> int:
+    """Index of the first non-NaN value, or len(values) if there is none."""
+    valid = ~np.isnan(values)
+    return int(np.argmax(valid)) if valid.any() else len(values)
+
+
+def _recursive_average(values: np.ndarray, alpha: float, period: int) -> np.ndarray:
+    """
+    Exponential average y[t] = (1 - alpha) * y[t - 1] + alpha * x[t], seeded
+    with the simple mean of the first period valid values.
+    Values after the first valid one must not be NaN.
+
+    The recursion is evaluated block-wise: inside a block of length B
+    y[s + k] = d^(k+1) * y[s - 1] + alpha * d^k * cumsum(x[s + j] / d^j),
+    with d = 1 - alpha, so each block is a handful of vector operations. B is
+    chosen so that d^B stays above _EMA_BLOCK_DECAY.
+    """
+    n = len(values)
+    result = np.full(n, np.nan)
+    first = _first_valid(values)
+    seed = first + period - 1
+    if seed >= n:
+        return result
+    result[seed] = values[first : seed + 1].mean()
+
+    decay = 1.0 - alpha
+    if decay <= 0.0:
+        result[seed + 1 :] = values[seed + 1 :]
+        return result
+
+    block = max(1, int(np.log(_EMA_BLOCK_DECAY) / np.log(decay)))
+    powers = decay ** np.arange(min(block, n))
+    previous = result[seed]
+    start = seed + 1
+    while start < n:
+        stop = min(start + block, n)
+        scale = powers[: stop - start]
+        weighted = np.cumsum(values[start:stop] / scale)
+        result[start:stop] = scale * (decay * previous + alpha * weighted)
+        previous = result[stop - 1]
+        start = stop
+    return result
+
+
+class IndicatorContext:
+    """
+    Price arrays of one series (oldest first) and the intermediate results
+    computed from them.
+
+    Intermediates such as rolling means, EMAs and true ranges are memoized,
+    so indicators requested together share them: sma20 and bb20 use the same
+    rolling mean, macd reuses ema12/ema26 when those are requested as well.
+    """
+
+    def __init__(
+        self,
+        close: np.ndarray,
+        high: Optional[np.ndarray] = None,
+        low: Optional[np.ndarray] = None,
+    ):
+        self.close = _forward_fill(np.asarray(close, dtype=np.float64))
+        self.high = self.close if high is None else _forward_fill(np.asarray(high, dtype=np.float64))
+        self.low = self.close if low is None else _forward_fill(np.asarray(low, dtype=np.float64))
+        self._memo: Dict[Hashable, np.ndarray] = {}
+
+    def _cached(self, key: Hashable, compute: Callable[[], np.ndarray]) -> np.ndarray:
+        result = self._memo.get(key)
+        if result is None:
+            result = self._memo[key] = compute()
+        return result
+
+    def _windows(self, period: int) -> np.ndarray:
+        """Rolling windows of close as a strided view, one row per full window."""
+        return self._cached(
+            ("windows", period),
+            lambda: np.lib.stride_tricks.sliding_window_view(self.close, period),
+        )
+
+    def sma(self, period: int) -> np.ndarray:
+        """Simple moving average of close, from a cumulative sum."""
+        def compute() -> np.ndarray:
+            result = np.full(len(self.close), np.nan)
+            # Leading NaN (the only ones left after filling) would spread
+            # through the whole cumulative sum
+            first = _first_valid(self.close)
+            if first + period <= len(self.close):
+                sums = np.cumsum(np.insert(self.close[first:], 0, 0.0))
+                result[first + period - 1 :] = (sums[period:] - sums[:-period]) / period
+            return result
+        return self._cached(("sma", period), compute)
+
+    def rolling_std(self, period: int) -> np.ndarray:
+        """Population standard deviation of close over each window, around sma."""
+        def compute() -> np.ndarray:
+            result = np.full(len(self.close), np.nan)
+            if period <= len(self.close):
+                mean = self.sma(period)[period - 1 :]
+                deviations = self._windows(period) - mean[:, None]
+                result[period - 1 :] = np.sqrt((deviations * deviations).mean(axis=1))
+            return result
+        return self._cached(("std", period), compute)
+
+    def ema(self, period: int, values: Optional[np.ndarray] = None, key: Hashable = "close") -> np.ndarray:
+        """Exponential moving average (alpha = 2 / (period + 1)) of close or of values."""
+        source = self.close if values is None else values
+        return self._cached(
+            ("ema", key, period),
+            lambda: _recursive_average(source, 2.0 / (period + 1), period),
+        )
+
+    def wilder(self, period: int, values: np.ndarray, key: Hashable) -> np.ndarray:
+        """Wilder's smoothing (alpha = 1 / period) of values."""
+        return self._cached(
+            ("wilder", key, period),
+            lambda: _recursive_average(values, 1.0 / period, period),
+        )
+
+    def price_change(self) -> np.ndarray:
+        """close[t] - close[t - 1]; NaN for the first row."""
+        return self._cached(
+            "price_change",
+            lambda: np.concatenate(([np.nan], np.diff(self.close))),
+        )
+
+    def true_range(self) -> np.ndarray:
+        """max(high - low, |high - previous close|, |low - previous close|)."""
+        def compute() -> np.ndarray:
+            previous_close = np.concatenate(([np.nan], self.close[:-1]))
+            ranges = np.vstack((
+                self.high - self.low,
+                np.abs(self.high - previous_close),
+                np.abs(self.low - previous_close),
+            ))
+            # The first row has no previous close; fmax skips the NaN ranges
+            return np.fmax.reduce(ranges, axis=0)
+        return self._cached("true_range", compute)
+
+    def rsi(self, period: int) -> np.ndarray:
+        """Wilder's relative strength index; 50 where prices did not move at all."""
+        change = self.price_change()
+        gains = self.wilder(period, np.clip(change, 0.0, None), "gain")
+        losses = self.wilder(period, np.clip(-change, 0.0, None), "loss")
+        total = gains + losses
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(total > 0, 100.0 * gains / total, np.where(np.isnan(total), np.nan, 50.0))
+
+    def atr(self, period: int) -> np.ndarray:
+        """Average true range with Wilder's smoothing."""
+        return self.wilder(period, self.true_range(), "true_range")
+
+    def macd(self) -> Dict[str, np.ndarray]:
+        """MACD line, signal line and histogram."""
+        fast, slow, signal = MACD_PERIODS
+        line = self._cached("macd", lambda: self.ema(fast) - self.ema(slow))
+        signal_line = self.ema(signal, values=line, key="macd")
+        return {"macd": line, "macd_signal": signal_line, "macd_hist": line - signal_line}
+
+    def bollinger(self, period: int) -> Dict[str, np.ndarray]:
+        """Bollinger bands: sma(period) +/- BOLLINGER_WIDTH standard deviations."""
+        middle = self.sma(period)
+        width = BOLLINGER_WIDTH * self.rolling_std(period)
+        prefix = f"bb{period}"
+        return {f"{prefix}_upper": middle + width, f"{prefix}_middle": middle, f"{prefix}_lower": middle - width}
+
+    def compute(self, name: str) -> Dict[str, np.ndarray]:
+        """Compute one indicator of a parsed set; returns its output series by name."""
+        if name == "macd":
+            return self.macd()
+        match = _INDICATOR_PATTERN.match(name)
+        kind, period = match.group(1), int(match.group(2))
+        if kind == "bb":
+            return self.bollinger(period)
+        return {name: getattr(self, kind)(period)}
+
+
+def compute_indicators(
+    names: Sequence[str],
+    close: np.ndarray,
+    high: Optional[np.ndarray] = None,
+    low: Optional[np.ndarray] = None,
+) -> Dict[str, np.ndarray]:
+    """
+    Compute a parsed indicator set over price arrays ordered oldest first.
+    Every output has the length of close, with NaN where it is not defined.
+    """
+    context = IndicatorContext(close, high, low)
+    results: Dict[str, np.ndarray] = {}
+    for name in names:
+        results.update(context.compute(name))
+    return results
+
+
+def series_to_list(values: np.ndarray) -> List[Optional[float]]:
+    """Convert an indicator series to a JSON-ready list, NaN becoming None."""
+    return [None if value != value else value for value in values.tolist()]
@@ -0,0 +1,343 @@
+"""
+Write-behind buffer for single-row daily price writes.
+
+Rows accepted by POST /daily-prices are queued in memory and written by a
+background thread in batches of up to INGEST_BATCH_SIZE rows, at the
+latest INGEST_FLUSH_INTERVAL_MS after the oldest queued row arrived, with
+the multi-row upsert of the batch endpoint. Thousands of one-row
+transactions (each with its commit and refresh) become a few large ones.
+
+The queue is bounded: when it is full, submit waits up to the enqueue
+timeout and then raises IngestBufferFull so the route can answer 503.
+A row is only durable once its batch commits; callers that need that
+guarantee pass durable=True and wait on the returned future. Rows still
+queued when the process dies are lost.
+
+Rows were already acknowledged, so a failed batch write is not simply
+dropped. Transient errors (lost connection, pool timeout, serialization
+failure or deadlock) are retried with exponential backoff while the queue
+fills behind the flusher. Other errors split the batch in halves until
+the rows that fail on their own are found; only those are dropped,
+logged and counted in failed_rows.
+"""
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Callable, Deque, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy.exc import DBAPIError, InterfaceError, OperationalError, TimeoutError as PoolTimeoutError
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.crud import daily_prices as daily_prices_crud
+from app.crud import securities as securities_crud
+from app.schemas.daily_prices import DailyPriceCreate
+
+logger = logging.getLogger(__name__)
+
+# Writes one batch and returns the tickers of the rows it rejected
+BatchWriter = Callable[[List[DailyPriceCreate]], Set[str]]
+
+# Longest wait between two attempts of a batch write
+MAX_RETRY_BACKOFF_SECONDS = 5.0
+
+# Dropped rows named in the log line of a flush
+LOGGED_DROPPED_ROWS = 10
+
+
+class IngestBufferFull(Exception):
+    """The buffer stayed full for the whole enqueue timeout."""
+
+
+class UnknownTicker(LookupError):
+    """The ticker of a buffered row no longer exists when its batch is written."""
+
+
+def is_transient(exc: BaseException) -> bool:
+    """
+    Whether a failed write may succeed as is when retried: connection and
+    pool errors, serialization failures and deadlocks, as opposed to rows
+    the database refuses (constraint violations, out of range values).
+    """
+    if isinstance(exc, DBAPIError) and exc.connection_invalidated:
+        return True
+    return isinstance(exc, (OperationalError, InterfaceError, PoolTimeoutError))
+
+
+def write_daily_prices(rows: List[DailyPriceCreate]) -> Set[str]:
+    """
+    Upsert one batch in a single transaction. Rows whose ticker does not
+    exist (anymore) are left out, so they cannot fail the whole batch on the
+    foreign key; their tickers are returned.
+    """
+    db = SessionLocal()
+    try:
+        tickers = {row.ticker for row in rows}
+        # Ask the database, not the catalog: a stale ticker would fail the batch
+        existing = securities_crud.get_existing_tickers(db, tickers, use_catalog=False)
+        daily_prices_crud.upsert_daily_prices(db, [row for row in rows if row.ticker in existing])
+        return tickers - existing
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+class IngestBuffer:
+    """
+    Bounded queue of rows with a flusher thread writing them in batches.
+    """
+
+    def __init__(
+        self,
+        write: BatchWriter = write_daily_prices,
+        max_rows: int = 50000,
+        batch_size: int = 500,
+        flush_interval: float = 0.05,
+        enqueue_timeout: float = 1.0,
+        max_retries: int = 5,
+        retry_backoff: float = 0.1,
+    ):
+        self.write = write
+        self.max_rows = max_rows
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.enqueue_timeout = enqueue_timeout
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+
+        # (enqueued at, row, future resolved when the batch commits)
+        self._items: Deque[Tuple[float, DailyPriceCreate, Optional[Future]]] = deque()
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+
+        self.enqueued = 0
+        self.rejected = 0
+        self.flushed_rows = 0
+        self.flushed_batches = 0
+        self.failed_rows = 0
+        self.retried_writes = 0
+        self.split_batches = 0
+        self.unknown_ticker_rows = 0
+        self.max_depth = 0
+        self.last_flush_ms: Optional[float] = None
+        self.max_flush_ms = 0.0
+        self.last_lag_ms: Optional[float] = None
+        self.max_lag_ms = 0.0
+
+    def start(self) -> None:
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="ingest-buffer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Flush what is queued and stop the flusher thread."""
+        with self._lock:
+            self._stopping = True
+            self._not_empty.notify_all()
+            self._not_full.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def submit(self, row: DailyPriceCreate, durable: bool = False, wait: bool = True) -> Optional[Future]:
+        """
+        Queue a row. With durable, returns a future resolved once the row's
+        batch is committed (or failed). When the buffer is full, waits up to
+        the enqueue timeout (not at all without wait) and then raises
+        IngestBufferFull.
+        """
+        future = Future() if durable else None
+        with self._lock:
+            if len(self._items) >= self.max_rows and wait and not self._stopping:
+                deadline = time.monotonic() + self.enqueue_timeout
+                while len(self._items) >= self.max_rows and not self._stopping:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._not_full.wait(remaining)
+            if len(self._items) >= self.max_rows or self._stopping:
+                self.rejected += 1
+                raise IngestBufferFull()
+
+            self._items.append((time.monotonic(), row, future))
+            self.enqueued += 1
+            depth = len(self._items)
+            self.max_depth = max(self.max_depth, depth)
+            # Wake the flusher for the first row (to start its timer) and
+            # when a full batch is ready
+            if depth == 1 or depth >= self.batch_size:
+                self._not_empty.notify()
+        return future
+
+    def _next_batch(self) -> Optional[List[Tuple[float, DailyPriceCreate, Optional[Future]]]]:
+        """Wait for a full batch or the flush deadline; None once stopped and drained."""
+        with self._lock:
+            while not self._items:
+                if self._stopping:
+                    return None
+                self._not_empty.wait()
+
+            deadline = self._items[0][0] + self.flush_interval
+            while len(self._items) < self.batch_size and not self._stopping:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._not_empty.wait(remaining)
+
+            count = min(self.batch_size, len(self._items))
+            batch = [self._items.popleft() for _ in range(count)]
+            self._not_full.notify_all()
+            return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            self._flush(batch)
+
+    def _write_with_retries(self, rows: List[DailyPriceCreate]) -> Set[str]:
+        """Write rows, retrying transient errors with exponential backoff."""
+        attempt = 0
+        while True:
+            try:
+                return self.write(rows)
+            except Exception as exc:
+                if attempt >= self.max_retries or not is_transient(exc):
+                    raise
+                delay = min(self.retry_backoff * 2 ** attempt, MAX_RETRY_BACKOFF_SECONDS)
+                attempt += 1
+                logger.warning(
+                    f"Ingest buffer write of {len(rows)} rows failed ({exc}); "
+                    f"retry {attempt}/{self.max_retries} in {delay:.2f}s"
+                )
+                with self._lock:
+                    self.retried_writes += 1
+                time.sleep(delay)
+
+    def _write_isolating(self, rows: List[DailyPriceCreate]) -> List[Optional[BaseException]]:
+        """
+        Write rows and return the error of every row (None when written).
+        A batch failing with a non-transient error is split in halves and
+        each half written on its own, so a bad row only fails itself.
+        """
+        try:
+            unknown = self._write_with_retries(rows)
+        except Exception as exc:
+            if len(rows) == 1 or is_transient(exc):
+                return [exc] * len(rows)
+            with self._lock:
+                self.split_batches += 1
+            middle = len(rows) // 2
+            return self._write_isolating(rows[:middle]) + self._write_isolating(rows[middle:])
+        return [UnknownTicker(row.ticker) if row.ticker in unknown else None for row in rows]
+
+    def _flush(self, batch: List[Tuple[float, DailyPriceCreate, Optional[Future]]]) -> None:
+        started = time.monotonic()
+        errors = self._write_isolating([row for _, row, _ in batch])
+
+        finished = time.monotonic()
+        flush_ms = (finished - started) * 1000
+        lag_ms = (finished - batch[0][0]) * 1000
+        written = 0
+        unknown = 0
+        dropped = []
+        for (_, row, future), error in zip(batch, errors):
+            if error is None:
+                written += 1
+            elif isinstance(error, UnknownTicker):
+                unknown += 1
+            else:
+                dropped.append((row, error))
+            if future is not None:
+                if error is None:
+                    future.set_result(True)
+                else:
+                    future.set_exception(error)
+
+        if dropped:
+            named = ", ".join(
+                f"{row.ticker}@{row.time.isoformat()}: {error}" for row, error in dropped[:LOGGED_DROPPED_ROWS]
+            )
+            more = len(dropped) - LOGGED_DROPPED_ROWS
+            logger.error(
+                f"Ingest buffer dropped {len(dropped)} of {len(batch)} rows: {named}"
+                + (f" and {more} more" if more > 0 else "")
+            )
+
+        with self._lock:
+            if written:
+                self.flushed_batches += 1
+            self.flushed_rows += written
+            self.unknown_ticker_rows += unknown
+            self.failed_rows += len(dropped)
+            self.last_flush_ms = flush_ms
+            self.max_flush_ms = max(self.max_flush_ms, flush_ms)
+            self.last_lag_ms = lag_ms
+            self.max_lag_ms = max(self.max_lag_ms, lag_ms)
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters used to size the buffer and watch its lag."""
+        with self._lock:
+            oldest = self._items[0][0] if self._items else None
+            return {
+                "running": self._thread is not None and self._thread.is_alive(),
+                "depth": len(self._items),
+                "max_rows": self.max_rows,
+                "max_depth": self.max_depth,
+                "batch_size": self.batch_size,
+                "flush_interval_ms": self.flush_interval * 1000,
+                "oldest_queued_ms": (time.monotonic() - oldest) * 1000 if oldest is not None else None,
+                "enqueued": self.enqueued,
+                "rejected": self.rejected,
+                "flushed_rows": self.flushed_rows,
+                "flushed_batches": self.flushed_batches,
+                "average_batch_rows": self.flushed_rows / self.flushed_batches if self.flushed_batches else None,
+                "failed_rows": self.failed_rows,
+                "retried_writes": self.retried_writes,
+                "split_batches": self.split_batches,
+                "unknown_ticker_rows": self.unknown_ticker_rows,
+                "last_flush_ms": self.last_flush_ms,
+                "max_flush_ms": self.max_flush_ms,
+                "last_lag_ms": self.last_lag_ms,
+                "max_lag_ms": self.max_lag_ms,
+            }
+
+
+_buffer: Optional[IngestBuffer] = None
+
+
+def get_ingest_buffer() -> Optional[IngestBuffer]:
+    """The running buffer, or None when write-behind ingestion is disabled."""
+    return _buffer
+
+
+def start_ingest_buffer() -> None:
+    """Start the buffer if INGEST_BUFFER_ENABLED; called on startup."""
+    global _buffer
+    if not settings.INGEST_BUFFER_ENABLED or _buffer is not None:
+        return
+    _buffer = IngestBuffer(
+        max_rows=settings.INGEST_BUFFER_MAX_ROWS,
+        batch_size=settings.INGEST_BATCH_SIZE,
+        flush_interval=settings.INGEST_FLUSH_INTERVAL_MS / 1000,
+        enqueue_timeout=settings.INGEST_ENQUEUE_TIMEOUT_SECONDS,
+        max_retries=settings.INGEST_FLUSH_RETRIES,
+        retry_backoff=settings.INGEST_RETRY_BACKOFF_MS / 1000,
+    )
+    _buffer.start()
+
+
+def stop_ingest_buffer() -> None:
+    """Flush queued rows and stop the buffer; called on shutdown."""
+    global _buffer
+    if _buffer is not None:
+        _buffer.stop()
+        _buffer = None
@@ -1,10 +1,25 @@
 import logging
+from sqlalchemy import text
 from sqlalchemy.orm import Session
-from app.core.timescale_utils import create_hypertable, add_compression_policy
+from app.core.timescale_utils import (
+    create_hypertable,
+    add_compression_policy,
+    create_continuous_aggregate,
+    refresh_continuous_aggregate,
+)
 from app.core.config import settings
+from app.crud.daily_prices import OHLCV_INTERVALS, OHLCV_SUM_COLUMNS
 
 logger = logging.getLogger(__name__)
 
+# Refresh window of each OHLCV aggregate; it must span at least two buckets
+OHLCV_REFRESH_START = {
+    "1w": "1 month",
+    "1M": "3 months",
+    "1q": "9 months",
+    "1y": "3 years",
+}
+
 def initialize_timescaledb(db: Session) -> None:
     """
     Initialize TimescaleDB features for the application.
@@ -37,4 +52,52 @@ def initialize_timescaledb(db: Session) -> None:
         segment_by="sensor_id"  # Segment compression by sensor for better compression ratios
     )
     
-    logger.info("TimescaleDB initialization completed successfully") 
\ No newline at end of file
+    # Materialize weekly/monthly/quarterly/yearly OHLCV bars for resampling
+    create_ohlcv_aggregates(db)
+    
+    logger.info("TimescaleDB initialization completed successfully")
+
+
+def create_ohlcv_aggregates(db: Session) -> None:
+    """
+    Create the continuous aggregates read by the OHLCV resampling endpoint,
+    for databases where the add_ohlcv_continuous_aggregates migration has
+    not created them; existing views are left alone.
+    
+    Each view keeps first(open), max(high), min(low), last(close) and the sums
+    of volume and order values per ticker and bucket. Views are created empty
+    and then refreshed once over the whole history, since their refresh
+    policy only covers a recent window; real-time aggregation covers rows
+    that are not materialized yet.
+    
+    Args:
+        db: SQLAlchemy database session
+    """
+    aggregates = [
+        "first(open_price, time) AS open",
+        "max(high_price) AS high",
+        "min(low_price) AS low",
+        "last(close_price, time) AS close",
+    ] + [f"sum({name}) AS {name}" for name in OHLCV_SUM_COLUMNS]
+    
+    for interval, spec in OHLCV_INTERVALS.items():
+        qualified = f"{settings.POSTGRES_SCHEMA}.{spec['view']}"
+        if db.execute(text("SELECT to_regclass(:view)"), {"view": qualified}).scalar() is not None:
+            logger.info(f"Continuous aggregate {spec['view']} already exists")
+            continue
+        created = create_continuous_aggregate(
+            db=db,
+            view_name=spec["view"],
+            hypertable_name="daily_prices",
+            time_bucket=spec["bucket"],
+            aggregates=aggregates,
+            schema=settings.POSTGRES_SCHEMA,
+            group_by_columns=["ticker"],
+            refresh_policy_start=OHLCV_REFRESH_START[interval],
+            refresh_policy_interval="1 hour",
+            bucket_column="bucket",
+            materialized_only=False,
+            with_no_data=True,
+        ) 
+        if created:
+            refresh_continuous_aggregate(db, spec["view"], schema=settings.POSTGRES_SCHEMA)
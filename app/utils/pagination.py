@@ -0,0 +1,58 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Sequence
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """
+    Encode the sort key of the last row of a page as an opaque cursor token.
+    """
+    payload = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str, size: int) -> List[Any]:
+    """
+    Decode a cursor token produced by encode_cursor.
+    Raises ValueError if the token is malformed or holds the wrong number of keys.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        values = json.loads(raw)
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError("Invalid cursor")
+    return values
+
+
+def decode_time_ticker_cursor(token: str) -> List[Any]:
+    """
+    Decode a (time, ticker) cursor used by daily price listings.
+    """
+    time_value, ticker = decode_cursor(token, 2)
+    if not isinstance(time_value, str) or not isinstance(ticker, str):
+        raise ValueError("Invalid cursor")
+    return [datetime.fromisoformat(time_value), ticker]
+
+
+def decode_ticker_cursor(token: str) -> str:
+    """
+    Decode a ticker cursor used by securities listings.
+    """
+    (ticker,) = decode_cursor(token, 1)
+    if not isinstance(ticker, str):
+        raise ValueError("Invalid cursor")
+    return ticker
+
+
+def next_cursor(rows: Sequence[Any], limit: int, *keys: str) -> Optional[str]:
+    """
+    Build the cursor for the page after rows, or None when rows is the last page.
+    """
+    if len(rows) < limit or not rows:
+        return None
+    last = rows[-1]
+    return encode_cursor([getattr(last, key) for key in keys])
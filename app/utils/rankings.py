@@ -0,0 +1,108 @@
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.core.cache import ALL_TICKERS, day_tag, ranking_cache, trading_day
+from app.crud import market as market_crud
+from app.crud.price_versions import get_day_price_version
+
+# Metrics that can be ranked, as daily_prices columns
+RANKING_METRICS = ("percent_change", "volume", "foreign_net_buy_value")
+
+# Columns returned for every ranked row
+RANKING_COLUMNS = ("ticker", "exchange", "close_price", *RANKING_METRICS)
+
+
+class DayRankings:
+    """
+    Cross-section of one trading day with the orderings of every metric,
+    for the whole market and per exchange, computed once.
+
+    Each metric is argsorted once (descending, NaN last); the per-exchange
+    orderings are the global one filtered by exchange, so they stay sorted
+    without another sort. A top-N request is then a slice.
+    """
+
+    def __init__(self, day: date, rows: Sequence[Any]):
+        self.day = day
+        self.columns: Dict[str, np.ndarray] = {
+            name: np.array([getattr(row, name) for row in rows], dtype=object)
+            for name in ("ticker", "exchange")
+        }
+        for name in ("close_price", *RANKING_METRICS):
+            self.columns[name] = np.array([getattr(row, name) for row in rows], dtype=np.float64)
+
+        exchanges = self.columns["exchange"]
+        masks = {None: None}
+        for exchange in {value for value in exchanges if value is not None}:
+            masks[exchange] = exchanges == exchange
+
+        # (exchange, metric) -> (row indices sorted descending, number of non-NaN values)
+        self._orders: Dict[Tuple[Optional[str], str], Tuple[np.ndarray, int]] = {}
+        for metric in RANKING_METRICS:
+            values = self.columns[metric]
+            valid = ~np.isnan(values)
+            # Stable sort keeps rows with equal values in ticker order
+            order = np.argsort(-np.where(valid, values, -np.inf), kind="stable")
+            for exchange, mask in masks.items():
+                selected = order if mask is None else order[mask[order]]
+                self._orders[(exchange, metric)] = (selected, int(valid[selected].sum()))
+
+    def __len__(self) -> int:
+        return len(self.columns["ticker"])
+
+    def top(
+        self, metric: str, n: int, exchange: Optional[str] = None, ascending: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        The n rows with the highest values of metric (lowest with ascending),
+        optionally for one exchange. Rows without a value are never ranked.
+        """
+        order, valid = self._orders.get((exchange, metric), (np.empty(0, dtype=np.int64), 0))
+        ranked = order[:valid]
+        indices = ranked[::-1][:n] if ascending else ranked[:n]
+        return [
+            {
+                "rank": rank,
+                **{name: _to_python(self.columns[name][index]) for name in RANKING_COLUMNS},
+            }
+            for rank, index in enumerate(indices, start=1)
+        ]
+
+
+def _to_python(value: Any) -> Any:
+    """NumPy scalar to a JSON-ready value, NaN becoming None."""
+    if isinstance(value, np.floating):
+        return None if np.isnan(value) else float(value)
+    return value
+
+
+def get_day_rankings(db: Session, day: Optional[date] = None) -> Optional[DayRankings]:
+    """
+    Rankings of a trading day (the latest one by default), built from one
+    cross-section query the first time they are needed after a write to
+    that day and kept in ranking_cache until the next one or the TTL.
+    Entries are keyed by the day's price version, so writes made by any
+    process (other workers, the bulk loader) miss the cache; writes made
+    through this process also drop them at once.
+    Returns None when there is no data at all.
+    """
+    if day is None:
+        latest = market_crud.get_latest_trading_day(db)
+        if latest is None:
+            return None
+        day = trading_day(latest)
+
+    key = (day, get_day_price_version(db, day))
+    rankings = ranking_cache.get(key)
+    if rankings is None:
+        generation = ranking_cache.generation
+        start = datetime.combine(day, time.min, tzinfo=timezone.utc)
+        rows = market_crud.get_day_cross_section(db, start, start + timedelta(days=1))
+        rankings = DayRankings(day, rows)
+        # Price writes drop the days they touch; securities changes (status,
+        # exchange) drop every day
+        ranking_cache.set(key, rankings, tags=[day_tag(day), ALL_TICKERS], generation=generation)
+    return rankings
@@ -0,0 +1,306 @@
+"""
+In-memory catalog of the securities table.
+
+The table is small and read on nearly every request (existence checks of
+the price routes, GET /securities/{ticker}, filtered listings), so each
+process keeps all of it in memory: loaded on startup, swapped for a fresh
+copy when PostgreSQL sends a securities_changed notification (see the
+add_securities_notify_trigger migration), and compared against a cheap
+row count / xmin fingerprint every SECURITIES_CATALOG_CHECK_INTERVAL_SECONDS
+in case a notification was missed (listener reconnecting, trigger absent).
+
+Reads go to an immutable snapshot with a dict by ticker and hash indexes
+on the filter columns, so they take no lock; refreshes and local writes
+build a new snapshot and swap the reference. Lookups return SecurityRecord
+tuples with the columns of Securities, not ORM objects. Until the catalog
+is loaded, or when it is disabled, the CRUD functions query the database.
+"""
+import bisect
+import logging
+import select
+import threading
+import time
+from collections import namedtuple
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import psycopg2
+from sqlalchemy import func, literal_column, select as sql_select
+
+from app.core.config import settings
+from app.core.database import engine
+from app.models.securities import Securities
+from app.utils.securities_search import build_search_index
+
+logger = logging.getLogger(__name__)
+
+NOTIFY_CHANNEL = "securities_changed"
+
+# Notifications arriving within this many seconds are coalesced into one reload
+DEBOUNCE_SECONDS = 0.2
+
+# Seconds to wait before reconnecting a failed listener
+RECONNECT_SECONDS = 5.0
+
+SecurityRecord = namedtuple("SecurityRecord", [column.name for column in Securities.__table__.columns])
+
+# Columns with a hash index; equality filters on other columns scan
+INDEXED_COLUMNS = ("exchange", "status", "margin_status", "isin_code")
+
+# (row count, highest xmin): changes on insert, update and delete
+Fingerprint = Tuple[int, Optional[int]]
+
+FINGERPRINT_STMT = sql_select(
+    func.count(),
+    func.max(literal_column("xmin::text::bigint")),
+).select_from(Securities.__table__)
+
+
+def to_record(security: Any) -> SecurityRecord:
+    """Copy a Securities object (or any row with its columns) into a record."""
+    return SecurityRecord._make(getattr(security, name) for name in SecurityRecord._fields)
+
+
+class CatalogSnapshot:
+    """
+    Immutable view of the table: records by ticker, tickers in order and one
+    {value: [tickers in order]} index per indexed column.
+    """
+
+    def __init__(self, records: Iterable[SecurityRecord], fingerprint: Optional[Fingerprint] = None):
+        self.by_ticker: Dict[str, SecurityRecord] = {record.ticker: record for record in records}
+        self.tickers: List[str] = sorted(self.by_ticker)
+        self.fingerprint = fingerprint
+        self.indexes: Dict[str, Dict[Any, List[str]]] = {column: {} for column in INDEXED_COLUMNS}
+        for ticker in self.tickers:
+            record = self.by_ticker[ticker]
+            for column, index in self.indexes.items():
+                index.setdefault(getattr(record, column), []).append(ticker)
+
+    def get(self, ticker: str) -> Optional[SecurityRecord]:
+        return self.by_ticker.get(ticker)
+
+    def get_by_isin(self, isin_code: str) -> Optional[SecurityRecord]:
+        tickers = self.indexes["isin_code"].get(isin_code)
+        return self.by_ticker[tickers[0]] if tickers else None
+
+    def existing(self, tickers: Iterable[str]) -> Set[str]:
+        return {ticker for ticker in tickers if ticker in self.by_ticker}
+
+    def matching(self, filters: Optional[Dict[str, Any]] = None) -> List[str]:
+        """
+        Tickers, in order, of the records equal to every filter that names a
+        column and is not None (the conditions of _filter_conditions).
+        """
+        conditions = {
+            key: value for key, value in (filters or {}).items()
+            if key in SecurityRecord._fields and value is not None
+        }
+        if not conditions:
+            return self.tickers
+
+        if "ticker" in conditions:
+            ticker = conditions.pop("ticker")
+            candidates = [ticker] if ticker in self.by_ticker else []
+        else:
+            # Start from the smallest index hit, then check the other conditions
+            indexed = [self.indexes[key].get(value, []) for key, value in conditions.items() if key in self.indexes]
+            if indexed:
+                candidates = min(indexed, key=len)
+            else:
+                candidates = self.tickers
+
+        if not conditions:
+            return candidates
+        return [
+            ticker for ticker in candidates
+            if all(getattr(self.by_ticker[ticker], key) == value for key, value in conditions.items())
+        ]
+
+    def list(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        filters: Optional[Dict[str, Any]] = None,
+        after: Optional[str] = None,
+    ) -> List[SecurityRecord]:
+        """Same page as get_securities: ordered by ticker, after a cursor, then offset."""
+        tickers = self.matching(filters)
+        start = bisect.bisect_right(tickers, after) if after is not None else 0
+        return [self.by_ticker[ticker] for ticker in tickers[start + skip:start + skip + limit]]
+
+    def watermark(self, filters: Optional[Dict[str, Any]] = None) -> Tuple[Optional[Any], int]:
+        """Same (latest updated_at, count) as get_securities_watermark."""
+        tickers = self.matching(filters)
+        updated = (self.by_ticker[ticker].updated_at for ticker in tickers)
+        return max((value for value in updated if value is not None), default=None), len(tickers)
+
+
+class SecuritiesCatalog:
+    """
+    Holds the current snapshot and the listener thread that refreshes it.
+    """
+
+    def __init__(self, check_interval: float = 5.0):
+        self.check_interval = check_interval
+        self.snapshot: Optional[CatalogSnapshot] = None
+        self._write_lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.reloads = 0
+        self.notifications = 0
+        self.last_reload_ms: Optional[float] = None
+
+    def _fingerprint(self, connection) -> Fingerprint:
+        count, xmin = connection.execute(FINGERPRINT_STMT).one()
+        return count, xmin
+
+    def load(self) -> CatalogSnapshot:
+        """Read the whole table into a new snapshot and make it current."""
+        started = time.monotonic()
+        # One snapshot for both statements, so the fingerprint matches the rows
+        with engine.connect().execution_options(isolation_level="REPEATABLE READ") as connection:
+            fingerprint = self._fingerprint(connection)
+            rows = connection.execute(sql_select(Securities.__table__)).all()
+        snapshot = CatalogSnapshot(map(to_record, rows), fingerprint)
+        with self._write_lock:
+            self.snapshot = snapshot
+        # Index here, so no search request pays for the rebuild
+        build_search_index(snapshot, snapshot.by_ticker.values())
+        self.reloads += 1
+        self.last_reload_ms = (time.monotonic() - started) * 1000
+        return snapshot
+
+    def check(self) -> bool:
+        """Reload if the table fingerprint moved; returns whether it did."""
+        with engine.connect() as connection:
+            fingerprint = self._fingerprint(connection)
+        snapshot = self.snapshot
+        if snapshot is not None and snapshot.fingerprint == fingerprint:
+            return False
+        self.load()
+        return True
+
+    def put(self, securities: Iterable[Any]) -> None:
+        """Add or replace securities written by this process (read your writes)."""
+        with self._write_lock:
+            if self.snapshot is None:
+                return
+            records = dict(self.snapshot.by_ticker)
+            for security in securities:
+                records[security.ticker] = to_record(security)
+            # No fingerprint: the next check reloads and confirms the writes
+            self.snapshot = CatalogSnapshot(records.values())
+
+    def discard(self, ticker: str) -> None:
+        """Drop a security deleted by this process."""
+        with self._write_lock:
+            if self.snapshot is None or ticker not in self.snapshot.by_ticker:
+                return
+            records = dict(self.snapshot.by_ticker)
+            del records[ticker]
+            self.snapshot = CatalogSnapshot(records.values())
+
+    def start(self) -> None:
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="securities-catalog", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                self._listen()
+            except Exception:
+                logger.exception("Securities catalog listener failed; reconnecting")
+                self._stopping.wait(RECONNECT_SECONDS)
+
+    def _listen(self) -> None:
+        connection = psycopg2.connect(settings.SQLALCHEMY_DATABASE_URI, application_name="iqx_backend_catalog")
+        try:
+            connection.autocommit = True
+            with connection.cursor() as cursor:
+                cursor.execute(f"LISTEN {NOTIFY_CHANNEL}")
+            # Changes made while the listener was down
+            self.check()
+
+            # Wake up at least every half second to notice stop()
+            timeout = min(self.check_interval, 0.5)
+            last_check = time.monotonic()
+            while not self._stopping.is_set():
+                readable, _, _ = select.select([connection], [], [], timeout)
+                if readable:
+                    connection.poll()
+                    if connection.notifies:
+                        # Let a burst of writes finish, then reload once
+                        time.sleep(DEBOUNCE_SECONDS)
+                        connection.poll()
+                        self.notifications += len(connection.notifies)
+                        connection.notifies.clear()
+                        self.load()
+                        last_check = time.monotonic()
+                elif time.monotonic() - last_check >= self.check_interval:
+                    self.check()
+                    last_check = time.monotonic()
+        finally:
+            connection.close()
+
+
+_catalog: Optional[SecuritiesCatalog] = None
+
+
+def get_securities_catalog() -> Optional[SecuritiesCatalog]:
+    """The running catalog, or None when it is disabled."""
+    return _catalog
+
+
+def catalog_snapshot() -> Optional[CatalogSnapshot]:
+    """The current snapshot, or None when lookups must go to the database."""
+    return _catalog.snapshot if _catalog is not None else None
+
+
+def start_securities_catalog() -> None:
+    """
+    Load the catalog and start its listener if SECURITIES_CATALOG_ENABLED;
+    called on startup. A failed load leaves lookups on the database until
+    the listener's first successful check.
+    """
+    global _catalog
+    if not settings.SECURITIES_CATALOG_ENABLED or _catalog is not None:
+        return
+    _catalog = SecuritiesCatalog(check_interval=settings.SECURITIES_CATALOG_CHECK_INTERVAL_SECONDS)
+    try:
+        _catalog.load()
+    except Exception as e:
+        logger.error(f"Loading the securities catalog failed: {e}")
+    _catalog.start()
+
+
+def stop_securities_catalog() -> None:
+    """Stop the listener; called on shutdown."""
+    global _catalog
+    if _catalog is not None:
+        _catalog.stop()
+        _catalog = None
+
+
+def catalog_put(security: Any) -> None:
+    """Record a security created or updated by this process in the catalog."""
+    catalog_put_many([security])
+
+
+def catalog_put_many(securities: Iterable[Any]) -> None:
+    """Record securities created or updated by this process in the catalog."""
+    if _catalog is not None:
+        _catalog.put(securities)
+
+
+def catalog_discard(ticker: str) -> None:
+    """Remove a security deleted by this process from the catalog."""
+    if _catalog is not None:
+        _catalog.discard(ticker)
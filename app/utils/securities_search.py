@@ -0,0 +1,196 @@
+"""
+Autocomplete search over ticker, short_name and company_name.
+
+The securities table is small, so the index lives in memory, built from
+the securities catalog snapshot (or, with the catalog disabled, from the
+table, rebuilt when its watermark moves). The catalog listener indexes
+each snapshot it loads; other rebuilds run in the threadpool, one at a
+time. Text is folded before indexing
+and querying: lower case, Vietnamese diacritics removed (đ becomes d) and
+punctuation turned into spaces, so "sua viet nam" and "Sữa Việt Nam"
+match the same names.
+
+Matches are ranked by kind, then by how much of the field the query
+covers, then by ticker:
+
+  exact ticker > ticker prefix > name prefix > word prefixes > substring
+  > fuzzy (shared trigrams, for typos)
+
+Prefix lookups bisect sorted arrays; fuzzy candidates come from a trigram
+inverted index, so a keystroke touches a few posting lists rather than
+every security.
+"""
+import bisect
+import heapq
+import threading
+import unicodedata
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Scores of the match kinds; the fraction of the field the query covers is
+# added (below 1), so kinds never overtake each other
+EXACT_TICKER = 6.0
+TICKER_PREFIX = 5.0
+NAME_PREFIX = 4.0
+WORD_PREFIX = 3.0
+SUBSTRING = 2.0
+FUZZY = 1.0
+
+# Share of the query trigrams a name must contain to be a fuzzy match
+FUZZY_THRESHOLD = 0.5
+
+# Queries shorter than this (after folding) are not matched fuzzily
+FUZZY_MIN_LENGTH = 3
+
+# Letters NFKD does not decompose into a base letter and a mark
+_FOLD_EXTRA = str.maketrans({"đ": "d", "Đ": "d"})
+
+
+def fold(text: Optional[str]) -> str:
+    """Lower case, strip diacritics and collapse non-alphanumerics to single spaces."""
+    if not text:
+        return ""
+    text = unicodedata.normalize("NFKD", text.translate(_FOLD_EXTRA))
+    folded = "".join(
+        char if char.isalnum() else " "
+        for char in text.casefold()
+        if not unicodedata.combining(char)
+    )
+    return " ".join(folded.split())
+
+
+def trigrams(text: str) -> set:
+    """pg_trgm-style trigrams of every word, padded with two leading and one trailing blank."""
+    grams = set()
+    for word in text.split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class SearchIndex:
+    """
+    Index over a set of securities records (anything with ticker,
+    short_name and company_name attributes).
+    """
+
+    def __init__(self, records: Iterable[Any]):
+        self.records: List[Any] = list(records)
+        self.tickers: List[str] = []
+        # Folded "short_name company_name" of every record
+        self.names: List[str] = []
+        # Words of the names and the ticker of every record
+        self.words: List[List[str]] = []
+        # (folded ticker, record id), sorted, for ticker prefixes
+        self.ticker_keys: List[Tuple[str, int]] = []
+        # (folded name, record id) of both names, sorted, for name prefixes
+        self.name_keys: List[Tuple[str, int]] = []
+        # (word, record id) of every name word, sorted, for word prefixes
+        self.word_keys: List[Tuple[str, int]] = []
+        self.postings: Dict[str, List[int]] = {}
+
+        for record_id, record in enumerate(self.records):
+            ticker = fold(record.ticker)
+            short_name = fold(record.short_name)
+            company_name = fold(record.company_name)
+            self.tickers.append(ticker)
+            self.names.append(f"{short_name} {company_name}".strip())
+            self.ticker_keys.append((ticker, record_id))
+            words = set(ticker.split())
+            for name in {short_name, company_name}:
+                if name:
+                    self.name_keys.append((name, record_id))
+                    words.update(name.split())
+            self.words.append(sorted(words))
+            self.word_keys.extend((word, record_id) for word in words)
+            for gram in trigrams(" ".join(words)):
+                self.postings.setdefault(gram, []).append(record_id)
+
+        self.ticker_keys.sort()
+        self.name_keys.sort()
+        self.word_keys.sort()
+
+    @staticmethod
+    def _prefixed(keys: Sequence[Tuple[str, int]], prefix: str) -> Sequence[Tuple[str, int]]:
+        """Keys starting with prefix, from a sorted list."""
+        start = bisect.bisect_left(keys, (prefix,))
+        end = bisect.bisect_left(keys, (prefix + "\uffff",), start)
+        return keys[start:end]
+
+    def search(self, query: str, limit: int = 10) -> List[Tuple[Any, float]]:
+        """Best matches for a query as (record, score), highest score first."""
+        folded = fold(query)
+        if not folded:
+            return []
+        scores: Dict[int, float] = {}
+
+        def offer(record_id: int, score: float) -> None:
+            if score > scores.get(record_id, 0.0):
+                scores[record_id] = score
+
+        compact = folded.replace(" ", "")
+        for ticker, record_id in self._prefixed(self.ticker_keys, compact):
+            kind = EXACT_TICKER if ticker == compact else TICKER_PREFIX
+            offer(record_id, kind + len(compact) / len(ticker) / 2)
+
+        for name, record_id in self._prefixed(self.name_keys, folded):
+            offer(record_id, NAME_PREFIX + len(folded) / len(name) / 2)
+
+        # Every query word must prefix some word of the record; candidates
+        # come from the longest query word, the most selective one
+        words = folded.split()
+        longest = max(words, key=len)
+        others = list(words)
+        others.remove(longest)
+        candidates = {record_id for _, record_id in self._prefixed(self.word_keys, longest)}
+        for record_id in candidates.difference(scores):
+            record_words = self.words[record_id]
+            if all(any(candidate.startswith(word) for candidate in record_words) for word in others):
+                offer(record_id, WORD_PREFIX + len(folded) / max(len(self.names[record_id]), 1) / 2)
+
+        if len(scores) < limit and len(compact) >= 2:
+            for record_id, name in enumerate(self.names):
+                if record_id not in scores and (folded in name or compact in self.tickers[record_id]):
+                    offer(record_id, SUBSTRING + len(folded) / max(len(name), 1) / 2)
+
+        if len(scores) < limit and len(compact) >= FUZZY_MIN_LENGTH:
+            query_grams = trigrams(folded)
+            shared = Counter()
+            for gram in query_grams:
+                shared.update(self.postings.get(gram, ()))
+            for record_id, count in shared.items():
+                similarity = count / len(query_grams)
+                if similarity >= FUZZY_THRESHOLD and record_id not in scores:
+                    offer(record_id, FUZZY + similarity / 2)
+
+        best = heapq.nsmallest(limit, scores.items(), key=lambda item: (-item[1], self.tickers[item[0]]))
+        return [(self.records[record_id], round(score, 4)) for record_id, score in best]
+
+
+_cached: Optional[Tuple[Any, SearchIndex]] = None
+_build_lock = threading.Lock()
+
+
+def cached_search_index(key: Any) -> Optional[SearchIndex]:
+    """
+    The index built for key (the catalog snapshot, or the table watermark
+    when the catalog is disabled), or None if the key moved on.
+    """
+    cached = _cached
+    if cached is not None and (cached[0] is key or cached[0] == key):
+        return cached[1]
+    return None
+
+
+def build_search_index(key: Any, records: Iterable[Any]) -> SearchIndex:
+    """
+    Index records and keep the index for key. Blocking: call it from a
+    thread. Concurrent callers for the same key wait for one build.
+    """
+    global _cached
+    with _build_lock:
+        index = cached_search_index(key)
+        if index is None:
+            index = SearchIndex(records)
+            _cached = (key, index)
+    return index
@@ -0,0 +1,102 @@
+"""
+Compare the JSON response path of the daily price endpoints with the Arrow IPC
+and Parquet paths, on synthetic rows shaped like a daily_prices query result.
+
+Usage:
+    python -m benchmarks.arrow_vs_json --rows 50000
+"""
+import argparse
+import io
+import json
+import time
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from fastapi.encoders import jsonable_encoder
+
+from app.schemas.daily_prices import ExtendedDailyPriceList
+from app.utils.arrow import (
+    ARROW_STREAM_MEDIA_TYPE,
+    DAILY_PRICE_SCHEMA,
+    PARQUET_MEDIA_TYPE,
+    encode_table,
+    rows_to_table,
+)
+
+COLUMNS = DAILY_PRICE_SCHEMA.names
+
+
+def make_rows(count: int):
+    """Result tuples in daily_prices column order, numerics already as float."""
+    start = datetime(2000, 1, 3, 7, tzinfo=timezone.utc)
+    rows = []
+    price = 25_000.0
+    for i in range(count):
+        price = max(1_000.0, price * (1.0 + ((i * 7919) % 200 - 100) / 10_000.0))
+        volume = 100_000 + (i * 104_729) % 5_000_000
+        rows.append((
+            start + timedelta(days=i),
+            "BENCH",
+            round(price * 0.99, 2), round(price * 1.02, 2), round(price * 0.98, 2), round(price, 2),
+            volume, round(price * 0.01, 2), 0.01,
+            price * volume * 0.5, price * volume * 0.5, price * 1_000.0,
+            volume // 2, volume // 2, 1_000,
+        ))
+    return rows
+
+
+def timed(func, repeat: int):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def json_encode(rows):
+    # Same steps FastAPI takes for response_model=ExtendedDailyPriceList
+    objects = [SimpleNamespace(**dict(zip(COLUMNS, row))) for row in rows]
+    model = ExtendedDailyPriceList.model_validate(
+        {"items": objects, "total": len(objects)}, from_attributes=True
+    )
+    content = jsonable_encoder(model)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    results = []
+
+    encode_seconds, body = timed(lambda: json_encode(rows), args.repeat)
+    decode_seconds, _ = timed(lambda: json.loads(body), args.repeat)
+    results.append(("json", encode_seconds, decode_seconds, len(body)))
+
+    encode_seconds, body = timed(
+        lambda: encode_table(rows_to_table(rows, DAILY_PRICE_SCHEMA), ARROW_STREAM_MEDIA_TYPE), args.repeat
+    )
+    decode_seconds, _ = timed(lambda: pa.ipc.open_stream(body).read_all(), args.repeat)
+    results.append(("arrow", encode_seconds, decode_seconds, len(body)))
+
+    encode_seconds, body = timed(
+        lambda: encode_table(rows_to_table(rows, DAILY_PRICE_SCHEMA), PARQUET_MEDIA_TYPE), args.repeat
+    )
+    decode_seconds, _ = timed(lambda: pq.read_table(io.BytesIO(body)), args.repeat)
+    results.append(("parquet", encode_seconds, decode_seconds, len(body)))
+
+    print(f"{args.rows:,} rows, best of {args.repeat}")
+    print(f"{'format':<10}{'encode ms':>12}{'decode ms':>12}{'bytes':>14}")
+    for name, encode_seconds, decode_seconds, size in results:
+        print(f"{name:<10}{encode_seconds * 1000:>12.1f}{decode_seconds * 1000:>12.1f}{size:>14,}")
+
+
+if __name__ == "__main__":
+    main()
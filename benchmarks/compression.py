@@ -0,0 +1,75 @@
+"""
+Measure compression ratio and throughput of the response encodings on a
+daily price list body (the JSON of a long range), for several levels of
+each encoding available here, compressed in one go and in 64 KiB
+streamed chunks (sync flushed after each chunk, as the middleware does).
+
+Usage:
+    python -m benchmarks.compression --rows 5000
+"""
+import argparse
+import time
+from functools import partial
+
+from app.core.compression import brotli, brotli_encoder, gzip_encoder, zstandard, zstd_encoder
+from app.utils.fast_json import DAILY_PRICE_LIST_JSON
+from benchmarks.serialization import make_rows
+
+CHUNK_SIZE = 64 * 1024
+
+
+def encoders():
+    """(name, level, factory) for every encoding and level to measure."""
+    for level in (1, 6, 9):
+        yield "gzip", level, partial(gzip_encoder, level)
+    if brotli is not None:
+        for quality in (1, 5, 11):
+            yield "br", quality, partial(brotli_encoder, quality)
+    if zstandard is not None:
+        for level in (1, 3, 9):
+            yield "zstd", level, partial(zstd_encoder, level)
+
+
+def compress(factory, body: bytes, chunk_size: int) -> bytes:
+    """Compress body in chunk_size chunks, sync flushed like streamed responses."""
+    compressor = factory()
+    parts = []
+    for i in range(0, len(body), chunk_size):
+        parts.append(compressor.compress(body[i:i + chunk_size]))
+        parts.append(compressor.sync_flush())
+    parts.append(compressor.flush())
+    return b"".join(parts)
+
+
+def timed(func, repeat: int):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    body = DAILY_PRICE_LIST_JSON.response({"items": rows, "total": len(rows)}).body
+    megabytes = len(body) / 1e6
+    print(f"body: {args.rows} rows, {megabytes:.2f} MB")
+    print(f"{'encoding':<8} {'level':>5} {'ratio':>7} {'MB/s':>8} {'streamed ratio':>15} {'streamed MB/s':>14}")
+    for name, level, factory in encoders():
+        seconds, encoded = timed(lambda: compress(factory, body, len(body)), args.repeat)
+        streamed_seconds, streamed = timed(lambda: compress(factory, body, CHUNK_SIZE), args.repeat)
+        print(
+            f"{name:<8} {level:>5} {len(body) / len(encoded):>7.1f} {megabytes / seconds:>8.1f}"
+            f" {len(body) / len(streamed):>15.1f} {megabytes / streamed_seconds:>14.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Single-row ingest load test: POST /daily-prices one bar per request from
+concurrent clients, as the per-bar feed adapters do, against a running
+server, e.g. one with INGEST_BUFFER_ENABLED=true and a baseline without.
+
+Bars get consecutive minute timestamps starting at --start, so every run
+should use a fresh start (or ticker) to measure inserts rather than the
+duplicate rejections of the direct path. Requires httpx.
+
+Usage:
+    python -m benchmarks.ingest --url http://localhost:8000 --ticker VNM --requests 5000 --concurrency 64
+        [--baseline-url http://localhost:8001] [--durable]
+"""
+import argparse
+import asyncio
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List
+
+import httpx
+import numpy as np
+
+from benchmarks.load_test import print_report
+
+
+def make_bar(ticker: str, when: datetime, i: int) -> Dict[str, object]:
+    price = 25_000.0 + (i * 7919) % 2_000
+    return {
+        "time": when.isoformat(),
+        "ticker": ticker,
+        "open_price": price,
+        "high_price": price + 100,
+        "low_price": price - 100,
+        "close_price": price + 50,
+        "volume": 1_000 + i % 5_000,
+    }
+
+
+async def run(
+    url: str, api_prefix: str, ticker: str, start: datetime, requests: int, concurrency: int, durable: bool
+) -> Dict[str, object]:
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+    remaining = iter(range(requests))
+    params = {"durable": "true"} if durable else {}
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=30.0) as client:
+
+        async def worker() -> None:
+            for i in remaining:
+                bar = make_bar(ticker, start + timedelta(minutes=i), i)
+                started = time.perf_counter()
+                try:
+                    response = await client.post(f"{api_prefix}/daily-prices", json=bar, params=params)
+                    statuses[response.status_code] += 1
+                except httpx.HTTPError:
+                    statuses["error"] += 1
+                latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    milliseconds = np.array(latencies) * 1000.0
+    p50, p95, p99 = np.percentile(milliseconds, [50, 95, 99])
+    return {
+        "url": url,
+        "requests": len(latencies),
+        "errors": sum(count for code, count in statuses.items() if code == "error" or code >= 400),
+        "seconds": round(elapsed, 3),
+        "requests_per_second": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(float(p50), 2),
+        "p95_ms": round(float(p95), 2),
+        "p99_ms": round(float(p99), 2),
+        "statuses": dict(statuses),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--baseline-url")
+    parser.add_argument("--api-prefix", default="/api/v1")
+    parser.add_argument("--ticker", required=True, help="Existing ticker to write bars for")
+    parser.add_argument("--start", default=None, help="ISO time of the first bar; defaults to now, to the minute")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--durable", action="store_true", help="Ask for acknowledgement after the commit")
+    args = parser.parse_args()
+
+    start = (
+        datetime.fromisoformat(args.start) if args.start
+        else datetime.now(timezone.utc).replace(second=0, microsecond=0)
+    )
+    results = []
+    for index, url in enumerate([args.url] + ([args.baseline_url] if args.baseline_url else [])):
+        # Each server writes its own time range so the runs do not collide
+        offset = timedelta(minutes=index * args.requests)
+        results.append(asyncio.run(run(
+            url, args.api_prefix, args.ticker, start + offset, args.requests, args.concurrency, args.durable
+        )))
+    print_report(results)
+    for result in results:
+        print(f"{result['url']}: status codes {result['statuses']}")
+
+
+if __name__ == "__main__":
+    main()
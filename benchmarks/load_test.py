@@ -0,0 +1,98 @@
+"""
+Concurrent load test of running API servers, e.g. to compare the async
+database path with a baseline deployment under the same request mix.
+
+Each path is requested in turn by --concurrency workers sharing one
+connection pool until --requests requests have completed. Reports
+throughput, latency percentiles and errors per server. Requires httpx.
+
+Usage:
+    python -m benchmarks.load_test --url http://localhost:8000 --requests 2000 --concurrency 64
+        [--path /api/v1/market/snapshot ...] [--baseline-url http://localhost:8001]
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import time
+from typing import Dict, List, Optional
+
+import httpx
+import numpy as np
+
+DEFAULT_PATHS = ["/api/v1/securities?limit=100", "/api/v1/daily-prices?limit=100"]
+
+
+async def run(url: str, paths: List[str], requests: int, concurrency: int, timeout: float) -> Dict[str, object]:
+    """Send requests over paths with concurrency workers; return the statistics."""
+    latencies: List[float] = []
+    errors = 0
+    next_path = itertools.cycle(paths)
+    remaining = iter(range(requests))
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=timeout) as client:
+
+        async def worker() -> None:
+            nonlocal errors
+            for _ in remaining:
+                path = next(next_path)
+                started = time.perf_counter()
+                try:
+                    response = await client.get(path)
+                    await response.aread()
+                    if response.status_code >= 400:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    milliseconds = np.array(latencies) * 1000.0
+    p50, p95, p99 = np.percentile(milliseconds, [50, 95, 99]) if len(milliseconds) else (np.nan,) * 3
+    return {
+        "url": url,
+        "requests": len(latencies),
+        "errors": errors,
+        "seconds": round(elapsed, 3),
+        "requests_per_second": round(len(latencies) / elapsed, 1) if elapsed else None,
+        "p50_ms": round(float(p50), 2),
+        "p95_ms": round(float(p95), 2),
+        "p99_ms": round(float(p99), 2),
+    }
+
+
+def print_report(results: List[Dict[str, object]]) -> None:
+    names = ["requests", "errors", "seconds", "requests_per_second", "p50_ms", "p95_ms", "p99_ms"]
+    print(f"{'':<22}" + "".join(f"{str(result['url']):>32}" for result in results))
+    for name in names:
+        print(f"{name:<22}" + "".join(f"{str(result[name]):>32}" for result in results))
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8000", help="Server under test")
+    parser.add_argument("--baseline-url", help="Second server to run the same load against, e.g. the sync build")
+    parser.add_argument("--path", action="append", dest="paths", help="Path to request; repeatable")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    args = parser.parse_args(argv)
+
+    paths = args.paths or DEFAULT_PATHS
+    urls = [args.url] + ([args.baseline_url] if args.baseline_url else [])
+    results = [
+        asyncio.run(run(url, paths, args.requests, args.concurrency, args.timeout)) for url in urls
+    ]
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_report(results)
+
+
+if __name__ == "__main__":
+    main()
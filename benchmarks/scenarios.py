@@ -0,0 +1,337 @@
+"""
+Scripted benchmark scenarios for the routes of app/api/v1/routes, run
+against a server on a local PostgreSQL/TimescaleDB instance loaded with
+benchmarks.synthetic data. Each scenario sends --requests requests
+(after --warmup untimed ones) from --concurrency clients. The report is
+JSON: throughput and p50/p95/p99 latency per scenario, with the git
+commit and run settings, so runs of two commits can be compared.
+Requires httpx.
+
+Requests are drawn from a seeded random generator over the tickers and
+price times found on the server, so the same seed replays the same
+requests. The ingestion scenarios write bars for existing tickers at
+random times in 1990-1992, well before the synthetic series. They never
+move the latest prices, and repeated runs do not collide.
+
+Usage:
+    python -m benchmarks.synthetic --tickers 200 --years 10 --load
+    python -m benchmarks.scenarios --url http://localhost:8000 --output results/before.json
+    python -m benchmarks.scenarios --url http://localhost:8000 --compare results/before.json
+        [--scenario range_1y --scenario securities_search ...] [--requests 500] [--concurrency 16]
+"""
+import argparse
+import asyncio
+import json
+import random
+import subprocess
+import time
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import httpx
+import numpy as np
+
+# (method, path, query parameters, JSON body)
+Request = Tuple[str, str, Dict[str, Any], Optional[Any]]
+
+INGEST_EPOCH = datetime(1990, 1, 1, tzinfo=timezone.utc)
+INGEST_SPAN_SECONDS = 3 * 365 * 24 * 3600
+
+
+class IngestClock:
+    """Unique bar times for the ingestion scenarios, from a random 1990-1992 start."""
+
+    def __init__(self) -> None:
+        self.next = INGEST_EPOCH + timedelta(seconds=random.SystemRandom().randrange(INGEST_SPAN_SECONDS))
+
+    def take(self, count: int = 1) -> List[datetime]:
+        times = [self.next + timedelta(seconds=i) for i in range(count)]
+        self.next += timedelta(seconds=count)
+        return times
+
+
+@dataclass
+class Context:
+    """What the scenarios draw their requests from, read from the server."""
+
+    prefix: str
+    tickers: List[str]
+    securities: List[Dict[str, Any]]
+    exchanges: List[str]
+    # (ticker, ISO time) of existing daily prices
+    price_keys: List[Tuple[str, str]]
+    ingest_times: IngestClock
+
+
+def make_bar(ticker: str, when: datetime, rng: random.Random) -> Dict[str, Any]:
+    price = round(rng.uniform(5_000, 100_000), -1)
+    return {
+        "time": when.isoformat(),
+        "ticker": ticker,
+        "open_price": price,
+        "high_price": price + 100,
+        "low_price": price - 100,
+        "close_price": price + 50,
+        "volume": rng.randrange(100, 1_000_000, 100),
+    }
+
+
+@dataclass
+class Scenario:
+    name: str
+    # Route module of app/api/v1/routes
+    route: str
+    make: Callable[[random.Random, Context], Request]
+    writes: bool = False
+
+
+def _exchange(rng: random.Random, ctx: Context) -> Dict[str, Any]:
+    return {"exchange": rng.choice(ctx.exchanges)} if ctx.exchanges else {}
+
+
+def _search_prefix(rng: random.Random, ctx: Context) -> str:
+    security = rng.choice(ctx.securities)
+    text = rng.choice([security["ticker"], security.get("short_name") or security["company_name"]])
+    return text[:rng.randint(1, min(6, len(text)))]
+
+
+SCENARIOS: List[Scenario] = [
+    # securities
+    Scenario("securities_list", "securities", lambda rng, ctx: (
+        "GET", "/securities", {"limit": 100, **_exchange(rng, ctx)}, None)),
+    Scenario("security_get", "securities", lambda rng, ctx: (
+        "GET", f"/securities/{rng.choice(ctx.tickers)}", {}, None)),
+    Scenario("securities_search", "securities", lambda rng, ctx: (
+        "GET", "/securities/search", {"q": _search_prefix(rng, ctx), "limit": 10}, None)),
+    Scenario("securities_batch_upsert", "securities", lambda rng, ctx: (
+        "POST", "/securities/batch", {}, {"items": rng.sample(ctx.securities, min(100, len(ctx.securities)))}),
+        writes=True),
+    # daily_prices
+    Scenario("daily_prices_page", "daily_prices", lambda rng, ctx: (
+        "GET", "/daily-prices", {"ticker": rng.choice(ctx.tickers), "limit": 100}, None)),
+    Scenario("daily_price_get", "daily_prices", lambda rng, ctx: (
+        "GET", "/daily-prices/{}/{}".format(*rng.choice(ctx.price_keys)), {}, None)),
+    Scenario("range_1m", "daily_prices", lambda rng, ctx: (
+        "GET", f"/daily-prices/{rng.choice(ctx.tickers)}/range/1m", {}, None)),
+    Scenario("range_1y", "daily_prices", lambda rng, ctx: (
+        "GET", f"/daily-prices/{rng.choice(ctx.tickers)}/range/1y", {}, None)),
+    Scenario("range_5y_columnar", "daily_prices", lambda rng, ctx: (
+        "GET", f"/daily-prices/{rng.choice(ctx.tickers)}/range/5y", {"layout": "columnar"}, None)),
+    Scenario("range_all_downsampled", "daily_prices", lambda rng, ctx: (
+        "GET", f"/daily-prices/{rng.choice(ctx.tickers)}/range/all", {"max_points": 500}, None)),
+    Scenario("range_multi_20", "daily_prices", lambda rng, ctx: (
+        "POST", "/daily-prices/range", {},
+        {"tickers": rng.sample(ctx.tickers, min(20, len(ctx.tickers))), "time_range": "1y"})),
+    Scenario("ohlcv_monthly", "daily_prices", lambda rng, ctx: (
+        "GET", f"/daily-prices/{rng.choice(ctx.tickers)}/ohlcv", {"interval": "1M", "time_range": "5y"}, None)),
+    Scenario("indicators", "daily_prices", lambda rng, ctx: (
+        "GET", f"/daily-prices/{rng.choice(ctx.tickers)}/indicators",
+        {"set": "sma20,ema50,rsi14,macd,bb20,atr14", "time_range": "1y"}, None)),
+    Scenario("ingest_single", "daily_prices", lambda rng, ctx: (
+        "POST", "/daily-prices", {},
+        make_bar(rng.choice(ctx.tickers), ctx.ingest_times.take()[0], rng)), writes=True),
+    Scenario("ingest_batch_500", "daily_prices", lambda rng, ctx: (
+        "POST", "/daily-prices/batch", {},
+        {"items": [make_bar(rng.choice(ctx.tickers), when, rng) for when in ctx.ingest_times.take(500)]}),
+        writes=True),
+    # market
+    Scenario("market_snapshot", "market", lambda rng, ctx: (
+        "GET", "/market/snapshot", _exchange(rng, ctx), None)),
+    Scenario("market_movers", "market", lambda rng, ctx: (
+        "GET", "/market/movers", {"metric": rng.choice(["percent_change", "volume", "foreign_net_buy_value"])}, None)),
+    # analytics
+    Scenario("correlation_50", "analytics", lambda rng, ctx: (
+        "POST", "/analytics/correlation", {},
+        {"tickers": rng.sample(ctx.tickers, min(50, len(ctx.tickers))), "time_range": "1y"})),
+    # cache and ingest: cheap endpoints, the floor of the server overhead
+    Scenario("cache_stats", "cache", lambda rng, ctx: ("GET", "/cache/stats", {}, None)),
+    Scenario("ingest_stats", "ingest", lambda rng, ctx: ("GET", "/ingest/stats", {}, None)),
+]
+
+
+async def load_context(client: httpx.AsyncClient, prefix: str, max_securities: int) -> Context:
+    """Read securities and some existing price keys from the server."""
+    securities: List[Dict[str, Any]] = []
+    cursor = None
+    while len(securities) < max_securities:
+        params = {"limit": min(1000, max_securities - len(securities))}
+        if cursor:
+            params["cursor"] = cursor
+        response = await client.get(f"{prefix}/securities", params=params)
+        response.raise_for_status()
+        page = response.json()
+        securities.extend(page["items"])
+        cursor = page.get("next_cursor")
+        if not cursor:
+            break
+    if len(securities) < 2:
+        raise SystemExit("The server has fewer than two securities; load data with benchmarks.synthetic first")
+
+    price_keys: List[Tuple[str, str]] = []
+    for security in securities[:10]:
+        response = await client.get(
+            f"{prefix}/daily-prices",
+            params={"ticker": security["ticker"], "limit": 100, "total_mode": "none"},
+        )
+        response.raise_for_status()
+        price_keys.extend((item["ticker"], item["time"]) for item in response.json()["items"])
+
+    writable = [
+        {key: value for key, value in security.items() if key not in ("created_at", "updated_at")}
+        for security in securities
+    ]
+    return Context(
+        prefix=prefix,
+        tickers=[security["ticker"] for security in securities],
+        securities=writable,
+        exchanges=sorted({security["exchange"] for security in securities if security.get("exchange")}),
+        price_keys=price_keys or [(securities[0]["ticker"], INGEST_EPOCH.isoformat())],
+        ingest_times=IngestClock(),
+    )
+
+
+def summarize(latencies: List[float], elapsed: float, statuses: Counter) -> Dict[str, Any]:
+    """Throughput and latency percentiles of one scenario."""
+    milliseconds = np.array(latencies) * 1000.0
+    p50, p95, p99 = np.percentile(milliseconds, [50, 95, 99]) if len(milliseconds) else (np.nan,) * 3
+    return {
+        "requests": len(latencies),
+        "errors": sum(count for code, count in statuses.items() if code == "error" or code >= 400),
+        "seconds": round(elapsed, 3),
+        "requests_per_second": round(len(latencies) / elapsed, 1) if elapsed else None,
+        "p50_ms": round(float(p50), 2),
+        "p95_ms": round(float(p95), 2),
+        "p99_ms": round(float(p99), 2),
+        "statuses": {str(code): count for code, count in sorted(statuses.items(), key=str)},
+    }
+
+
+async def run_scenario(
+    client: httpx.AsyncClient, scenario: Scenario, ctx: Context, requests: int, warmup: int,
+    concurrency: int, seed: int,
+) -> Dict[str, Any]:
+    rng = random.Random(f"{seed}:{scenario.name}")
+    # Drawn up front so the timed loop only sends, and the seed fixes the mix
+    planned = [scenario.make(rng, ctx) for _ in range(warmup + requests)]
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+
+    async def send(request: Request, timed: bool) -> None:
+        method, path, params, body = request
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, ctx.prefix + path, params=params, json=body)
+            await response.aread()
+            code = response.status_code
+        except httpx.HTTPError:
+            code = "error"
+        if timed:
+            latencies.append(time.perf_counter() - started)
+            statuses[code] += 1
+
+    async def worker(queue: List[Request], timed: bool) -> None:
+        while queue:
+            await send(queue.pop(), timed)
+
+    warmup_queue = planned[:warmup][::-1]
+    await asyncio.gather(*(worker(warmup_queue, False) for _ in range(concurrency)))
+    queue = planned[warmup:][::-1]
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(queue, True) for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return {"route": scenario.route, **summarize(latencies, elapsed, statuses)}
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run(args: argparse.Namespace, scenarios: List[Scenario]) -> Dict[str, Any]:
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.url, limits=limits, timeout=args.timeout) as client:
+        ctx = await load_context(client, args.api_prefix, args.max_securities)
+        results = {}
+        for scenario in scenarios:
+            results[scenario.name] = await run_scenario(
+                client, scenario, ctx, args.requests, args.warmup, args.concurrency, args.seed
+            )
+            result = results[scenario.name]
+            print(
+                f"{scenario.name:<26} {result['requests_per_second']:>9} req/s"
+                f"  p50 {result['p50_ms']:>8} ms  p99 {result['p99_ms']:>8} ms  errors {result['errors']}",
+                flush=True,
+            )
+    return {
+        "meta": {
+            "url": args.url,
+            "commit": git_commit(),
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "requests": args.requests,
+            "warmup": args.warmup,
+            "concurrency": args.concurrency,
+            "seed": args.seed,
+            "securities": len(ctx.tickers),
+        },
+        "scenarios": results,
+    }
+
+
+def print_comparison(report: Dict[str, Any], baseline: Dict[str, Any]) -> None:
+    """Change of throughput and latency per scenario against a baseline report."""
+    print(f"\nagainst {baseline['meta'].get('commit')} ({baseline['meta'].get('started_at')}):")
+    print(f"{'scenario':<26} {'req/s':>9} {'p50':>9} {'p95':>9} {'p99':>9}")
+    for name, result in report["scenarios"].items():
+        before = baseline["scenarios"].get(name)
+        if before is None:
+            continue
+        changes = []
+        for key in ("requests_per_second", "p50_ms", "p95_ms", "p99_ms"):
+            if before.get(key) and result.get(key) is not None:
+                changes.append(f"{(result[key] / before[key] - 1) * 100:>+8.1f}%")
+            else:
+                changes.append(f"{'n/a':>9}")
+        print(f"{name:<26} " + " ".join(changes))
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--api-prefix", default="/api/v1")
+    parser.add_argument("--scenario", action="append", dest="scenarios", choices=[s.name for s in SCENARIOS],
+                        help="Scenario to run; repeatable, all by default")
+    parser.add_argument("--no-writes", action="store_true", help="Skip the scenarios that write")
+    parser.add_argument("--requests", type=int, default=500, help="Timed requests per scenario")
+    parser.add_argument("--warmup", type=int, default=50, help="Untimed requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-securities", type=int, default=2000, help="Securities to draw tickers from")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--output", help="Write the JSON report to this file instead of stdout")
+    parser.add_argument("--compare", help="JSON report of an earlier run to compare against")
+    args = parser.parse_args(argv)
+
+    scenarios = [
+        scenario for scenario in SCENARIOS
+        if (not args.scenarios or scenario.name in args.scenarios) and not (args.no_writes and scenario.writes)
+    ]
+    report = asyncio.run(run(args, scenarios))
+    document = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as output:
+            output.write(document + "\n")
+    else:
+        print(document)
+    if args.compare:
+        with open(args.compare) as baseline:
+            print_comparison(report, json.load(baseline))
+
+
+if __name__ == "__main__":
+    main()
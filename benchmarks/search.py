@@ -0,0 +1,62 @@
+"""
+Measure the securities autocomplete index: build time and per-keystroke
+latency (p50/p95/p99) on synthetic securities with Vietnamese-style names,
+typing each query one character at a time as a search box does.
+
+Usage:
+    python -m benchmarks.search --securities 2000
+"""
+import argparse
+import random
+import time
+
+import numpy as np
+
+from app.utils.securities_catalog import SecurityRecord
+from app.utils.securities_search import SearchIndex
+
+NAME_WORDS = [
+    "Công ty", "Cổ phần", "Tập đoàn", "Đầu tư", "Xây dựng", "Ngân hàng", "Thương mại",
+    "Chứng khoán", "Bất động sản", "Thép", "Nhựa", "Dược phẩm", "Việt Nam", "Sài Gòn",
+    "Hà Nội", "Điện lực", "Dầu khí", "Thủy sản", "Vận tải", "Phát triển",
+]
+
+QUERIES = ["vnm", "ngan hang", "chung khoan sai gon", "dau khi", "thep viet", "duoc pham", "xay dugn", "đầu tư"]
+
+
+def make_securities(count: int, seed: int = 7):
+    rnd = random.Random(seed)
+    empty = SecurityRecord._make([None] * len(SecurityRecord._fields))
+    securities = []
+    for i in range(count):
+        ticker = "".join(rnd.choice("ABCDEFGHKLMNPQRSTVX") for _ in range(3)) + (str(i) if i >= 1000 else "")
+        name = " ".join(rnd.sample(NAME_WORDS, 5))
+        securities.append(empty._replace(ticker=ticker, company_name=name, short_name=name.split()[-1]))
+    return securities
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--securities", type=int, default=2000)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    securities = make_securities(args.securities)
+    started = time.perf_counter()
+    index = SearchIndex(securities)
+    print(f"index of {args.securities} securities built in {(time.perf_counter() - started) * 1000:.1f} ms")
+
+    latencies = []
+    for _ in range(args.repeat):
+        for query in QUERIES:
+            for end in range(1, len(query) + 1):
+                started = time.perf_counter()
+                index.search(query[:end], args.limit)
+                latencies.append(time.perf_counter() - started)
+    p50, p95, p99 = np.percentile(np.array(latencies) * 1000.0, [50, 95, 99])
+    print(f"{len(latencies)} keystrokes: p50 {p50:.3f} ms, p95 {p95:.3f} ms, p99 {p99:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
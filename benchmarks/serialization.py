@@ -0,0 +1,76 @@
+"""
+Compare the pydantic response path (model per row, computed fields, JSON
+dump) of the daily price list with the orjson column-wise serializer, on
+synthetic rows shaped like a daily_prices query result, and check that both
+produce the same bytes.
+
+Usage:
+    python -m benchmarks.serialization --rows 50000
+"""
+import argparse
+import time
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+from app.crud.daily_prices import DAILY_PRICE_COLUMNS
+from app.schemas.daily_prices import ExtendedDailyPriceList
+from app.utils.fast_json import DAILY_PRICE_LIST_JSON
+from app.utils.http_cache import model_response
+
+DailyPriceRow = namedtuple("DailyPriceRow", list(DAILY_PRICE_COLUMNS))
+
+
+def make_rows(count: int):
+    """Result rows in daily_prices column order, Numeric columns as Decimal."""
+    start = datetime(2000, 1, 3, 7, tzinfo=timezone.utc)
+    rows = []
+    price = 25_000.0
+    for i in range(count):
+        price = max(1_000.0, price * (1.0 + ((i * 7919) % 200 - 100) / 10_000.0))
+        volume = 100_000 + (i * 104_729) % 5_000_000
+        money = Decimal(f"{price * volume * 0.5:.2f}")
+        rows.append(DailyPriceRow(
+            start + timedelta(days=i),
+            "BENCH",
+            Decimal(f"{price * 0.99:.2f}"), Decimal(f"{price * 1.02:.2f}"),
+            Decimal(f"{price * 0.98:.2f}"), Decimal(f"{price:.2f}"),
+            volume, Decimal(f"{price * 0.01:.2f}"), 0.01,
+            money, money, Decimal(f"{price * 1_000.0:.2f}"),
+            volume // 2, volume // 2, 1_000,
+        ))
+    return rows
+
+
+def timed(func, repeat: int):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    payload = {"items": rows, "total": len(rows), "next_cursor": None}
+
+    pydantic_seconds, pydantic_response = timed(
+        lambda: model_response(ExtendedDailyPriceList, payload), args.repeat
+    )
+    orjson_seconds, orjson_response = timed(lambda: DAILY_PRICE_LIST_JSON.response(payload), args.repeat)
+
+    print(f"rows: {args.rows}, body: {len(orjson_response.body) / 1e6:.1f} MB")
+    print(f"pydantic: {pydantic_seconds * 1000:8.1f} ms")
+    print(f"orjson:   {orjson_seconds * 1000:8.1f} ms ({pydantic_seconds / orjson_seconds:.1f}x)")
+    print(f"identical bytes: {pydantic_response.body == orjson_response.body}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Measure the per-call overhead of the hot lookups (security by ticker, daily
+price by key, latest price time) as statements rebuilt on every call, as
+lambda statements and as the prebuilt statements of the CRUD layer.
+
+Runs against an in-memory SQLite database, so it measures the API-side cost
+(statement construction, cache key, compilation, ORM loading); the saved
+server-side parsing from prepared statements comes on top with asyncpg.
+
+Usage:
+    python -m benchmarks.statement_cache --calls 5000
+"""
+import argparse
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import create_engine, func, lambda_stmt, select
+from sqlalchemy.orm import Session
+
+from app.crud.daily_prices import DAILY_PRICE_BY_KEY_STMT, latest_time_query
+from app.crud.securities import SECURITY_BY_TICKER_STMT
+from app.models.daily_prices import DailyPrice
+from app.models.securities import Securities
+
+TICKERS = [f"T{i:03d}" for i in range(200)]
+START = datetime(2024, 1, 2, tzinfo=timezone.utc)
+
+
+def make_session() -> Session:
+    engine = create_engine("sqlite://")
+    Securities.__table__.create(engine)
+    DailyPrice.__table__.create(engine)
+    db = Session(engine)
+    db.add_all(Securities(ticker=ticker, company_name=ticker) for ticker in TICKERS)
+    db.flush()
+    db.add_all(
+        DailyPrice(time=START + timedelta(days=day), ticker=ticker, close_price=100)
+        for ticker in TICKERS
+        for day in range(5)
+    )
+    db.commit()
+    return db
+
+
+def security_lambda(ticker: str):
+    return lambda_stmt(lambda: select(Securities).where(Securities.ticker == ticker))
+
+
+def daily_price_lambda(ticker: str, time: datetime):
+    return lambda_stmt(lambda: select(DailyPrice).where(DailyPrice.time == time, DailyPrice.ticker == ticker))
+
+
+def latest_time_lambda(ticker: str):
+    return lambda_stmt(lambda: select(func.max(DailyPrice.time)).where(DailyPrice.ticker == ticker))
+
+
+def per_call_us(db: Session, lookup, calls: int) -> float:
+    """Best of three runs; the identity map is cleared so every call loads."""
+    best = float("inf")
+    for _ in range(3):
+        started = time.perf_counter()
+        for i in range(calls):
+            lookup(i)
+            db.expunge_all()
+        best = min(best, time.perf_counter() - started)
+    return best * 1e6 / calls
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=5000)
+    args = parser.parse_args()
+
+    db = make_session()
+
+    def ticker(i: int) -> str:
+        return TICKERS[i % len(TICKERS)]
+
+    def day(i: int) -> datetime:
+        return START + timedelta(days=i % 5)
+
+    cases = {
+        "security by ticker": {
+            "query": lambda i: db.query(Securities).filter(Securities.ticker == ticker(i)).first(),
+            "select": lambda i: db.execute(select(Securities).where(Securities.ticker == ticker(i))).scalars().first(),
+            "lambda": lambda i: db.execute(security_lambda(ticker(i))).scalars().first(),
+            "prebuilt": lambda i: db.execute(SECURITY_BY_TICKER_STMT, {"ticker": ticker(i)}).scalars().first(),
+        },
+        "daily price by key": {
+            "get": lambda i: db.get(DailyPrice, (day(i), ticker(i))),
+            "select": lambda i: db.execute(
+                select(DailyPrice).where(DailyPrice.time == day(i), DailyPrice.ticker == ticker(i))
+            ).scalars().first(),
+            "lambda": lambda i: db.execute(daily_price_lambda(ticker(i), day(i))).scalars().first(),
+            "prebuilt": lambda i: db.execute(
+                DAILY_PRICE_BY_KEY_STMT, {"time": day(i), "ticker": ticker(i)}
+            ).scalars().first(),
+        },
+        "latest price time": {
+            "select": lambda i: db.execute(
+                select(func.max(DailyPrice.time)).where(DailyPrice.ticker == ticker(i))
+            ).scalar(),
+            "lambda": lambda i: db.execute(latest_time_lambda(ticker(i))).scalar(),
+            "prebuilt": lambda i: db.execute(*latest_time_query(ticker(i))).scalar(),
+        },
+    }
+
+    print(f"{'lookup':<20} {'variant':<9} {'us/call':>9} {'vs first':>9}")
+    for name, variants in cases.items():
+        baseline = None
+        for variant, lookup in variants.items():
+            lookup(0)
+            elapsed = per_call_us(db, lookup, args.calls)
+            baseline = baseline or elapsed
+            print(f"{name:<20} {variant:<9} {elapsed:>9.1f} {baseline / elapsed:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""
+Reproducible synthetic market data for the benchmark suite: securities and
+daily prices for N tickers x M years, from a seed.
+
+Close prices follow a geometric Brownian motion per ticker (drift and
+volatility drawn per ticker, a common market factor shared by all), rounded
+to 10 VND ticks. Open gaps from the previous close; high and low bracket
+open and close by a random intraday range. Volumes are log-normal, larger
+on days with large moves; order values and quantities split the turnover
+between buyers and sellers, and foreign net flows are an AR(1) share of it.
+The series end on --end (today by default) so the relative time ranges of
+the API (1m, 1y, ...) find data.
+
+Files are written in the formats the loaders read:
+
+    python -m benchmarks.synthetic --tickers 200 --years 10 --out data/synthetic
+    python -m app.utils.import_securities data/synthetic/securities.csv
+    python -m app.utils.bulk_load_daily_prices data/synthetic/daily_prices.parquet --workers 8
+
+or loaded directly into the configured database with --load.
+"""
+import argparse
+import string
+from datetime import date
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+TRADING_DAYS_PER_YEAR = 252
+TICK = 10.0
+EXCHANGES = ["HOSE", "HNX", "UPCOM"]
+EXCHANGE_WEIGHTS = [0.45, 0.2, 0.35]
+NAME_WORDS = [
+    "Công ty", "Cổ phần", "Tập đoàn", "Đầu tư", "Xây dựng", "Ngân hàng", "Thương mại",
+    "Chứng khoán", "Bất động sản", "Thép", "Nhựa", "Dược phẩm", "Việt Nam", "Sài Gòn",
+    "Hà Nội", "Điện lực", "Dầu khí", "Thủy sản", "Vận tải", "Phát triển",
+]
+
+
+def make_tickers(count: int, rng: np.random.Generator) -> list:
+    """Unique three-letter tickers (four letters once those run out)."""
+    letters = np.array(list(string.ascii_uppercase))
+    length = 3 if count <= 26 ** 3 // 2 else 4
+    tickers = set()
+    while len(tickers) < count:
+        tickers.update("".join(chars) for chars in rng.choice(letters, size=(count, length)))
+    return sorted(tickers)[:count]
+
+
+def generate_securities(count: int, seed: int = 0) -> pd.DataFrame:
+    """Securities rows with the SecuritiesCreate columns."""
+    rng = np.random.default_rng(seed)
+    tickers = make_tickers(count, rng)
+    shares = (rng.lognormal(np.log(100e6), 1.2, count) // 1000 * 1000).astype(np.int64)
+    words = [rng.choice(len(NAME_WORDS), 4, replace=False) for _ in range(count)]
+    names = [" ".join(NAME_WORDS[i] for i in chosen) for chosen in words]
+    return pd.DataFrame({
+        "ticker": tickers,
+        "isin_code": [f"VN000000{ticker:0<4}" for ticker in tickers],
+        "company_name": [f"{name} {ticker}" for name, ticker in zip(names, tickers)],
+        "short_name": [f"{NAME_WORDS[chosen[-1]]} {ticker}" for chosen, ticker in zip(words, tickers)],
+        "exchange": rng.choice(EXCHANGES, count, p=EXCHANGE_WEIGHTS),
+        "country_code": "VN",
+        "charter_capital": shares * 10_000,
+        "issued_shares": shares,
+        "outstanding_shares": shares,
+        "free_float_rate": np.round(rng.uniform(0.1, 0.9, count), 4),
+        "margin_status": rng.choice(["allowed", "not_allowed"], count, p=[0.6, 0.4]),
+        "status": "active",
+    })
+
+
+def generate_daily_prices(
+    tickers: list, years: float, seed: int = 0, end: Optional[date] = None
+) -> pd.DataFrame:
+    """
+    Daily price rows with the daily_prices columns for every ticker over
+    the last years of business days, ordered by ticker then time.
+    """
+    rng = np.random.default_rng(seed + 1)
+    days = pd.bdate_range(end=pd.Timestamp(end or date.today()), periods=int(years * TRADING_DAYS_PER_YEAR))
+    times = days.tz_localize("Asia/Ho_Chi_Minh").tz_convert("UTC")
+    n_days, n_tickers = len(days), len(tickers)
+
+    # Log returns: per-ticker drift and volatility plus a common market factor
+    dt = 1.0 / TRADING_DAYS_PER_YEAR
+    mu = rng.normal(0.08, 0.1, n_tickers)
+    sigma = rng.uniform(0.2, 0.6, n_tickers)
+    beta = rng.uniform(0.5, 1.5, n_tickers)
+    market = rng.normal(0.0, 0.15 * np.sqrt(dt), (n_days, 1))
+    idiosyncratic = rng.normal(0.0, 1.0, (n_days, n_tickers)) * sigma * np.sqrt(dt)
+    returns = (mu - 0.5 * sigma ** 2) * dt + beta * market + idiosyncratic
+
+    start_price = rng.lognormal(np.log(25_000), 0.8, n_tickers)
+    close = np.maximum(np.round(start_price * np.exp(np.cumsum(returns, axis=0)) / TICK) * TICK, TICK)
+    previous = np.vstack([np.round(start_price / TICK) * TICK, close[:-1]])
+    gap = rng.normal(0.0, 0.3, (n_days, n_tickers)) * sigma * np.sqrt(dt)
+    open_ = np.maximum(np.round(previous * np.exp(gap) / TICK) * TICK, TICK)
+    spread = np.abs(rng.normal(0.0, 0.5, (n_days, n_tickers))) * sigma * np.sqrt(dt)
+    high = np.round(np.maximum(open_, close) * (1.0 + spread) / TICK) * TICK
+    low = np.maximum(np.round(np.minimum(open_, close) * (1.0 - spread) / TICK) * TICK, TICK)
+
+    # Volume rises with the size of the move
+    base_volume = rng.lognormal(np.log(500_000), 1.0, n_tickers)
+    surprise = np.abs(returns) / (sigma * np.sqrt(dt))
+    volume = (base_volume * rng.lognormal(0.0, 0.4, (n_days, n_tickers)) * (1.0 + surprise)).astype(np.int64) // 100 * 100
+    turnover = volume * close
+
+    buy_share = np.clip(0.5 + 2.0 * returns + rng.normal(0.0, 0.05, (n_days, n_tickers)), 0.05, 0.95)
+    buy_quantity = (volume * buy_share).astype(np.int64)
+    foreign_share = np.zeros((n_days, n_tickers))
+    shocks = rng.normal(0.0, 0.03, (n_days, n_tickers))
+    for day in range(1, n_days):
+        foreign_share[day] = 0.7 * foreign_share[day - 1] + shocks[day]
+    foreign_quantity = (volume * foreign_share).astype(np.int64)
+
+    price_change = close - previous
+    frame = pd.DataFrame({
+        "time": np.tile(times, n_tickers),
+        "ticker": np.repeat(tickers, n_days),
+    })
+    columns = {
+        "open_price": open_, "high_price": high, "low_price": low, "close_price": close,
+        "volume": volume, "price_change": price_change, "percent_change": np.round(price_change / previous, 6),
+        "buy_order_value": np.round(buy_quantity * close, 2),
+        "sell_order_value": np.round((volume - buy_quantity) * close, 2),
+        "foreign_net_buy_value": np.round(foreign_share * turnover, 2),
+        "buy_order_quantity": buy_quantity, "sell_order_quantity": volume - buy_quantity,
+        "foreign_net_buy_quantity": foreign_quantity,
+    }
+    for name, values in columns.items():
+        # Column-major so each ticker's days stay together
+        frame[name] = values.T.reshape(-1)
+    return frame
+
+
+def main(argv: Optional[list] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tickers", type=int, default=200)
+    parser.add_argument("--years", type=float, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--end", type=date.fromisoformat, default=None, help="Last trading day; today by default")
+    parser.add_argument("--out", type=Path, default=Path("data/synthetic"))
+    parser.add_argument("--load", action="store_true", help="Also load the files into the configured database")
+    args = parser.parse_args(argv)
+
+    args.out.mkdir(parents=True, exist_ok=True)
+    securities = generate_securities(args.tickers, args.seed)
+    prices = generate_daily_prices(list(securities["ticker"]), args.years, args.seed, args.end)
+    securities_path = args.out / "securities.csv"
+    prices_path = args.out / "daily_prices.parquet"
+    securities.to_csv(securities_path, index=False)
+    prices.to_parquet(prices_path, index=False)
+    print(f"{len(securities)} securities -> {securities_path}, {len(prices)} daily prices -> {prices_path}")
+
+    if args.load:
+        # Imported here so generating files needs no database settings
+        from app.utils.bulk_load_daily_prices import load_files
+        from app.utils.import_securities import import_securities
+
+        import_securities(securities_path)
+        load_files([prices_path], mode="upsert")
+
+
+if __name__ == "__main__":
+    main()
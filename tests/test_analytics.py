@@ -0,0 +1,58 @@
+from collections import namedtuple
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.utils.analytics import log_returns, matrix_to_lists, pairwise_matrix, pivot_prices
+
+Row = namedtuple("Row", "ticker time close")
+
+
+def test_pivot_prices():
+    rows = [
+        Row("FPT", date(2024, 1, 3), 95.0),
+        Row("VNM", date(2024, 1, 2), 70.0),
+        Row("VNM", date(2024, 1, 3), 71.0),
+    ]
+    dates, prices = pivot_prices(rows, ["VNM", "FPT"])
+    assert list(dates) == [date(2024, 1, 2), date(2024, 1, 3)]
+    np.testing.assert_array_equal(prices, [[70.0, np.nan], [71.0, 95.0]])
+
+    dates, prices = pivot_prices([], ["VNM"])
+    assert len(dates) == 0 and prices.shape == (0, 1)
+
+
+def test_log_returns_do_not_bridge_gaps():
+    prices = np.array([[100.0], [np.nan], [110.0], [121.0], [0.0]])
+    returns = log_returns(prices)
+    assert np.isnan(returns[:2, 0]).all()
+    assert returns[2, 0] == pytest.approx(np.log(1.1))
+    assert np.isnan(returns[3, 0])
+
+
+@pytest.mark.parametrize("kind", ["correlation", "covariance"])
+def test_pairwise_matrix_matches_pandas(kind):
+    rng = np.random.default_rng(3)
+    returns = rng.normal(0, 0.02, (250, 6))
+    returns[:, 1] += returns[:, 0]
+    # Missing returns on different dates for every column
+    returns[rng.random(returns.shape) < 0.1] = np.nan
+    returns[:240, 5] = np.nan
+
+    result, counts = pairwise_matrix(returns, kind, min_periods=20)
+    frame = pd.DataFrame(returns)
+    expected = frame.corr(min_periods=20) if kind == "correlation" else frame.cov(min_periods=20)
+    np.testing.assert_allclose(result, expected.to_numpy(), rtol=1e-9, atol=1e-12)
+    valid = (~np.isnan(returns)).astype(int)
+    np.testing.assert_array_equal(counts, valid.T @ valid)
+
+
+def test_pairs_without_enough_common_dates_are_nan():
+    returns = np.array([[0.01, np.nan], [0.02, np.nan], [0.03, 0.01]])
+    result, counts = pairwise_matrix(returns)
+    assert result[0, 0] == pytest.approx(1.0)
+    assert np.isnan(result[0, 1]) and np.isnan(result[1, 1])
+    assert counts.tolist() == [[3, 1], [1, 1]]
+    assert matrix_to_lists(result) == [[pytest.approx(1.0), None], [None, None]]
@@ -0,0 +1,64 @@
+import pandas as pd
+import pytest
+
+from app.utils.bulk_load_daily_prices import COLUMNS, LoadStats, validate_batch
+
+KNOWN = {"VNM", "FPT"}
+
+
+def raw(**overrides):
+    frame = {
+        "time": ["2024-01-02", "2024-01-02", "2024-01-03"],
+        "ticker": ["VNM", " FPT ", "VNM"],
+        "close_price": ["70.5", "95", "71"],
+        "volume": [1000, 2000, 3000],
+    }
+    frame.update(overrides)
+    return pd.DataFrame(frame)
+
+
+def test_valid_rows_are_coerced():
+    stats = LoadStats()
+    out = validate_batch(raw(), KNOWN, stats)
+    assert list(out.columns) == COLUMNS
+    assert stats.rejected == {}
+    assert list(out["ticker"]) == ["VNM", "FPT", "VNM"]
+    assert str(out["time"].dt.tz) == "UTC"
+    assert list(out["close_price"]) == [70.5, 95.0, 71.0]
+    assert str(out["volume"].dtype) == "Int64"
+    # Columns absent from the file are loaded as NULL
+    assert out["open_price"].isna().all()
+
+
+@pytest.mark.parametrize("overrides, reason", [
+    ({"time": ["2024-01-02", "not a date", "2024-01-03"]}, "invalid_time"),
+    ({"ticker": ["VNM", "WAYTOOLONGTICKER", "VNM"]}, "invalid_ticker"),
+    ({"ticker": ["VNM", "ZZZ", "VNM"]}, "unknown_ticker"),
+    ({"close_price": ["70.5", "abc", "71"]}, "invalid_close_price"),
+    ({"close_price": ["70.5", "1e20", "71"]}, "invalid_close_price"),
+    ({"volume": [1000, 2000.5, 3000]}, "invalid_volume"),
+    ({"volume": [1000, 2 ** 64, 3000]}, "invalid_volume"),
+])
+def test_invalid_rows_are_rejected_by_reason(overrides, reason):
+    stats = LoadStats()
+    out = validate_batch(raw(**overrides), KNOWN, stats)
+    assert stats.rejected == {reason: 1}
+    assert len(out) == 2
+
+
+def test_row_is_counted_once_under_its_first_failure():
+    stats = LoadStats()
+    validate_batch(raw(ticker=["VNM", "ZZZ", "VNM"], close_price=["70.5", "abc", "71"]), KNOWN, stats)
+    assert stats.rejected == {"unknown_ticker": 1}
+
+
+def test_last_duplicate_wins():
+    stats = LoadStats()
+    out = validate_batch(raw(time=["2024-01-02", "2024-01-02", "2024-01-02"], ticker=["VNM", "FPT", "VNM"]), KNOWN, stats)
+    assert stats.rejected == {"duplicate_in_file": 1}
+    assert out.set_index("ticker").loc["VNM", "close_price"] == 71.0
+
+
+def test_missing_key_column():
+    with pytest.raises(ValueError, match="ticker"):
+        validate_batch(pd.DataFrame({"time": ["2024-01-02"]}), KNOWN, LoadStats())
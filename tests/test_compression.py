@@ -0,0 +1,100 @@
+import asyncio
+import gzip
+import zlib
+
+import brotli
+import pytest
+import zstandard
+
+from app.core.compression import CompressionMiddleware, negotiate_encoding
+
+ENCODINGS = ["zstd", "br", "gzip"]
+
+
+@pytest.mark.parametrize("header, expected", [
+    (None, None),
+    ("", None),
+    ("gzip", "gzip"),
+    ("gzip, br", "br"),
+    ("gzip;q=1.0, br;q=0.5", "gzip"),
+    ("br;q=0, gzip;q=0.1", "gzip"),
+    ("*", "zstd"),
+    ("*;q=0.5, zstd;q=0", "br"),
+    ("identity", None),
+    ("GZIP;Q=0.8", "gzip"),
+    ("gzip;q=oops", None),
+])
+def test_negotiate_encoding(header, expected):
+    assert negotiate_encoding(header, ENCODINGS) == expected
+
+
+def streaming_app(chunks, media_type=b"application/x-ndjson"):
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", media_type)]})
+        for chunk in chunks:
+            await send({"type": "http.response.body", "body": chunk, "more_body": True})
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
+    return app
+
+
+def body_app(body, etag=b'"abc"'):
+    async def app(scope, receive, send):
+        await send({
+            "type": "http.response.start", "status": 200,
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode()), (b"etag", etag)],
+        })
+        await send({"type": "http.response.body", "body": body, "more_body": False})
+    return app
+
+
+def run(app, accept_encoding, **kwargs):
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    scope = {"type": "http", "headers": [(b"accept-encoding", accept_encoding.encode())]}
+    asyncio.run(CompressionMiddleware(app, **kwargs)(scope, receive, send))
+    return messages[0], [message for message in messages[1:] if message["type"] == "http.response.body"]
+
+
+DECOMPRESSORS = {
+    "gzip": lambda: zlib.decompressobj(16 + zlib.MAX_WBITS).decompress,
+    "br": lambda: brotli.Decompressor().process,
+    "zstd": lambda: zstandard.ZstdDecompressor().decompressobj().decompress,
+}
+
+
+@pytest.mark.parametrize("coding", ENCODINGS)
+def test_streamed_chunks_decode_as_they_arrive(coding):
+    chunks = [b'{"ticker":"VNM","close":%d}\n' % i * 50 for i in range(5)]
+    start, bodies = run(streaming_app(chunks), coding)
+    headers = dict(start["headers"])
+    assert headers[b"content-encoding"] == coding.encode()
+    assert b"content-length" not in headers
+
+    # Every chunk is flushed, so what arrived so far decodes to what was sent
+    decompress = DECOMPRESSORS[coding]()
+    for chunk, message in zip(chunks, bodies):
+        assert message["more_body"]
+        assert decompress(message["body"]) == chunk
+    assert not bodies[-1]["more_body"]
+
+
+@pytest.mark.parametrize("threadpool_min_size", [0, 10 ** 9])
+def test_complete_body_is_compressed_once(threadpool_min_size):
+    body = b'{"items":[' + b",".join(b'{"close":%d}' % i for i in range(5000)) + b"]}"
+    start, (message,) = run(body_app(body), "gzip", threadpool_min_size=threadpool_min_size)
+    headers = dict(start["headers"])
+    assert headers[b"etag"] == b'W/"abc"'
+    assert int(headers[b"content-length"]) == len(message["body"])
+    assert gzip.decompress(message["body"]) == body
+
+
+def test_small_body_is_sent_as_is():
+    start, (message,) = run(body_app(b'{"total":0}'), "gzip")
+    assert b"content-encoding" not in dict(start["headers"])
+    assert message["body"] == b'{"total":0}'
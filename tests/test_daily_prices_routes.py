@@ -0,0 +1,44 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.v1.routes import daily_prices as routes
+from app.core.dependencies import get_async_db, get_db
+
+
+def watermark_must_not_be_read(*args, **kwargs):
+    raise AssertionError("the watermark was read for an unknown ticker")
+
+
+async def async_watermark_must_not_be_read(*args, **kwargs):
+    watermark_must_not_be_read()
+
+
+async def no_security(db, ticker):
+    return None
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(routes.securities_async, "get_security_by_ticker", no_security)
+    monkeypatch.setattr(routes.securities_crud, "get_security_by_ticker", lambda db, ticker: None)
+    monkeypatch.setattr(routes.daily_prices_async, "get_price_watermark", async_watermark_must_not_be_read)
+    monkeypatch.setattr(routes.daily_prices_crud, "get_price_watermark", watermark_must_not_be_read)
+
+    app = FastAPI()
+    app.include_router(routes.router)
+    app.dependency_overrides[get_db] = lambda: None
+    app.dependency_overrides[get_async_db] = lambda: None
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("url", [
+    "/daily-prices/GONE/range/1y",
+    "/daily-prices/GONE/range/1y?format=csv",
+    "/daily-prices/GONE/ohlcv?interval=1w",
+    "/daily-prices/GONE/indicators?set=sma20",
+])
+def test_unknown_ticker_is_404_even_with_if_none_match(client, url):
+    response = client.get(url, headers={"If-None-Match": "*"})
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Security with ticker GONE not found"
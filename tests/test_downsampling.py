@@ -0,0 +1,64 @@
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from app.utils.downsampling import downsample_rows, lttb_indices, minmax_indices
+
+Row = namedtuple("Row", ["time", "close_price"])
+
+
+def series(n: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    return np.arange(n, dtype=np.float64), np.cumsum(rng.normal(size=n))
+
+
+@pytest.mark.parametrize("method", [lttb_indices, minmax_indices])
+@pytest.mark.parametrize("max_points", [1, 2, 3, 4, 5, 10, 101])
+def test_at_most_max_points_keeping_the_ends(method, max_points):
+    x, y = series(1000)
+    indices = method(x, y, max_points)
+    assert 0 < len(indices) <= max_points
+    assert indices[0] == 0
+    if max_points >= 2:
+        assert indices[-1] == len(x) - 1
+    assert np.all(np.diff(indices) > 0)
+
+
+@pytest.mark.parametrize("method", [lttb_indices, minmax_indices])
+def test_short_series_is_returned_whole(method):
+    x, y = series(5)
+    assert list(method(x, y, 10)) == [0, 1, 2, 3, 4]
+
+
+def test_minmax_keeps_bucket_extremes():
+    x, y = series(1000)
+    y[500] = 100.0
+    y[700] = -100.0
+    indices = minmax_indices(x, y, 10)
+    assert 500 in indices and 700 in indices
+
+
+def test_lttb_keeps_a_spike():
+    x = np.arange(1000, dtype=np.float64)
+    y = np.zeros(1000)
+    y[321] = 50.0
+    assert 321 in lttb_indices(x, y, 20)
+
+
+def test_nan_values_are_not_selected():
+    x, y = series(1000)
+    y[1:-1:2] = np.nan
+    for method in (lttb_indices, minmax_indices):
+        indices = method(x, y, 50)
+        assert not np.isnan(y[indices]).any()
+
+
+@pytest.mark.parametrize("method", ["lttb", "minmax"])
+def test_downsample_rows_with_three_points(method):
+    start = datetime(2020, 1, 1, tzinfo=timezone.utc)
+    rows = [Row(start + timedelta(days=i), float(i % 17)) for i in range(1000)]
+    result = downsample_rows(rows, 3, method)
+    assert len(result) == 3
+    assert result[0] is rows[0] and result[-1] is rows[-1]
@@ -0,0 +1,90 @@
+from collections import namedtuple
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+
+from app.schemas.daily_prices import ExtendedDailyPriceList, ExtendedDailyPriceResponse
+from app.schemas.securities import SecuritiesList
+from app.utils.fast_json import DAILY_PRICE_LIST_JSON, SECURITIES_LIST_JSON
+from app.utils.http_cache import model_response
+from app.utils.securities_catalog import SecurityRecord
+
+DailyPriceRow = namedtuple("DailyPriceRow", list(ExtendedDailyPriceResponse.model_fields))
+
+ICT = timezone(timedelta(hours=7))
+
+
+def price_row(time, **values):
+    row = dict.fromkeys(DailyPriceRow._fields)
+    row.update(time=time, ticker="VNM", **values)
+    return DailyPriceRow(**row)
+
+
+ROWS = [
+    # Numeric columns come back as Decimal
+    price_row(
+        datetime(2024, 1, 2, 7, 0, tzinfo=timezone.utc),
+        open_price=Decimal("70100.00"), high_price=Decimal("71000.50"), low_price=Decimal("69900.10"),
+        close_price=Decimal("70500.25"), volume=1_234_567, price_change=Decimal("-0.10"), percent_change=-0.0014,
+        buy_order_value=Decimal("123456789012.34"), sell_order_value=Decimal("0.00"),
+        foreign_net_buy_value=Decimal("-987654.32"), buy_order_quantity=10, sell_order_quantity=0,
+        foreign_net_buy_quantity=-5,
+    ),
+    # Every optional field None
+    price_row(datetime(2024, 1, 3, 7, 0, tzinfo=timezone.utc)),
+    # Naive and non-UTC times, microseconds
+    price_row(datetime(2024, 1, 4, 7, 0, 0, 123456), close_price=Decimal("1.5"), volume=2),
+    price_row(datetime(2024, 1, 5, 14, 30, tzinfo=ICT), close_price=0.1 + 0.2, percent_change=1e-7, volume=0),
+]
+
+
+def assert_same_bytes(serializer, list_model, payload):
+    assert serializer.response(payload).body == model_response(list_model, payload).body
+
+
+def test_daily_price_rows_match_pydantic():
+    assert_same_bytes(DAILY_PRICE_LIST_JSON, ExtendedDailyPriceList, {"items": ROWS, "total": 4, "next_cursor": "abc"})
+
+
+def test_objects_out_of_field_order_match_pydantic():
+    objects = [SimpleNamespace(**dict(reversed(list(row._asdict().items())))) for row in ROWS]
+    assert_same_bytes(DAILY_PRICE_LIST_JSON, ExtendedDailyPriceList, {"items": objects, "total": None})
+
+
+def test_empty_page_matches_pydantic():
+    assert_same_bytes(DAILY_PRICE_LIST_JSON, ExtendedDailyPriceList, {"items": [], "total": 0})
+
+
+@pytest.mark.parametrize("value", [1e15, 9.999e15, 1e16, 1.5e20, Decimal("99999999999999999.99")])
+def test_very_large_values_match_pydantic(value):
+    rows = [price_row(datetime(2024, 1, 2, tzinfo=timezone.utc), buy_order_value=value, close_price=1000.0, volume=10)]
+    assert_same_bytes(DAILY_PRICE_LIST_JSON, ExtendedDailyPriceList, {"items": rows, "total": 1})
+
+
+def test_very_large_computed_values_match_pydantic():
+    # totalValue = volume * close_price crosses the limit on its own
+    rows = [price_row(datetime(2024, 1, 2, tzinfo=timezone.utc), close_price=Decimal("100000.00"), volume=10 ** 12)]
+    assert_same_bytes(DAILY_PRICE_LIST_JSON, ExtendedDailyPriceList, {"items": rows, "total": 1})
+
+
+def test_securities_records_match_pydantic():
+    record = dict.fromkeys(SecurityRecord._fields)
+    records = [
+        SecurityRecord(**{
+            **record,
+            "ticker": "VNM", "company_name": "Công ty Cổ phần Sữa Việt Nam", "short_name": "Vinamilk",
+            "exchange": "HOSE", "listing_date": date(2006, 1, 19), "initial_listing_price": Decimal("53000.00"),
+            "charter_capital": 20_899_554_450_000, "issued_shares": 2_089_955_445, "free_float_rate": 0.35,
+            "margin_status": "allowed", "status": "active",
+            "created_at": datetime(2024, 1, 1, tzinfo=timezone.utc),
+            "updated_at": datetime(2024, 6, 1, 9, 15, 30, 500000, tzinfo=ICT),
+        }),
+        SecurityRecord(**{
+            **record,
+            "ticker": "ZZZ", "company_name": "Quote \" and \\ backslash  ",
+            "created_at": datetime(2024, 1, 1), "updated_at": datetime(2024, 1, 1),
+        }),
+    ]
+    assert_same_bytes(SECURITIES_LIST_JSON, SecuritiesList, {"items": records, "total": 2, "next_cursor": None})
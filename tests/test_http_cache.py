@@ -0,0 +1,66 @@
+from datetime import datetime, timezone
+
+from sqlalchemy.dialects import postgresql
+
+from app.crud import daily_prices as daily_prices_crud
+from app.crud.price_versions import BUMP_PRICE_VERSIONS_STMT
+from app.utils.http_cache import etag_matches, make_etag
+
+LATEST = datetime(2024, 6, 28, tzinfo=timezone.utc)
+
+
+class FakeResult:
+    def __init__(self, row):
+        self.row = row
+
+    def one(self):
+        return self.row
+
+
+class FakeSession:
+    """Answers the watermark statement with a fixed (version, latest time) row."""
+
+    def __init__(self, version, latest):
+        self.row = (version, latest)
+        self.executed = []
+
+    def execute(self, stmt, params=None):
+        self.executed.append((stmt, params))
+        return FakeResult(self.row)
+
+
+def test_etag_matches():
+    etag = make_etag("range", "VNM", "1y", (3, LATEST))
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"other", W/{etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches(None, etag)
+    assert not etag_matches('"other"', etag)
+
+
+def test_etag_changes_when_history_is_rewritten():
+    # A backfill or an update of an old bar leaves the latest time unchanged
+    # but bumps the stored version, whichever process made the write
+    before = make_etag("range", daily_prices_crud.get_price_watermark(FakeSession(3, LATEST), ticker="VNM"))
+    after = make_etag("range", daily_prices_crud.get_price_watermark(FakeSession(4, LATEST), ticker="VNM"))
+    assert before != after
+    assert not etag_matches(before, after)
+
+
+def test_watermark_reads_the_stored_version():
+    db = FakeSession(None, None)
+    assert daily_prices_crud.get_price_watermark(db, ticker="VNM") == (0, None)
+    stmt, params = db.executed[0]
+    assert params == {"ticker": "VNM"}
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+    assert "daily_price_versions" in sql and "max(daily_prices.time)" in sql
+
+    db = FakeSession(42, LATEST)
+    assert daily_prices_crud.get_price_watermark(db) == (42, LATEST)
+    assert "sum(daily_price_versions.version)" in str(db.executed[0][0].compile(dialect=postgresql.dialect()))
+
+
+def test_bump_locks_versions_in_ticker_order():
+    sql = str(BUMP_PRICE_VERSIONS_STMT.compile(dialect=postgresql.dialect()))
+    assert "ORDER BY ticker" in sql
+    assert "ON CONFLICT (ticker) DO UPDATE SET version = (daily_price_versions.version +" in sql
@@ -0,0 +1,90 @@
+import numpy as np
+import pytest
+
+from app.utils.indicators import (
+    MAX_PERIOD,
+    compute_indicators,
+    parse_indicator_set,
+    series_to_list,
+    warmup_rows,
+)
+
+rng = np.random.default_rng(7)
+CLOSE = 100 + np.cumsum(rng.normal(0, 1, 400))
+HIGH = CLOSE + rng.uniform(0, 2, 400)
+LOW = CLOSE - rng.uniform(0, 2, 400)
+
+
+def reference_average(values, alpha, period):
+    """Seeded exponential average, one step at a time."""
+    result = [np.nan] * len(values)
+    first = next(i for i, value in enumerate(values) if not np.isnan(value))
+    seed = first + period - 1
+    result[seed] = np.mean(values[first:seed + 1])
+    for t in range(seed + 1, len(values)):
+        result[t] = (1 - alpha) * result[t - 1] + alpha * values[t]
+    return np.array(result)
+
+
+def test_parse_indicator_set():
+    assert parse_indicator_set(" SMA20, ema50,sma20,,macd ") == ["sma20", "ema50", "macd"]
+    for spec in ["foo", "sma0", f"sma{MAX_PERIOD + 1}", " , "]:
+        with pytest.raises(ValueError):
+            parse_indicator_set(spec)
+
+
+def test_warmup_rows():
+    assert warmup_rows(["sma20", "bb50"]) == 50
+    assert warmup_rows(["ema10", "rsi14"]) == 140
+    assert warmup_rows(["macd"]) == 4 * 26 + 4 * 9
+
+
+def test_sma_and_bollinger():
+    out = compute_indicators(["sma5", "bb5"], CLOSE)
+    expected = np.array([np.nan] * 4 + [CLOSE[t - 4:t + 1].mean() for t in range(4, len(CLOSE))])
+    np.testing.assert_allclose(out["sma5"], expected)
+    np.testing.assert_allclose(out["bb5_middle"], expected)
+    std = np.array([np.nan] * 4 + [CLOSE[t - 4:t + 1].std() for t in range(4, len(CLOSE))])
+    np.testing.assert_allclose(out["bb5_upper"] - out["bb5_middle"], 2 * std)
+
+
+@pytest.mark.parametrize("period", [1, 3, 20, 200])
+def test_ema_matches_the_recursion(period):
+    out = compute_indicators([f"ema{period}"], CLOSE)[f"ema{period}"]
+    np.testing.assert_allclose(out, reference_average(CLOSE, 2 / (period + 1), period), rtol=1e-10)
+
+
+def test_rsi_and_atr_use_wilder_smoothing():
+    out = compute_indicators(["rsi14", "atr14"], CLOSE, HIGH, LOW)
+    change = np.concatenate(([np.nan], np.diff(CLOSE)))
+    gains = reference_average(np.clip(change, 0, None), 1 / 14, 14)
+    losses = reference_average(np.clip(-change, 0, None), 1 / 14, 14)
+    np.testing.assert_allclose(out["rsi14"], 100 * gains / (gains + losses), rtol=1e-10)
+
+    previous = np.concatenate(([np.nan], CLOSE[:-1]))
+    true_range = np.nanmax(np.vstack((HIGH - LOW, np.abs(HIGH - previous), np.abs(LOW - previous))), axis=0)
+    np.testing.assert_allclose(out["atr14"], reference_average(true_range, 1 / 14, 14), rtol=1e-10)
+
+
+def test_rsi_of_flat_prices_is_50():
+    rsi = compute_indicators(["rsi3"], np.full(10, 5.0))["rsi3"]
+    assert np.isnan(rsi[:3]).all()
+    assert (rsi[3:] == 50).all()
+
+
+def test_macd():
+    out = compute_indicators(["macd"], CLOSE)
+    line = reference_average(CLOSE, 2 / 13, 12) - reference_average(CLOSE, 2 / 27, 26)
+    np.testing.assert_allclose(out["macd"], line, rtol=1e-10)
+    np.testing.assert_allclose(out["macd_signal"], reference_average(line, 2 / 10, 9), rtol=1e-10)
+    np.testing.assert_allclose(out["macd_hist"], out["macd"] - out["macd_signal"])
+
+
+def test_gaps_are_forward_filled_and_short_series_are_undefined():
+    close = np.array([np.nan, 1.0, np.nan, 3.0])
+    np.testing.assert_allclose(compute_indicators(["sma2"], close)["sma2"], [np.nan, np.nan, 1.0, 2.0])
+    assert np.isnan(compute_indicators(["sma5", "ema5"], close[:3])["ema5"]).all()
+
+
+def test_series_to_list():
+    assert series_to_list(np.array([np.nan, 1.5])) == [None, 1.5]
@@ -0,0 +1,110 @@
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy.exc import DataError, IntegrityError, OperationalError
+
+from app.schemas.daily_prices import DailyPriceCreate
+from app.utils.ingest_buffer import IngestBuffer, UnknownTicker, is_transient
+
+
+def make_row(ticker: str, day: int = 1) -> DailyPriceCreate:
+    return DailyPriceCreate(time=datetime(2024, 1, day, tzinfo=timezone.utc), ticker=ticker, close_price=1000)
+
+
+def flush(buffer: IngestBuffer, rows):
+    futures = [buffer.submit(row, durable=True) for row in rows]
+    buffer._flush(buffer._next_batch())
+    return futures
+
+
+def test_is_transient():
+    assert is_transient(OperationalError("INSERT", {}, Exception("server closed the connection")))
+    assert not is_transient(IntegrityError("INSERT", {}, Exception("violates foreign key constraint")))
+    assert not is_transient(ValueError("bad row"))
+
+
+def test_transient_error_is_retried():
+    attempts = []
+
+    def write(rows):
+        attempts.append(len(rows))
+        if len(attempts) < 3:
+            raise OperationalError("INSERT", {}, Exception("connection reset"))
+        return set()
+
+    buffer = IngestBuffer(write=write, batch_size=4, flush_interval=0, retry_backoff=0)
+    futures = flush(buffer, [make_row("AAA", day) for day in range(1, 5)])
+
+    assert attempts == [4, 4, 4]
+    assert all(future.result(0) for future in futures)
+    assert buffer.flushed_rows == 4
+    assert buffer.retried_writes == 2
+    assert buffer.failed_rows == 0
+
+
+def test_transient_error_drops_batch_after_retries():
+    def write(rows):
+        raise OperationalError("INSERT", {}, Exception("connection refused"))
+
+    buffer = IngestBuffer(write=write, batch_size=2, flush_interval=0, max_retries=2, retry_backoff=0)
+    futures = flush(buffer, [make_row("AAA"), make_row("BBB")])
+
+    assert all(isinstance(future.exception(0), OperationalError) for future in futures)
+    assert buffer.retried_writes == 2
+    assert buffer.failed_rows == 2
+    assert buffer.split_batches == 0
+
+
+def test_data_error_only_drops_the_bad_row():
+    written = []
+
+    def write(rows):
+        if any(row.ticker == "BAD" for row in rows):
+            raise IntegrityError("INSERT", {}, Exception("violates foreign key constraint"))
+        written.extend(row.ticker for row in rows)
+        return {"GONE"} & {row.ticker for row in rows}
+
+    rows = [make_row(ticker) for ticker in ["AAA", "BBB", "BAD", "CCC", "GONE", "DDD", "EEE"]]
+    buffer = IngestBuffer(write=write, batch_size=len(rows), flush_interval=0, retry_backoff=0)
+    futures = dict(zip([row.ticker for row in rows], flush(buffer, rows)))
+
+    assert sorted(written) == ["AAA", "BBB", "CCC", "DDD", "EEE", "GONE"]
+    assert isinstance(futures["BAD"].exception(0), IntegrityError)
+    assert isinstance(futures["GONE"].exception(0), UnknownTicker)
+    for ticker in ["AAA", "BBB", "CCC", "DDD", "EEE"]:
+        assert futures[ticker].result(0) is True
+    assert buffer.flushed_rows == 5
+    assert buffer.unknown_ticker_rows == 1
+    assert buffer.failed_rows == 1
+    assert buffer.retried_writes == 0
+    assert buffer.split_batches > 0
+
+
+@pytest.mark.parametrize("max_retries", [0, 1])
+def test_data_error_is_not_retried(max_retries):
+    attempts = []
+
+    def write(rows):
+        attempts.append(len(rows))
+        raise IntegrityError("INSERT", {}, Exception("duplicate key"))
+
+    buffer = IngestBuffer(write=write, batch_size=1, flush_interval=0, max_retries=max_retries, retry_backoff=0)
+    (future,) = flush(buffer, [make_row("AAA")])
+
+    assert attempts == [1]
+    assert isinstance(future.exception(0), IntegrityError)
+
+
+@pytest.mark.parametrize("error, status_code", [
+    (UnknownTicker("AAA"), 404),
+    (IntegrityError("INSERT", {}, Exception("violates check constraint")), 409),
+    (DataError("INSERT", {}, Exception("numeric field overflow")), 422),
+    (OperationalError("INSERT", {}, Exception("connection refused")), 503),
+    (RuntimeError("unexpected"), 500),
+])
+def test_durable_write_errors_map_to_http_errors(error, status_code):
+    from app.api.v1.routes.daily_prices import _buffered_write_error
+
+    http_error = _buffered_write_error(make_row("AAA"), error)
+    assert http_error.status_code == status_code
+    assert "AAA" in http_error.detail
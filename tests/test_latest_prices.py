@@ -0,0 +1,39 @@
+from datetime import datetime, timezone
+
+from sqlalchemy.dialects import postgresql
+
+from app.crud.daily_prices import oldest_time_by_ticker
+from app.crud.market import refresh_latest_prices_stmt
+
+
+def day(n: int) -> datetime:
+    return datetime(2024, 1, n, tzinfo=timezone.utc)
+
+
+def test_oldest_time_by_ticker_bounds_each_ticker_separately():
+    rows = [
+        {"ticker": "VNM", "time": day(10)},
+        {"ticker": "FPT", "time": day(2)},
+        {"ticker": "VNM", "time": day(9)},
+        {"ticker": "FPT", "time": day(5)},
+    ]
+    assert oldest_time_by_ticker(rows) == {"VNM": day(9), "FPT": day(2)}
+
+
+def compile_stmt(stmt):
+    return stmt.compile(dialect=postgresql.dialect())
+
+
+def test_refresh_with_per_ticker_bounds_joins_them_in():
+    compiled = compile_stmt(refresh_latest_prices_stmt(["VNM", "FPT"], {"FPT": day(2), "VNM": day(9)}))
+    assert "unnest(" in str(compiled)
+    assert "daily_prices.time >= bounds.since" in str(compiled)
+    assert compiled.params["tickers"] == ["VNM", "FPT"]
+    assert compiled.params["since"] == [day(9), day(2)]
+
+
+def test_refresh_with_one_bound_filters_every_ticker():
+    compiled = compile_stmt(refresh_latest_prices_stmt(["VNM", "FPT"], day(2)))
+    assert "unnest(" not in str(compiled)
+    assert compiled.params["tickers"] == ["VNM", "FPT"]
+    assert day(2) in compiled.params.values()
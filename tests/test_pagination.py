@@ -0,0 +1,54 @@
+import base64
+from collections import namedtuple
+from datetime import datetime, timezone
+
+import pytest
+
+from app.utils.pagination import (
+    decode_cursor,
+    decode_ticker_cursor,
+    decode_time_ticker_cursor,
+    encode_cursor,
+    next_cursor,
+)
+
+Row = namedtuple("Row", "time ticker")
+
+WHEN = datetime(2024, 1, 2, 7, 30, tzinfo=timezone.utc)
+
+
+def test_time_ticker_cursor_round_trip():
+    token = encode_cursor([WHEN, "VNM"])
+    assert "=" not in token
+    assert decode_time_ticker_cursor(token) == [WHEN, "VNM"]
+
+
+def test_ticker_cursor_round_trip():
+    assert decode_ticker_cursor(encode_cursor(["FPT"])) == "FPT"
+
+
+@pytest.mark.parametrize("token", [
+    "",
+    "not base64 !",
+    encode_cursor(["VNM"]),
+    encode_cursor([WHEN, "VNM", 1]),
+    encode_cursor([1, "VNM"]),
+    encode_cursor(["not a time", "VNM"]),
+])
+def test_invalid_time_ticker_cursor(token):
+    with pytest.raises(ValueError):
+        decode_time_ticker_cursor(token)
+
+
+def test_invalid_ticker_cursor():
+    with pytest.raises(ValueError):
+        decode_ticker_cursor(encode_cursor([1]))
+    with pytest.raises(ValueError):
+        decode_cursor(base64.urlsafe_b64encode(b'{"ticker":"VNM"}').decode(), 1)
+
+
+def test_next_cursor_only_after_full_pages():
+    rows = [Row(WHEN, "FPT"), Row(WHEN, "VNM")]
+    assert next_cursor(rows, 3, "time", "ticker") is None
+    assert next_cursor([], 0, "time", "ticker") is None
+    assert decode_time_ticker_cursor(next_cursor(rows, 2, "time", "ticker")) == [WHEN, "VNM"]
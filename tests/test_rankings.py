@@ -0,0 +1,69 @@
+from collections import namedtuple
+from datetime import date, datetime, timedelta, timezone
+
+from app.core.cache import ALL_TICKERS, day_tag, invalidate_tickers, ranking_cache, trading_day
+from app.utils.rankings import DayRankings
+
+Row = namedtuple("Row", ["ticker", "exchange", "close_price", "percent_change", "volume", "foreign_net_buy_value"])
+
+ROWS = [
+    Row("AAA", "HOSE", 10.0, 0.05, 1000, 5.0),
+    Row("BBB", "HNX", 20.0, -0.02, 3000, None),
+    Row("CCC", "HOSE", 30.0, 0.07, 2000, -1.0),
+    Row("DDD", "HOSE", 40.0, None, 500, 2.0),
+]
+
+
+def test_top_and_bottom():
+    rankings = DayRankings(date(2024, 6, 28), ROWS)
+    assert [row["ticker"] for row in rankings.top("percent_change", 10)] == ["CCC", "AAA", "BBB"]
+    assert [row["ticker"] for row in rankings.top("percent_change", 2, ascending=True)] == ["BBB", "AAA"]
+    assert [row["ticker"] for row in rankings.top("volume", 2, exchange="HOSE")] == ["CCC", "AAA"]
+    assert rankings.top("foreign_net_buy_value", 1)[0] == {
+        "rank": 1, "ticker": "AAA", "exchange": "HOSE", "close_price": 10.0,
+        "percent_change": 0.05, "volume": 1000.0, "foreign_net_buy_value": 5.0,
+    }
+    assert rankings.top("volume", 5, exchange="UPCOM") == []
+
+
+def test_trading_day_is_the_utc_date():
+    ict = timezone(timedelta(hours=7))
+    assert trading_day(datetime(2024, 6, 29, 3, 0, tzinfo=ict)) == date(2024, 6, 28)
+    assert trading_day(datetime(2024, 6, 28, 8, 0)) == date(2024, 6, 28)
+
+
+def test_price_writes_only_drop_the_rankings_of_their_days():
+    ranking_cache.clear()
+    days = [date(2024, 6, 27), date(2024, 6, 28)]
+    for day in days:
+        ranking_cache.set(day, DayRankings(day, ROWS), tags=[day_tag(day), ALL_TICKERS])
+
+    invalidate_tickers(["AAA"], times=[datetime(2024, 6, 28, 8, 0, tzinfo=timezone.utc)])
+    assert ranking_cache.get(days[0]) is not None
+    assert ranking_cache.get(days[1]) is None
+
+    # Securities changes (no bar times) drop every day
+    invalidate_tickers(["AAA"])
+    assert ranking_cache.get(days[0]) is None
+
+
+def test_rankings_are_rebuilt_when_the_day_version_moves(monkeypatch):
+    from app.utils import rankings as rankings_module
+
+    ranking_cache.clear()
+    versions = {date(2024, 6, 28): 3}
+    queries = []
+    monkeypatch.setattr(rankings_module, "get_day_price_version", lambda db, day: versions[day])
+    monkeypatch.setattr(
+        rankings_module.market_crud, "get_day_cross_section", lambda db, start, end: queries.append(start) or ROWS
+    )
+
+    day = date(2024, 6, 28)
+    first = rankings_module.get_day_rankings(None, day=day)
+    assert rankings_module.get_day_rankings(None, day=day) is first
+    assert len(queries) == 1
+
+    # A write from another process only shows up as a new version
+    versions[day] = 4
+    assert rankings_module.get_day_rankings(None, day=day) is not first
+    assert len(queries) == 2
@@ -0,0 +1,77 @@
+import threading
+from collections import namedtuple
+
+import pytest
+
+from app.utils import securities_search
+from app.utils.securities_search import EXACT_TICKER, FUZZY, SearchIndex, build_search_index, fold
+
+Record = namedtuple("Record", "ticker short_name company_name")
+
+RECORDS = [
+    Record("VNM", "Vinamilk", "Công ty Cổ phần Sữa Việt Nam"),
+    Record("VIC", "Vingroup", "Tập đoàn Vingroup"),
+    Record("VCB", "Vietcombank", "Ngân hàng TMCP Ngoại thương Việt Nam"),
+    Record("DGC", "Hóa chất Đức Giang", "Công ty Cổ phần Tập đoàn Hóa chất Đức Giang"),
+    Record("FPT", "FPT Corp", "Công ty Cổ phần FPT"),
+]
+
+
+@pytest.mark.parametrize("text, expected", [
+    (None, ""),
+    ("", ""),
+    ("Sữa Việt Nam", "sua viet nam"),
+    ("Đức Giang", "duc giang"),
+    ("  Ngân-hàng   TMCP, (Ngoại thương) ", "ngan hang tmcp ngoai thuong"),
+])
+def test_fold(text, expected):
+    assert fold(text) == expected
+
+
+def tickers(index, query, limit=10):
+    return [record.ticker for record, _ in index.search(query, limit)]
+
+
+def test_ranking_by_match_kind():
+    index = SearchIndex(RECORDS)
+    assert tickers(index, "vnm")[0] == "VNM"
+    assert index.search("VNM")[0][1] > EXACT_TICKER
+    # Ticker prefixes come before name prefixes
+    assert tickers(index, "v")[:3] == ["VCB", "VIC", "VNM"]
+    assert tickers(index, "sua viet nam")[0] == "VNM"
+    assert tickers(index, "duc giang")[0] == "DGC"
+    assert tickers(index, "tap doan hoa")[0] == "DGC"
+
+
+def test_fuzzy_match_for_typos():
+    index = SearchIndex(RECORDS)
+    (record, score), = index.search("vinamik")
+    assert record.ticker == "VNM"
+    assert FUZZY < score < FUZZY + 1
+
+
+def test_empty_query_and_limit():
+    index = SearchIndex(RECORDS)
+    assert index.search("  ,. ") == []
+    assert len(index.search("v", limit=2)) == 2
+
+
+def test_build_search_index_builds_once_per_key(monkeypatch):
+    monkeypatch.setattr(securities_search, "_cached", None)
+    builds = []
+
+    class CountingIndex(SearchIndex):
+        def __init__(self, records):
+            builds.append(1)
+            super().__init__(records)
+
+    monkeypatch.setattr(securities_search, "SearchIndex", CountingIndex)
+    key = object()
+    threads = [threading.Thread(target=build_search_index, args=(key, RECORDS)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(builds) == 1
+    assert securities_search.cached_search_index(key) is not None
+    assert securities_search.cached_search_index(object()) is None